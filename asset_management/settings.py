@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 import dj_database_url
 from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,20 +47,39 @@ AUTH_USER_MODEL = "core.User"
 # --------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.IdCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
+# request.user comes from the token claims; whether the account is still
+# active is re-checked at most this often per worker (see core/authentication.py)
+AUTH_STATUS_TTL = int(os.environ.get("AUTH_STATUS_TTL", 30))
+
+# List views build rows from .values() instead of serializer instances
+# (same JSON output; see core/fastpath.py)
+FAST_SERIALIZATION = os.environ.get("FAST_SERIALIZATION", "0") == "1"
+
+# Route the dashboard endpoints to their async views and serve
+# /api/events/; for ASGI servers (gunicorn -k uvicorn.workers.UvicornWorker,
+# see docker-compose.yml)
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
+
 # --------------------------------------------------
 # MIDDLEWARE (ORDER MATTERS)
 # --------------------------------------------------
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",   # MUST BE FIRST
+    "core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.StaticFilesMiddleware",   # WhiteNoise, async-capable
 
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -70,6 +90,24 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Server-Timing on every core response; a JSON "core.timing" log line for
+# this fraction of requests, and for every request slower than
+# SLOW_REQUEST_MS along with its slowest SQL (core/timing.py)
+TIMING_SAMPLE_RATE = float(os.environ.get("TIMING_SAMPLE_RATE", 0.01))
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 1000))
+
+# Prometheus /metrics (core/metrics.py). Open to admins and to these
+# networks. With several worker processes, set METRICS_DIR to a
+# directory they share so a scrape sees all of them.
+METRICS_ALLOWED_IPS = os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1/32,::1/128").split(",")
+METRICS_DIR = os.environ.get("METRICS_DIR") or None
+METRICS_SAMPLE_SECONDS = int(os.environ.get("METRICS_SAMPLE_SECONDS", 30))
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", 5))
+
+# Dev/test: log repeated SQL shapes per request (core/middleware.py)
+if os.environ.get("QUERY_INSPECTION") == "1":
+    MIDDLEWARE.append("core.middleware.NPlusOneMiddleware")
+
 # --------------------------------------------------
 # ✅ CORS (THIS FIXES YOUR ERROR)
 # --------------------------------------------------
@@ -137,6 +175,66 @@ DATABASES = {
     )
 }
 
+# --------------------------------------------------
+# CACHE
+# --------------------------------------------------
+# In-process by default; REDIS_URL shares one cache across workers,
+# CACHE_DIR shares one across processes on the same host.
+if os.environ.get("REDIS_URL"):
+    # Fail at startup, not on the first cache lookup or event publish
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            "REDIS_URL is set but the redis package is not installed "
+            "(pip install -r requirements.txt)"
+        )
+
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+elif os.environ.get("CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["CACHE_DIR"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 300))
+
+# --------------------------------------------------
+# SERVER-SENT EVENTS
+# --------------------------------------------------
+# /api/events/ fan-out (core/events.py). In-process by default, which only
+# reaches streams on the same worker; REDIS_URL relays between workers.
+if os.environ.get("REDIS_URL"):
+    EVENTS = {
+        "BACKEND": "core.events.RedisBackend",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+else:
+    EVENTS = {"BACKEND": "core.events.LocalBackend"}
+
+# --------------------------------------------------
+# BACKGROUND JOBS
+# --------------------------------------------------
+# Post-commit side effects (core/jobs.py). core.jobs.DatabaseQueue makes
+# them all durable, but then `python manage.py run_jobs` must be running.
+# Durable jobs (the technician activity log) are saved with the write
+# they belong to, with any backend; rows left by a crash are rerun by
+# run_jobs (or, on Postgres, by the next ThreadQueue thread to start).
+JOBS_BACKEND = os.environ.get("JOBS_BACKEND", "core.jobs.ThreadQueue")
+
 # --------------------------------------------------
 # STATIC FILES
 # --------------------------------------------------
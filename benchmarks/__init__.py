@@ -0,0 +1,20 @@
+"""HTTP benchmark of every core endpoint against a local gunicorn server.
+
+    python -m benchmarks run --output results.json [--baseline baseline.json]
+    python -m benchmarks compare results.json baseline.json --threshold 10
+
+``run`` migrates the configured database and seeds it with
+``manage.py seed_fleet`` if it holds no fleet yet. It then starts
+gunicorn on 127.0.0.1 and drives each endpoint in turn. Each endpoint
+gets --clients concurrent clients per role, each sending a JWT for a
+different user. The results are JSON: for each endpoint, throughput,
+p50/p95/p99 latency, queries per request (counted by the server's
+core.metrics, read from a temporary METRICS_DIR) and errors. With --baseline, or through ``compare``, a
+regression of more than --threshold percent exits with status 1.
+
+Everything runs on this machine, so client threads and server workers
+share the CPUs; only compare runs made on the same machine. On SQLite,
+concurrent writes (from several workers, or from a worker and its
+background jobs) can fail with "database is locked"; benchmark writes
+against Postgres, or pass --read-only.
+"""
@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+FLUSH_SECONDS = 0.2
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark every endpoint against a local server")
+    run.add_argument("--assets", type=int, default=20000,
+                     help="Fleet size to seed when the database has none")
+    run.add_argument("--users", type=int, default=2000)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--password", default="fleet-password",
+                     help="Password of the seeded users (seed_fleet --password)")
+    run.add_argument("--mode", choices=["wsgi", "asgi"], default="wsgi")
+    run.add_argument("--workers", type=int, default=2)
+    run.add_argument("--clients", type=int, default=4,
+                     help="Concurrent clients per endpoint")
+    run.add_argument("--duration", type=float, default=5, help="Seconds per endpoint")
+    run.add_argument("--warmup", type=float, default=1, help="Unrecorded seconds first")
+    run.add_argument("--port", type=int, default=8766)
+    run.add_argument("--no-cache", action="store_true",
+                     help="Disable the response cache, so every request reaches the DB")
+    run.add_argument("--read-only", action="store_true", help="Skip the write endpoints")
+    run.add_argument("--only", nargs="+", metavar="NAME", help="Run just these endpoints")
+    run.add_argument("--output", default="benchmark-results.json")
+    run.add_argument("--baseline", help="Results file to compare this run against")
+    add_check_args(run)
+
+    compare = commands.add_parser("compare", help="Compare two results files")
+    compare.add_argument("results")
+    compare.add_argument("baseline")
+    add_check_args(compare)
+
+    return parser.parse_args(argv)
+
+
+def add_check_args(parser):
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Allowed regression, in percent")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="Ignore latency changes smaller than this")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset():
+    from django.contrib.auth import get_user_model
+
+    from core.models import ActivityLog, Asset, Assignment, RepairTicket
+
+    return {
+        "assets": Asset.objects.count(),
+        "assignments": Assignment.objects.count(),
+        "tickets": RepairTicket.objects.count(),
+        "activity": ActivityLog.objects.count(),
+        "users": get_user_model().objects.count(),
+    }
+
+
+def prepare(args):
+    from django.core.management import call_command
+
+    from core.management.commands.seed_fleet import PREFIX
+    from core.models import Asset
+
+    call_command("migrate", verbosity=0)
+    if not Asset.objects.filter(serial_number__startswith=f"{PREFIX}-").exists():
+        call_command(
+            "seed_fleet", assets=args.assets, users=args.users, seed=args.seed,
+            password=args.password,
+        )
+
+
+def view_name(endpoint, client):
+    from django.urls import resolve
+
+    return resolve(endpoint.path.format(**client.vars).split("?")[0]).view_name
+
+
+def run(args):
+    from django.db import connection
+
+    from .endpoints import ENDPOINTS, make_clients
+    from .load import drive, queries_per_request, server_counts, summarize
+    from .server import serve
+
+    prepare(args)
+    clients = make_clients(args.clients, args.password)
+    endpoints = [
+        e for e in ENDPOINTS
+        if (not args.only or e.name in args.only) and not (args.read_only and e.writes)
+    ]
+    results = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "dataset": dataset(),
+            "mode": args.mode,
+            "workers": args.workers,
+            "clients": args.clients,
+            "duration": args.duration,
+            "cache": not args.no_cache,
+        },
+        "endpoints": {},
+    }
+    connection.close()  # the server needs the database, not us
+
+    # workers flush their metrics often, so queries can be read back per endpoint
+    metrics = tempfile.TemporaryDirectory(prefix="benchmark-metrics-")
+    metrics_dir = metrics.name
+    env = {
+        "METRICS_DIR": metrics_dir,
+        "METRICS_FLUSH_SECONDS": str(FLUSH_SECONDS),
+        "METRICS_SAMPLE_SECONDS": "0",
+    }
+    if args.no_cache:
+        env["RESPONSE_CACHE_TIMEOUT"] = "0"
+
+    print(f"{'endpoint':22} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'queries':>8} {'errors':>7}")
+    with metrics, serve(args.mode, args.port, args.workers, **env):
+        for endpoint in endpoints:
+            pool = clients[endpoint.role]
+            view = view_name(endpoint, pool[0])
+            if args.warmup:
+                drive(endpoint, pool, args.port, args.warmup)
+            time.sleep(FLUSH_SECONDS * 3)
+            before = server_counts(metrics_dir)
+            samples, elapsed = drive(endpoint, pool, args.port, args.duration)
+            time.sleep(FLUSH_SECONDS * 3)
+            queries = queries_per_request(before, server_counts(metrics_dir), view)
+            r = summarize(samples, elapsed, queries)
+            results["endpoints"][endpoint.name] = {
+                "method": endpoint.method, "path": endpoint.path, **r,
+            }
+            queries = "-" if r["queries"] is None else f"{r['queries']:.1f}"
+            print(f"{endpoint.name:22} {r['rps']:8.1f} {r['p50_ms']:8.2f} "
+                  f"{r['p95_ms']:8.2f} {r['p99_ms']:8.2f} {queries:>8} {r['errors']:7}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        from .compare import load
+        return check(results, load(args.baseline), args)
+    return 0
+
+
+def check(results, baseline, args):
+    from .compare import differences, regressions
+
+    for note in differences(results, baseline):
+        print(f"warning: {note}")
+    found = regressions(results, baseline, args.threshold, args.min_ms)
+    for name, message in found:
+        print(f"REGRESSION {name}: {message}")
+    if found:
+        return 1
+    print(f"No regressions over {args.threshold:g}%")
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "compare":
+        from .compare import load
+        return check(load(args.results), load(args.baseline), args)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "asset_management.settings")
+    # resolve view names the way the server's mode routes them
+    from .server import MODES
+    os.environ["ASYNC_VIEWS"] = MODES[args.mode][1]
+    import django
+    django.setup()
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
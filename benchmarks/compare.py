@@ -0,0 +1,61 @@
+import json
+
+
+# =======================
+# BASELINE COMPARISON
+# =======================
+# An endpoint regresses when, against the baseline run:
+#   p50 or p95 latency grows by more than ``threshold`` percent (and by
+#   at least ``min_ms``, so sub-millisecond jitter doesn't count),
+#   throughput drops by more than ``threshold`` percent,
+#   queries per request grow by more than ``threshold`` percent (or
+#   from zero), or it starts returning errors.
+# p99 is reported but not checked; it is too noisy on short runs.
+
+LATENCY = ("p50_ms", "p95_ms")
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _grew(new, old, threshold):
+    if old == 0:
+        return new > 0
+    return (new - old) / old * 100 > threshold
+
+
+def regressions(results, baseline, threshold=10.0, min_ms=1.0):
+    """``[(endpoint, message)]`` for every regression against ``baseline``."""
+    found = []
+    for name, old in baseline["endpoints"].items():
+        new = results["endpoints"].get(name)
+        if new is None:
+            continue
+
+        for key in LATENCY:
+            if _grew(new[key], old[key], threshold) and new[key] - old[key] >= min_ms:
+                found.append((name, f"{key} {old[key]} -> {new[key]}"))
+        if old["rps"] and (old["rps"] - new["rps"]) / old["rps"] * 100 > threshold:
+            found.append((name, f"rps {old['rps']} -> {new['rps']}"))
+        if new["queries"] is not None and old["queries"] is not None:
+            if _grew(new["queries"], old["queries"], threshold):
+                found.append((name, f"queries {old['queries']} -> {new['queries']}"))
+        if new["errors"] and not old["errors"]:
+            found.append((name, f"{new['errors']} errors"))
+    return found
+
+
+def differences(results, baseline):
+    """Warnings about runs that aren't like for like."""
+    notes = []
+    for key in ("dataset", "mode", "workers", "clients", "cache"):
+        if results["meta"].get(key) != baseline["meta"].get(key):
+            notes.append(
+                f"{key} differs: {baseline['meta'].get(key)} -> {results['meta'].get(key)}"
+            )
+    missing = set(baseline["endpoints"]) - set(results["endpoints"])
+    if missing:
+        notes.append(f"not run: {', '.join(sorted(missing))}")
+    return notes
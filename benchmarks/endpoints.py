@@ -0,0 +1,228 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import Asset, Assignment, InventoryItem, RepairTicket
+
+User = get_user_model()
+
+
+# =======================
+# ENDPOINTS
+# =======================
+# One entry per route in core/urls.py (core.tests checks that none is
+# missing). Paths are formatted with the client's ``vars``; ``body``
+# builds the request body from (client, n), n counting the endpoint's
+# requests across all clients.
+#
+# Writes run too, unless --read-only. They are shaped to keep the data
+# stable between runs: status changes alternate, passwords are "changed"
+# to themselves, and bulk-return frees about as many assets as
+# bulk-assign takes. Created users, assets and tickets do accumulate.
+
+@dataclass
+class Endpoint:
+    name: str
+    role: str           # whose JWT the clients send (None: anonymous)
+    method: str
+    path: str
+    body: object = None
+    multipart: bool = False
+
+    @property
+    def writes(self):
+        return self.method != "GET"
+
+    def request(self, client, n):
+        """``(method, path, body bytes, headers)`` for request ``n``."""
+        headers = {}
+        if client.token and self.role:
+            headers["Authorization"] = f"Bearer {client.token}"
+
+        body = self.body(client, n) if callable(self.body) else self.body
+        if body is None:
+            data = None
+        elif self.multipart:
+            data, headers["Content-Type"] = multipart(body)
+        else:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        return self.method, self.path.format(**client.vars), data, headers
+
+
+def multipart(files):
+    """Encode ``{"field": (filename, bytes)}`` as multipart/form-data."""
+    boundary = "benchmark-boundary"
+    parts = []
+    for name, (filename, content) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+            f'filename="{filename}"\r\nContent-Type: text/csv\r\n\r\n'.encode()
+            + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _login(client, n):
+    return {"username": client.username, "password": client.password}
+
+
+def _status(client, n):
+    return {"status": ("IN_PROGRESS", "OPEN")[n % 2]}
+
+
+def _new_user(client, n):
+    name = f"bench_{client.run}_{n}"
+    return {"username": name, "email": f"{name}@example.com",
+            "password": client.password, "role": "EMPLOYEE"}
+
+
+def _csv(client, n):
+    row = f"Bench laptop,LAPTOP,BENCH-{client.run}-{n},AVAILABLE,2024-01-01\n"
+    return {"file": ("assets.csv", f"name,type,serial_number,status,purchase_date\n{row}".encode())}
+
+
+def _bulk_assign(client, n):
+    return {"items": [{"asset": client.pools.take("available"), "employee": client.vars["employee"]}]}
+
+
+def _bulk_return(client, n):
+    return {"ids": [client.pools.take("active")]}
+
+
+ENDPOINTS = [
+    Endpoint("token", "EMPLOYEE", "POST", "/api/token/", _login),
+    Endpoint("login", "EMPLOYEE", "POST", "/api/login/", _login),
+    Endpoint("profile", "EMPLOYEE", "GET", "/api/profile/"),
+    Endpoint("change_password", "EMPLOYEE", "POST", "/api/change-password/",
+             lambda c, n: {"current_password": c.password, "new_password": c.password}),
+    Endpoint("users", "ADMIN", "GET", "/api/users/"),
+    Endpoint("users_create", "ADMIN", "POST", "/api/users/create/", _new_user),
+    Endpoint("dashboard", "ADMIN", "GET", "/api/dashboard/"),
+    Endpoint("recent_activity", "ADMIN", "GET", "/api/recent-activity/"),
+    Endpoint("employee_dashboard", "EMPLOYEE", "GET", "/api/employee/dashboard/"),
+    Endpoint("employee_assets", "EMPLOYEE", "GET", "/api/employee/assets/"),
+    Endpoint("report_issue", "EMPLOYEE", "POST", "/api/tickets/report/",
+             lambda c, n: {"asset": c.vars["asset"], "issue": "benchmark: screen flickering"}),
+    Endpoint("employee_assignments", "EMPLOYEE", "GET", "/api/employee/assignments/"),
+    Endpoint("employee_tickets", "EMPLOYEE", "GET", "/api/employee/tickets/"),
+    Endpoint("technician_dashboard", "TECHNICIAN", "GET", "/api/technician/dashboard/"),
+    Endpoint("ticket_status", "TECHNICIAN", "PATCH",
+             "/api/technician/tickets/{ticket}/status/", _status),
+    Endpoint("technician_activity", "TECHNICIAN", "GET", "/api/technician/recent-activity/"),
+    Endpoint("metrics", "ADMIN", "GET", "/metrics"),
+    Endpoint("api_root", "ADMIN", "GET", "/api/"),
+    Endpoint("assets", "ADMIN", "GET", "/api/assets/"),
+    Endpoint("asset", "ADMIN", "GET", "/api/assets/{asset}/"),
+    Endpoint("assets_export", "ADMIN", "GET", "/api/assets/export/"),
+    Endpoint("assets_import", "ADMIN", "POST", "/api/assets/import/", _csv, multipart=True),
+    Endpoint("inventory", "ADMIN", "GET", "/api/inventory/"),
+    Endpoint("inventory_item", "ADMIN", "GET", "/api/inventory/{item}/"),
+    Endpoint("assignments", "ADMIN", "GET", "/api/assignments/"),
+    Endpoint("assignment", "ADMIN", "GET", "/api/assignments/{assignment}/"),
+    Endpoint("bulk_return", "ADMIN", "POST", "/api/assignments/bulk-return/", _bulk_return),
+    Endpoint("bulk_assign", "ADMIN", "POST", "/api/assignments/bulk-assign/", _bulk_assign),
+    Endpoint("tickets", "ADMIN", "GET", "/api/tickets/"),
+    Endpoint("ticket", "ADMIN", "GET", "/api/tickets/{ticket}/"),
+    Endpoint("ticket_search", "ADMIN", "GET", "/api/tickets/search/?q=screen"),
+]
+
+# Routes in core/urls.py that are deliberately not benchmarked
+EXCLUDED = {
+    "api/events/": "server-sent events stream; a request never completes",
+}
+
+
+# =======================
+# CLIENTS
+# =======================
+
+class Pools:
+    """Ids that write endpoints use up (available assets, active assignments)."""
+
+    def __init__(self, **pools):
+        self._pools = {name: list(ids) for name, ids in pools.items()}
+        self._lock = threading.Lock()
+
+    def take(self, name):
+        with self._lock:
+            if not self._pools[name]:
+                raise LookupError(f"benchmark pool {name!r} is empty; reseed")
+            return self._pools[name].pop()
+
+
+@dataclass
+class Client:
+    role: str
+    user_id: int
+    username: str
+    token: str
+    password: str
+    run: str
+    pools: Pools
+    vars: dict = field(default_factory=dict)
+
+
+def access_token(user):
+    """The access token login_view would issue for ``user``."""
+    refresh = RefreshToken.for_user(user)
+    refresh["role"] = user.role
+    refresh["username"] = user.username
+    return str(refresh.access_token)
+
+
+def _with_data(role):
+    """Users of ``role`` that have rows behind their dashboards."""
+    if role == "EMPLOYEE":
+        ids = Assignment.objects.filter(status="ACTIVE").values_list("employee_id", flat=True)
+    elif role == "TECHNICIAN":
+        ids = RepairTicket.objects.filter(technician__isnull=False).values_list(
+            "technician_id", flat=True
+        )
+    else:
+        return User.objects.filter(role=role).order_by("id")
+    return User.objects.filter(role=role, id__in=ids).order_by("id")
+
+
+def make_clients(count, password, pool_size=20000):
+    """``{role: [Client] * count}``, each client a different user."""
+    run = format(int(time.time()), "x")
+    pools = Pools(
+        available=Asset.objects.filter(status="AVAILABLE")
+        .order_by("-id").values_list("id", flat=True)[:pool_size],
+        active=Assignment.objects.filter(status="ACTIVE")
+        .order_by("id").values_list("id", flat=True)[:pool_size],
+    )
+    shared = {
+        "asset": Asset.objects.order_by("id").values_list("id", flat=True).first(),
+        "item": InventoryItem.objects.order_by("id").values_list("id", flat=True).first(),
+        "assignment": Assignment.objects.order_by("id").values_list("id", flat=True).first(),
+        "ticket": RepairTicket.objects.order_by("id").values_list("id", flat=True).first(),
+        "employee": User.objects.filter(role="EMPLOYEE").order_by("id")
+        .values_list("id", flat=True).first(),
+    }
+    if None in shared.values():
+        raise LookupError("the database has no data to benchmark; seed it first")
+
+    clients = {}
+    for role in ("ADMIN", "EMPLOYEE", "TECHNICIAN"):
+        users = list(_with_data(role)[:count])
+        if not users:
+            raise LookupError(f"no {role} users to benchmark with; seed the database first")
+        clients[role] = []
+        for i in range(count):
+            user = users[i % len(users)]
+            client = Client(role, user.id, user.username, access_token(user),
+                            password, run, pools, dict(shared))
+            if role == "TECHNICIAN":
+                client.vars["ticket"] = (
+                    RepairTicket.objects.filter(technician=user)
+                    .order_by("id").values_list("id", flat=True).first()
+                )
+            clients[role].append(client)
+    return clients
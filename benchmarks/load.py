@@ -0,0 +1,128 @@
+import http.client
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+
+from .server import bench_host
+
+
+# =======================
+# LOAD
+# =======================
+# Each client is a thread with its own keep-alive connection, sending
+# one endpoint's requests back to back.
+
+class Sample:
+    __slots__ = ("ms", "status", "size")
+
+    def __init__(self, ms, status, size):
+        self.ms, self.status, self.size = ms, status, size
+
+
+def _client(endpoint, client, port, counter, deadline, samples):
+    host = bench_host()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    while time.monotonic() < deadline:
+        method, path, body, headers = endpoint.request(client, next(counter))
+        headers["Host"] = host
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            samples.append(Sample((time.perf_counter() - start) * 1000, 0, 0))
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            continue
+        samples.append(Sample(
+            (time.perf_counter() - start) * 1000, response.status, len(content)
+        ))
+    conn.close()
+
+
+def drive(endpoint, clients, port, duration):
+    """Run ``clients`` against ``endpoint`` for ``duration`` seconds."""
+    counter = itertools.count()
+    samples = []
+    deadline = time.monotonic() + duration
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(
+            target=_client, args=(endpoint, client, port, counter, deadline, samples)
+        )
+        for client in clients
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - start
+
+
+# =======================
+# SERVER-SIDE QUERY COUNTS
+# =======================
+# Queries are counted by the server, not from the Server-Timing header:
+# that header goes out before a streamed body runs its queries. The
+# server's workers write their core.metrics snapshots to METRICS_DIR,
+# and the difference between two readings gives queries per request.
+# Readings wait for a flush, so workers must run with a short
+# METRICS_FLUSH_SECONDS.
+
+def server_counts(directory):
+    """``({view: requests}, {view: queries})`` over every worker's snapshot."""
+    requests, queries = Counter(), Counter()
+    for name in os.listdir(directory):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                counters = json.load(f)["counters"]
+        except (OSError, ValueError):
+            continue
+        for labels, value in counters.get("core_http_requests_total", {}).items():
+            requests[_view(labels)] += value
+        for labels, value in counters.get("core_db_queries_total", {}).items():
+            queries[_view(labels)] += value
+    return requests, queries
+
+
+def _view(labels):
+    return labels.split('view="', 1)[1].split('"', 1)[0]
+
+
+def queries_per_request(before, after, view):
+    requests = after[0][view] - before[0][view]
+    if not requests:
+        return None
+    return round((after[1][view] - before[1][view]) / requests, 2)
+
+
+# =======================
+# STATS
+# =======================
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples, elapsed, queries=None):
+    ok = sorted(s.ms for s in samples if 0 < s.status < 400)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if not 0 < s.status < 400),
+        "rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ok, 50), 2),
+        "p95_ms": round(percentile(ok, 95), 2),
+        "p99_ms": round(percentile(ok, 99), 2),
+        "queries": queries,
+        "bytes": round(sum(s.size for s in samples) / len(samples)) if samples else 0,
+    }
@@ -0,0 +1,66 @@
+import http.client
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+# =======================
+# LOCAL SERVER
+# =======================
+# The app is served by real gunicorn workers on 127.0.0.1, with the
+# settings and database of the calling process (DJANGO_SETTINGS_MODULE
+# and DATABASE_URL are inherited), so nothing leaves the machine.
+
+MODES = {
+    "wsgi": (["asset_management.wsgi:application"], "0"),
+    "asgi": (
+        ["asset_management.asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+        "1",
+    ),
+}
+
+
+def bench_host():
+    """A Host header that ALLOWED_HOSTS accepts."""
+    host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost"
+    if host == "*":
+        return "localhost"
+    return f"bench{host}" if host.startswith(".") else host
+
+
+def wait_ready(port, host, path="/api/dashboard/", timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", path, headers={"Host": host})
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+@contextmanager
+def serve(mode, port, workers, **env):
+    """Run gunicorn in ``mode`` until the block exits; extra ``env`` is passed on."""
+    app, async_views = MODES[mode]
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", *app,
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+        env=dict(os.environ, ASYNC_VIEWS=async_views, **env),
+    )
+    try:
+        wait_ready(port, bench_host())
+        yield
+    finally:
+        server.terminate()
+        server.wait()
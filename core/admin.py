@@ -1,25 +1,60 @@
 from django.contrib import admin
+from django.db import transaction
 from .models import Asset, InventoryItem, Assignment, RepairTicket,User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+
+from . import counters
+
+
+class CountedAdminMixin:
+    """Keep ``DashboardCounter`` rows in step with admin writes."""
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            if not change:
+                super().save_model(request, obj, form, change)
+                counters.created(obj)
+                return
+
+            # The form has already changed obj; the keys come from the row
+            old = type(obj)._default_manager.select_for_update().get(pk=obj.pk)
+            before = counters.keys(old)
+            super().save_model(request, obj, form, change)
+            counters.changed(before, obj)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            counters.deleted(obj, *counters.cascaded(obj))
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            rows = list(queryset)
+            counters.deleted(*rows, *[c for row in rows for c in counters.cascaded(row)])
+            super().delete_queryset(request, queryset)
+
+
 @admin.register(Asset)
-class AssetAdmin(admin.ModelAdmin):
+class AssetAdmin(CountedAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'type', 'serial_number', 'status')
     list_filter = ('status', 'type')
     search_fields = ('name', 'serial_number')
 
 
 @admin.register(InventoryItem)
-class InventoryAdmin(admin.ModelAdmin):
+class InventoryAdmin(CountedAdminMixin, admin.ModelAdmin):
     list_display = ('item_type', 'quantity', 'threshold')
 
 
 @admin.register(Assignment)
-class AssignmentAdmin(admin.ModelAdmin):
+class AssignmentAdmin(CountedAdminMixin, admin.ModelAdmin):
     list_display = ('asset', 'employee', 'date_assigned', 'date_returned')
     list_filter = ('date_assigned',)
+    # __str__ of each row reads both
+    list_select_related = ('asset', 'employee')
 
 @admin.register(RepairTicket)
-class RepairAdmin(admin.ModelAdmin):
+class RepairAdmin(CountedAdminMixin, admin.ModelAdmin):
     list_display = (
         "asset",
         "status",
@@ -27,6 +62,7 @@ class RepairAdmin(admin.ModelAdmin):
         "opened_on",   # ✅ exists
         "resolved_on",
     )
+    list_select_related = ("asset", "technician")
 
 
 @admin.register(User)
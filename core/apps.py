@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import authentication, caching, conditional, counters, search, timing
+
+        authentication.connect_signals()
+        caching.connect_signals()
+        conditional.connect_signals()
+        counters.connect_signals()
+        timing.connect_signals()
+        post_migrate.connect(search.install, sender=self)
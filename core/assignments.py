@@ -0,0 +1,288 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+
+from . import caching, counters, events
+from .models import Asset, Assignment
+
+
+# =======================
+# ASSIGNMENT SERVICE
+# =======================
+# Assigning and returning lock the asset row (SELECT ... FOR UPDATE) for
+# the length of the transaction, so two requests for the same asset are
+# serialized; the one_active_assignment_per_asset constraint backs this
+# up on databases without row locks. Status flips are narrow UPDATEs of
+# the changed columns, not full-row saves.
+
+NOT_AVAILABLE = "Asset is not available."
+ONE_ACTIVE = "one_active_assignment_per_asset"
+
+
+def lost_race(exc):
+    """Whether an IntegrityError is the ONE_ACTIVE constraint failing."""
+    message = str(exc)
+    # Postgres names the constraint; SQLite only the indexed column
+    return ONE_ACTIVE in message or f"{Assignment._meta.db_table}.asset_id" in message
+
+
+def set_asset_status(asset, status):
+    """UPDATE only ``status``/``updated_at`` on a locked ``asset``."""
+    before = counters.keys(asset)
+    asset.status = status
+    asset.updated_at = now()
+    Asset.objects.filter(pk=asset.pk).update(
+        status=status, updated_at=asset.updated_at
+    )
+    counters.changed(before, asset)
+    # .update() sends no post_save
+    caching.invalidate(*caching.INVALIDATES[Asset])
+
+
+def lock_asset(asset_id):
+    try:
+        return Asset.objects.select_for_update().get(pk=asset_id)
+    except Asset.DoesNotExist:
+        raise ValidationError({"asset": ["Asset does not exist."]})
+
+
+def assign(asset, employee):
+    """Create an ACTIVE assignment and mark the asset ASSIGNED."""
+    try:
+        with transaction.atomic():
+            asset = lock_asset(asset.pk)
+            if asset.status != "AVAILABLE":
+                raise ValidationError({"asset": [NOT_AVAILABLE]})
+
+            assignment = Assignment.objects.create(
+                asset=asset, employee=employee, status="ACTIVE"
+            )
+            counters.created(assignment)
+            set_asset_status(asset, "ASSIGNED")
+            events.assignments_changed("assignment.created", [assignment])
+    except IntegrityError as exc:
+        # Lost the race on a database without SELECT ... FOR UPDATE
+        if not lost_race(exc):
+            raise
+        raise ValidationError({"asset": [NOT_AVAILABLE]})
+
+    return assignment
+
+
+def return_assignment(assignment):
+    """Mark an ACTIVE assignment RETURNED and free its asset (idempotent)."""
+    with transaction.atomic():
+        asset = lock_asset(assignment.asset_id)
+        assignment = Assignment.objects.select_for_update().get(pk=assignment.pk)
+        if assignment.status == "RETURNED" and assignment.date_returned:
+            return assignment
+
+        before = counters.keys(assignment)
+        assignment.status = "RETURNED"
+        assignment.date_returned = assignment.updated_at = now()
+        Assignment.objects.filter(pk=assignment.pk).update(
+            status=assignment.status,
+            date_returned=assignment.date_returned,
+            updated_at=assignment.updated_at,
+        )
+        counters.changed(before, assignment)
+        caching.invalidate(*caching.INVALIDATES[Assignment])
+
+        set_asset_status(asset, "AVAILABLE")
+        events.assignments_changed("assignment.returned", [assignment])
+
+    return assignment
+
+
+def check_update(assignment, data):
+    """How to apply ``data`` to a locked ``assignment``: "return" or "save".
+
+    Only ACTIVE -> RETURNED changes the asset's status, and it goes
+    through return_assignment(). Moving an assignment to another asset or
+    reactivating a returned one would bypass the asset lock, so they are
+    rejected; returning can't be combined with other changes.
+    """
+    changed = {field for field, value in data.items() if getattr(assignment, field) != value}
+
+    if "asset" in changed:
+        raise ValidationError({"asset": [
+            "An assignment can't move to another asset; return it and assign the new one."
+        ]})
+    if "status" not in changed:
+        return "save"
+    if data["status"] != "RETURNED":
+        raise ValidationError({"status": [
+            "A returned assignment can't be reactivated; create a new one."
+        ]})
+    if changed - {"status", "date_returned"}:
+        raise ValidationError({"status": [
+            "Return an assignment on its own, without other changes."
+        ]})
+    return "return"
+
+
+# =======================
+# BULK
+# =======================
+# One locking SELECT validates the whole batch, then a single INSERT and
+# a single UPDATE ... WHERE id IN (...) apply it, all in one transaction.
+# Items that fail validation are reported and skipped.
+
+MAX_BATCH = 1000
+
+
+def _check_batch(items, key):
+    # ``key`` is the payload field, so errors point at what the client sent
+    if not isinstance(items, list) or not items:
+        raise ValidationError({key: ["Expected a non-empty list."]})
+    if len(items) > MAX_BATCH:
+        raise ValidationError({key: [f"At most {MAX_BATCH} items per request."]})
+
+
+def _locked(model, ids):
+    """``{pk: row}`` locked in primary-key order, so batches can't deadlock."""
+    rows = model.objects.select_for_update().filter(pk__in=ids).order_by("pk")
+    return {row.pk: row for row in rows}
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _flip_assets(assets, status):
+    stamp = now()
+    before = [k for asset in assets for k in counters.keys(asset)]
+    for asset in assets:
+        asset.status = status
+        asset.updated_at = stamp
+    Asset.objects.filter(pk__in=[a.pk for a in assets]).update(
+        status=status, updated_at=stamp
+    )
+    counters.changed(before, *assets)
+
+
+def bulk_assign(items):
+    """Assign ``[{"asset": id, "employee": id}, ...]``; one result per item."""
+    _check_batch(items, "items")
+    results = [None] * len(items)
+    pairs = {}
+
+    for index, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        asset_id, employee_id = _as_id(item.get("asset")), _as_id(item.get("employee"))
+        if asset_id is None or employee_id is None:
+            results[index] = {"index": index, "errors": {
+                "non_field_errors": ["Both asset and employee ids are required."]
+            }}
+        else:
+            pairs[index] = (asset_id, employee_id)
+
+    try:
+        with transaction.atomic():
+            assets = _locked(Asset, {asset_id for asset_id, _ in pairs.values()})
+            employees = set(
+                get_user_model().objects.filter(
+                    pk__in={employee_id for _, employee_id in pairs.values()}
+                ).values_list("id", flat=True)
+            )
+
+            claimed = set()
+            created = []
+            for index, (asset_id, employee_id) in pairs.items():
+                asset = assets.get(asset_id)
+                if asset is None:
+                    error = {"asset": ["Asset does not exist."]}
+                elif employee_id not in employees:
+                    error = {"employee": ["User does not exist."]}
+                elif asset.status != "AVAILABLE" or asset_id in claimed:
+                    error = {"asset": [NOT_AVAILABLE]}
+                else:
+                    claimed.add(asset_id)
+                    created.append((index, Assignment(
+                        asset=asset, employee_id=employee_id, status="ACTIVE"
+                    )))
+                    continue
+                results[index] = {"index": index, "errors": error}
+
+            if created:
+                Assignment.objects.bulk_create([a for _, a in created])
+                counters.created(*[a for _, a in created])
+                _flip_assets([assets[asset_id] for asset_id in claimed], "ASSIGNED")
+                # bulk_create / update() send no signals
+                caching.invalidate(
+                    *caching.INVALIDATES[Asset], *caching.INVALIDATES[Assignment]
+                )
+                events.assignments_changed(
+                    "assignment.created", [a for _, a in created]
+                )
+    except IntegrityError as exc:
+        if not lost_race(exc):
+            raise
+        raise ValidationError({"items": [
+            "Another request assigned one of these assets; retry the batch."
+        ]})
+
+    for index, assignment in created:
+        results[index] = {"index": index, "id": assignment.id, "status": "ACTIVE"}
+    return results
+
+
+def bulk_return(ids):
+    """Return every assignment in ``ids``; one result per id."""
+    _check_batch(ids, "ids")
+    results = [None] * len(ids)
+    wanted = {}
+
+    for index, value in enumerate(ids):
+        assignment_id = _as_id(value)
+        if assignment_id is None:
+            results[index] = {"index": index, "errors": {"id": ["A valid id is required."]}}
+        else:
+            wanted[index] = assignment_id
+
+    with transaction.atomic():
+        # Lock assets before assignments, in the same order as assign()
+        asset_ids = Assignment.objects.filter(
+            pk__in=set(wanted.values())
+        ).values_list("asset_id", flat=True)
+        assets = _locked(Asset, set(asset_ids))
+        found = _locked(Assignment, set(wanted.values()))
+
+        stamp = now()
+        returning = {}
+        for index, assignment_id in wanted.items():
+            assignment = found.get(assignment_id)
+            if assignment is None:
+                results[index] = {"index": index, "errors": {
+                    "id": ["Assignment does not exist."]
+                }}
+                continue
+            if assignment.status == "ACTIVE":
+                returning[assignment_id] = assignment
+            results[index] = {"index": index, "id": assignment_id, "status": "RETURNED"}
+
+        if returning:
+            returned = list(returning.values())
+            before = [k for a in returned for k in counters.keys(a)]
+            for assignment in returned:
+                assignment.status = "RETURNED"
+                assignment.date_returned = assignment.updated_at = stamp
+            Assignment.objects.filter(pk__in=returning).update(
+                status="RETURNED", date_returned=stamp, updated_at=stamp
+            )
+            counters.changed(before, *returned)
+
+            _flip_assets(
+                [assets[a.asset_id] for a in returned if a.asset_id in assets],
+                "AVAILABLE",
+            )
+            caching.invalidate(
+                *caching.INVALIDATES[Asset], *caching.INVALIDATES[Assignment]
+            )
+            events.assignments_changed("assignment.returned", returned)
+
+    return results
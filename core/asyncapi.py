@@ -0,0 +1,88 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.utils.cache import patch_vary_headers
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .authentication import ClaimsJWTAuthentication
+
+
+# =======================
+# ASYNC API VIEWS
+# =======================
+# DRF's APIView is synchronous, so under ASGI every DRF view costs a hop
+# to the sync thread. ``async_api_view`` gives a coroutine view the parts
+# of @api_view that the read-only JSON endpoints use: method check, JWT
+# auth, permission classes and a JSON-rendered ``Response``. The status
+# codes and error bodies are the ones DRF would send.
+#
+# Auth runs in a worker thread (it may read the account status); the
+# view itself should use the async ORM (``async for``, ``aget``, ...).
+# The response decorators in core.caching and core.conditional accept
+# coroutine views, so the decorator stack is the same as on sync views:
+#
+#     @async_api_view(["GET"], permission_classes=[IsAuthenticated, IsAdminRole])
+#     @conditional([...])
+#     @cached_response(...)
+#     async def view(request): ...
+
+def _error(exc):
+    detail = exc.detail
+    if not isinstance(detail, (list, dict)):
+        detail = {"detail": detail}
+    response = Response(detail, status=exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        response["WWW-Authenticate"] = ClaimsJWTAuthentication().authenticate_header(None)
+    return response
+
+
+def _check(request, permission_classes):
+    for permission in (cls() for cls in permission_classes):
+        if not permission.has_permission(request, None):
+            if not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+
+def _finalize(response):
+    if isinstance(response, Response):
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = "application/json"
+        response.renderer_context = {}
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def async_api_view(
+    http_method_names, permission_classes=(), authentication_class=ClaimsJWTAuthentication
+):
+    """``@api_view`` + ``@permission_classes`` for a coroutine view."""
+    authenticator = authentication_class()
+    allowed = {m.upper() for m in http_method_names}
+    if "GET" in allowed:
+        allowed.add("HEAD")
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in allowed:
+                response = _finalize(_error(exceptions.MethodNotAllowed(request.method)))
+                response["Allow"] = ", ".join(sorted(allowed))
+                return response
+
+            try:
+                result = await sync_to_async(authenticator.authenticate)(request)
+                request.user, request.auth = result or (AnonymousUser(), None)
+                _check(request, permission_classes)
+            except exceptions.APIException as exc:
+                return _finalize(_error(exc))
+
+            return _finalize(await view(request, *args, **kwargs))
+
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
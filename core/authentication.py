@@ -0,0 +1,204 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+User = get_user_model()
+
+
+# =======================
+# STATELESS JWT AUTHENTICATION
+# =======================
+# Access tokens already carry user_id and username, so most API calls
+# never need the User row. ClaimsJWTAuthentication returns a ClaimsUser
+# built from the claims plus the account status: whether the account
+# still exists, is active, its role and (with CHECK_REVOKE_TOKEN) its
+# password hash. The status comes from a per-process cache that holds
+# each answer for AUTH_STATUS_TTL seconds. Saving or deleting a user
+# drops its entry in this process; other workers see the change (a
+# demoted admin, a deactivated account) once their entry expires.
+#
+# The role claim in the token is not trusted; it would outlive a
+# demotion until the token expires.
+#
+# Anything else (email, is_staff, permissions, ...) loads the row on
+# first use. Query by id: filter(employee_id=request.user.id).
+
+STATUS_TTL = getattr(settings, "AUTH_STATUS_TTL", 30)
+MAX_ENTRIES = 10000
+
+_status = {}
+_status_lock = threading.Lock()
+
+
+def account_status(user_id):
+    """``(is_active, password_md5, role)``, or None if the user doesn't exist."""
+    now = time.monotonic()
+    entry = _status.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    row = (
+        User.objects.filter(pk=user_id)
+        .values_list("is_active", "password", "role")
+        .first()
+    )
+    status = None if row is None else (row[0], get_md5_hash_password(row[1]), row[2])
+
+    with _status_lock:
+        if len(_status) >= MAX_ENTRIES:
+            _status.clear()
+        _status[user_id] = (now + STATUS_TTL, status)
+    return status
+
+
+def forget(user_id=None):
+    """Drop the cached status of ``user_id`` (or of everyone)."""
+    with _status_lock:
+        if user_id is None:
+            _status.clear()
+        else:
+            _status.pop(user_id, None)
+
+
+class ClaimsUser(TokenUser):
+    """``request.user`` built from token claims; the row loads lazily."""
+
+    def __init__(self, token, role=None):
+        super().__init__(token)
+        if role is not None:
+            self.role = role
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def username(self):
+        return self.token.get("username") or self.instance.username
+
+    @cached_property
+    def instance(self):
+        """The full ``User`` row."""
+        return User.objects.get(pk=self.id)
+
+    # TokenUser answers these from claims or hard-codes them (no groups,
+    # no permissions); they come from the row instead
+
+    @property
+    def is_staff(self):
+        return self.instance.is_staff
+
+    @property
+    def is_superuser(self):
+        return self.instance.is_superuser
+
+    @property
+    def is_active(self):
+        return self.instance.is_active
+
+    @property
+    def groups(self):
+        return self.instance.groups
+
+    @property
+    def user_permissions(self):
+        return self.instance.user_permissions
+
+    def get_group_permissions(self, obj=None):
+        return self.instance.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj=None):
+        return self.instance.get_all_permissions(obj)
+
+    def has_perm(self, perm, obj=None):
+        return self.instance.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return self.instance.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module):
+        return self.instance.has_module_perms(module)
+
+    def __str__(self):
+        return self.username
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.instance, attr)
+
+    def save(self, *args, **kwargs):
+        self.instance.save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self.instance.delete(*args, **kwargs)
+
+    def set_password(self, raw_password):
+        self.instance.set_password(raw_password)
+
+    def check_password(self, raw_password):
+        return self.instance.check_password(raw_password)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` without the per-request ``User`` query."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        status = account_status(int(validated_token[api_settings.USER_ID_CLAIM]))
+        if status is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        is_active, password, role = status
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password
+        ):
+            raise AuthenticationFailed(
+                "The user's password has been changed.", code="password_changed"
+            )
+
+        return ClaimsUser(validated_token, role=role)
+
+
+class QueryTokenAuthentication(ClaimsJWTAuthentication):
+    """Also accepts the access token as ``?token=``.
+
+    Only for endpoints browsers open without custom headers (EventSource).
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        raw_token = request.GET.get("token")
+        if result is not None or not raw_token:
+            return result
+
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
+
+
+# =======================
+# SIGNALS
+# =======================
+
+def _forget_user(sender, instance, **kwargs):
+    forget(instance.pk)
+
+
+def connect_signals():
+    post_save.connect(_forget_user, sender=User, dispatch_uid="auth_status_save")
+    post_delete.connect(_forget_user, sender=User, dispatch_uid="auth_status_delete")
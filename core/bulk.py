@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from rest_framework.renderers import JSONRenderer
+
+from . import caching, counters
+from .models import Asset
+from .serializers import AssetSerializer
+
+
+# =======================
+# BULK ASSET IMPORT / EXPORT
+# =======================
+# Input is read and written in chunks, so neither direction holds the
+# whole file or table in memory. Import validates every row with
+# AssetSerializer rules, but checks serial-number uniqueness once per
+# chunk instead of once per row, and writes each chunk with bulk_create.
+
+FORMATS = ("csv", "jsonl")
+EXPORT_FIELDS = [
+    "id", "name", "type", "serial_number", "status", "purchase_date", "updated_at",
+]
+CHUNK_SIZE = 1000
+
+
+class BulkAssetSerializer(AssetSerializer):
+    class Meta(AssetSerializer.Meta):
+        # Uniqueness is checked per chunk in _import_chunk()
+        extra_kwargs = {"serial_number": {"validators": []}}
+
+
+def guess_format(name, default="csv"):
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def read_rows(stream, file_format):
+    """Yield ``(row_number, data)`` from a text stream; bad JSON -> None."""
+    if file_format == "csv":
+        # Header is line 1, so the first record is row 2 (as in a spreadsheet)
+        for number, row in enumerate(csv.DictReader(stream), start=2):
+            yield number, row
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+
+def text_stream(binary):
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def import_assets(rows, chunk_size=CHUNK_SIZE):
+    """Create assets from ``(row_number, data)`` pairs.
+
+    Invalid rows are reported and skipped; they never abort the batch.
+    Returns ``{"created": n, "errors": [{"row": n, "errors": {...}}]}``.
+    """
+    report = {"created": 0, "errors": []}
+    rows = iter(rows)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        _import_chunk(chunk, report)
+
+    if report["created"]:
+        caching.invalidate("assets", "dashboard")
+    return report
+
+
+def _error(report, number, errors):
+    report["errors"].append({"row": number, "errors": errors})
+
+
+def _import_chunk(chunk, report):
+    valid = []
+    for number, data in chunk:
+        if not isinstance(data, dict):
+            _error(report, number, {"non_field_errors": ["Invalid JSON object."]})
+            continue
+
+        serializer = BulkAssetSerializer(data=data)
+        if serializer.is_valid():
+            valid.append((number, Asset(**serializer.validated_data)))
+        else:
+            _error(report, number, serializer.errors)
+
+    existing = set(
+        Asset.objects.filter(
+            serial_number__in=[asset.serial_number for _, asset in valid]
+        ).values_list("serial_number", flat=True)
+    )
+
+    fresh = []
+    for number, asset in valid:
+        if asset.serial_number in existing:
+            _error(report, number, {
+                "serial_number": ["asset with this serial number already exists."]
+            })
+            continue
+        existing.add(asset.serial_number)
+        fresh.append((number, asset))
+
+    try:
+        with transaction.atomic():
+            Asset.objects.bulk_create([asset for _, asset in fresh])
+            counters.created(*[asset for _, asset in fresh])
+        report["created"] += len(fresh)
+    except IntegrityError:
+        # A concurrent writer took one of the serials; retry row by row
+        for number, asset in fresh:
+            asset.pk = None
+            try:
+                with transaction.atomic():
+                    asset.save()
+                    counters.created(asset)
+                report["created"] += 1
+            except IntegrityError:
+                _error(report, number, {
+                    "serial_number": ["asset with this serial number already exists."]
+                })
+
+
+def export_assets(file_format, queryset=None, chunk_size=CHUNK_SIZE):
+    """Yield the asset table as CSV or JSON Lines, a chunk at a time."""
+    queryset = Asset.objects.all() if queryset is None else queryset
+    rows = queryset.order_by("id").values(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size
+    )
+
+    if file_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if count % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+        return
+
+    # Same date/time encoding as the API responses
+    renderer = JSONRenderer()
+    lines = []
+    for row in rows:
+        lines.append(renderer.render(row).decode() + "\n")
+        if len(lines) == chunk_size:
+            yield "".join(lines)
+            lines = []
+    yield "".join(lines)
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from rest_framework.response import Response
+
+from .models import Asset, InventoryItem, Assignment, RepairTicket, ActivityLog
+
+
+# =======================
+# RESPONSE CACHE
+# =======================
+# Cached responses are keyed by a version number per namespace. Writes
+# never delete keys; they bump the namespace version, which orphans
+# every entry built from the old data (they expire on their own).
+
+TIMEOUT = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+# Which cached namespaces each model's rows feed into. User has none:
+# /api/users/ is streamed (core.streaming), and caching it would mean
+# building the whole list in memory, which is what streaming avoids.
+INVALIDATES = {
+    Asset: ["assets", "dashboard"],
+    InventoryItem: ["inventory", "dashboard"],
+    Assignment: ["assignments", "dashboard", "employee"],
+    RepairTicket: ["tickets", "dashboard", "employee", "technician"],
+    ActivityLog: ["activity"],
+}
+
+# Namespaces whose views read DashboardCounter rows; rewriting the
+# counters directly (rebuild_counters, check_counters --fix) sends no
+# signals, so those commands invalidate these themselves
+COUNTED = ["dashboard", "employee", "technician"]
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def _record(name, outcome):
+    with _metrics_lock:
+        _metrics[(name, outcome)] += 1
+
+
+def metrics():
+    """Per-endpoint ``{"hits": n, "misses": n}`` for this process."""
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+
+    result = {}
+    for (name, outcome), count in snapshot.items():
+        result.setdefault(name, {"hits": 0, "misses": 0})[outcome] = count
+    return result
+
+
+def _versions(namespaces):
+    keys = [f"ns:{ns}" for ns in namespaces]
+    found = cache.get_many(keys)
+
+    for key in keys:
+        if key not in found:
+            # Start from a clock value so an evicted version can never
+            # fall back onto an old, still-cached generation
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+
+    return [found[key] for key in keys]
+
+
+def _bump(namespaces):
+    for ns in namespaces:
+        try:
+            cache.incr(f"ns:{ns}")
+        except ValueError:
+            cache.add(f"ns:{ns}", time.time_ns(), None)
+
+
+def invalidate(*namespaces):
+    """Bump now and again after commit.
+
+    The second bump drops anything a concurrent reader cached from the
+    pre-commit state while this transaction was still open.
+    """
+    _bump(namespaces)
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def cache_key(request, name, namespaces, per_user):
+    user = request.user.id if per_user else "all"
+    query = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    versions = ".".join(str(v) for v in _versions(namespaces))
+    return f"resp:{name}:{versions}:{user}:{query}"
+
+
+def cached_response(name, namespaces, per_user=False, timeout=TIMEOUT):
+    """Cache a DRF view's 200 responses until a namespace is invalidated.
+
+    Goes under ``@api_view``/``@permission_classes`` so that auth runs
+    first; use ``method_decorator`` on viewset actions. Works on sync and
+    async views.
+    """
+    def lookup(request):
+        key = cache_key(request, name, namespaces, per_user)
+        return key, cache.get(key)
+
+    def hit(data):
+        _record(name, "hits")
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+        return response
+
+    def store(key, response):
+        if response.status_code == 200 and isinstance(response, Response):
+            cache.set(key, response.data, timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method != "GET":
+                    return await view(request, *args, **kwargs)
+
+                key, data = await sync_to_async(lookup)(request)
+                if data is not None:
+                    return hit(data)
+
+                _record(name, "misses")
+                response = await view(request, *args, **kwargs)
+                return await sync_to_async(store)(key, response)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            key, data = lookup(request)
+            if data is not None:
+                return hit(data)
+
+            _record(name, "misses")
+            return store(key, view(request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+# =======================
+# SIGNALS
+# =======================
+
+def _invalidate_for(sender, **kwargs):
+    invalidate(*INVALIDATES[sender])
+
+
+def connect_signals():
+    for model in INVALIDATES:
+        post_save.connect(_invalidate_for, sender=model, dispatch_uid=f"cache-{model.__name__}")
+        post_delete.connect(_invalidate_for, sender=model, dispatch_uid=f"cache-del-{model.__name__}")
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+
+from . import counters
+from .models import Asset, InventoryItem, Assignment, RepairTicket
+
+
+# =======================
+# CONDITIONAL GET
+# =======================
+# A table's version stamp is (MAX(updated_at), MAX(id), deletions):
+# updated_at moves on every save, id on every insert, and deletions are
+# counted in a "deleted.<model>" DashboardCounter by a post_delete hook.
+# The number of counters.rebuild() runs is stamped too, since a rebuild
+# changes the dashboard numbers without touching any table. All stamps
+# an endpoint depends on are read in a single query, before the view
+# body runs.
+#
+# Only an ETag is sent. A Last-Modified derived from MAX(updated_at) has
+# one-second resolution and can't see deletions, so If-Modified-Since
+# would get 304s for stale data.
+
+TRACKED = [Asset, InventoryItem, Assignment, RepairTicket]
+
+
+def _counter_sql():
+    q = connection.ops.quote_name
+    counter = q(counters.DashboardCounter._meta.db_table)
+    return (
+        f"(SELECT {q('value')} FROM {counter} "
+        f"WHERE {q('key')} = %s AND {q('user_id')} IS NULL)"
+    )
+
+
+def _stamp_sql(model):
+    q = connection.ops.quote_name
+    table = q(model._meta.db_table)
+    return (
+        f"(SELECT MAX({q('updated_at')}) FROM {table}), "
+        f"(SELECT MAX({q('id')}) FROM {table}), "
+        f"{_counter_sql()}"
+    ), [deleted_key(model)]
+
+
+def deleted_key(model):
+    return f"{counters.STAMP_PREFIX}{model._meta.model_name}"
+
+
+def version_stamps(models):
+    """Each model's ``(updated_at, max_id, deletions)``, then the rebuild count."""
+    parts, params = zip(*(_stamp_sql(model) for model in models))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT " + ", ".join(parts) + ", " + _counter_sql(),
+            [p for group in params for p in group] + [counters.REBUILDS],
+        )
+        *row, rebuilds = cursor.fetchone()
+
+    stamps = []
+    for i in range(0, len(row), 3):
+        updated_at, max_id, deletions = row[i:i + 3]
+        if isinstance(updated_at, str):
+            # SQLite loses the column type through a subquery
+            updated_at = parse_datetime(updated_at)
+        stamps.append((updated_at, max_id, deletions))
+    stamps.append(rebuilds)
+    return stamps
+
+
+def _etag(request, models, per_user):
+    stamps = version_stamps(models)
+    user = request.user.id if per_user else ""
+    digest = hashlib.md5(
+        f"{request.get_full_path()}|{user}|{stamps!r}".encode()
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional(models, per_user=False):
+    """ETag for a DRF view from its tables' version stamps.
+
+    Goes under ``@permission_classes`` so 304s are only sent to requests
+    that passed auth; ``If-None-Match`` short-circuits the view body.
+    Works on sync and async views.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await view(request, *args, **kwargs)
+
+                etag = await sync_to_async(_etag)(request, models, per_user)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                response["ETag"] = etag
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            etag = _etag(request, models, per_user)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response["ETag"] = etag
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# =======================
+# SIGNALS
+# =======================
+
+def _count_deletion(sender, **kwargs):
+    counters.bump(deleted_key(sender))
+
+
+def connect_signals():
+    for model in TRACKED:
+        post_delete.connect(
+            _count_deletion, sender=model, dispatch_uid=f"conditional-{model.__name__}"
+        )
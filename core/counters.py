@@ -0,0 +1,300 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import BigIntegerField, Case, Count, F, Q, Value, When
+from django.db.models.signals import pre_delete
+
+from .models import Asset, InventoryItem, Assignment, RepairTicket, DashboardCounter
+
+
+# =======================
+# MATERIALIZED COUNTERS
+# =======================
+# Each row contributes +1 to a set of (key, user_id) counters, derived
+# from its current field values by ``keys()``. Writers snapshot the keys
+# before a change and apply the difference afterwards, inside the same
+# transaction, so dashboard reads become a single key lookup.
+#
+#   assets.total / assets.<STATUS>                  global
+#   inventory.total / inventory.low_stock           global
+#   assignments.assigned                            global (not returned)
+#   assignments.<STATUS>                            per employee
+#   tickets.<STATUS>                                global
+#   reported.<STATUS> / assigned.<STATUS>           per reporter / technician
+#
+# Every writer calls created() / changed() / deleted() itself: the API
+# views, core.assignments, core.bulk and the admin. Deleting a row also
+# removes the rows cascaded() lists. Deleting a user is handled by a
+# pre_delete hook, since any code path may do it.
+#
+# "deleted.<model>" rows count deletions for core.conditional, and
+# REBUILDS counts rebuild() runs so that ETags change with the numbers.
+# They have no live equivalent and are left alone by rebuild() and check().
+
+STAMP_PREFIX = "deleted."
+REBUILDS = "rebuilds"
+
+
+def keys(instance):
+    if isinstance(instance, Asset):
+        return [("assets.total", None), (f"assets.{instance.status}", None)]
+
+    if isinstance(instance, InventoryItem):
+        result = [("inventory.total", None)]
+        if instance.quantity <= instance.threshold:
+            result.append(("inventory.low_stock", None))
+        return result
+
+    if isinstance(instance, Assignment):
+        result = [(f"assignments.{instance.status}", instance.employee_id)]
+        if instance.date_returned is None:
+            result.append(("assignments.assigned", None))
+        return result
+
+    if isinstance(instance, RepairTicket):
+        result = [(f"tickets.{instance.status}", None)]
+        if instance.reported_by_id:
+            result.append((f"reported.{instance.status}", instance.reported_by_id))
+        if instance.technician_id:
+            result.append((f"assigned.{instance.status}", instance.technician_id))
+        return result
+
+    return []
+
+
+def cascaded(instance):
+    """Counted rows that deleting ``instance`` deletes with it."""
+    if isinstance(instance, Asset):
+        return [*instance.assignments.all(), *instance.repairticket_set.all()]
+    return []
+
+
+def _apply(deltas):
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if len(deltas) == 1:
+        [((key, user_id), delta)] = deltas.items()
+        bump(key, user_id, delta)
+    elif deltas:
+        _bump_many(deltas)
+
+
+def bump(key, user_id=None, delta=1):
+    counter = DashboardCounter.objects.filter(key=key, user_id=user_id)
+
+    if counter.update(value=F("value") + delta):
+        return
+
+    try:
+        with transaction.atomic():
+            DashboardCounter.objects.create(key=key, user_id=user_id, value=delta)
+    except IntegrityError:
+        # A concurrent writer created the row first
+        counter.update(value=F("value") + delta)
+
+
+def _bump_many(deltas):
+    """Apply many deltas in one SELECT, one UPDATE and at most one INSERT."""
+    user_ids = {user_id for _, user_id in deltas if user_id is not None}
+    rows = DashboardCounter.objects.filter(
+        Q(key__in={key for key, _ in deltas}),
+        Q(user__in=user_ids) | Q(user__isnull=True),
+    ).values_list("pk", "key", "user_id")
+    existing = {(key, user_id): pk for pk, key, user_id in rows}
+    existing = {k: pk for k, pk in existing.items() if k in deltas}
+
+    if existing:
+        DashboardCounter.objects.filter(pk__in=existing.values()).update(
+            value=F("value") + Case(
+                *[When(pk=pk, then=Value(deltas[k])) for k, pk in existing.items()],
+                default=Value(0),
+                output_field=BigIntegerField(),
+            )
+        )
+
+    missing = [k for k in deltas if k not in existing]
+    if not missing:
+        return
+
+    try:
+        with transaction.atomic():
+            DashboardCounter.objects.bulk_create([
+                DashboardCounter(key=key, user_id=user_id, value=deltas[(key, user_id)])
+                for key, user_id in missing
+            ])
+    except IntegrityError:
+        # A concurrent writer created some of them first
+        for key, user_id in missing:
+            bump(key, user_id, deltas[(key, user_id)])
+
+
+def created(*instances):
+    _apply(Counter(k for obj in instances for k in keys(obj)))
+
+
+def deleted(*instances):
+    deltas = Counter()
+    deltas.subtract(k for obj in instances for k in keys(obj))
+    _apply(deltas)
+
+
+def changed(before, *instances):
+    """``before`` is the ``keys()`` of ``instances`` taken prior to the change."""
+    deltas = Counter(k for obj in instances for k in keys(obj))
+    deltas.subtract(before)
+    _apply(deltas)
+
+
+# =======================
+# READS
+# =======================
+
+def read(*names, user=None):
+    """Counter values by key (missing counters read as 0), one query."""
+    values = dict.fromkeys(names, 0)
+    rows = DashboardCounter.objects.filter(key__in=names, user=user)
+    values.update(rows.values_list("key", "value"))
+    return values
+
+
+async def aread(*names, user=None):
+    """``read()`` for async views, through the async ORM."""
+    values = dict.fromkeys(names, 0)
+    rows = DashboardCounter.objects.filter(key__in=names, user=user)
+    async for key, value in rows.values_list("key", "value"):
+        values[key] = value
+    return values
+
+
+def _dashboard_keys():
+    asset_statuses = [key for key, _label in Asset.STATUS_CHOICES]
+    ticket_statuses = [key for key, _label in RepairTicket.STATUS_CHOICES]
+    return (
+        "assets.total",
+        "inventory.total",
+        "inventory.low_stock",
+        "assignments.assigned",
+        *[f"assets.{s}" for s in asset_statuses],
+        *[f"tickets.{s}" for s in ticket_statuses],
+    )
+
+
+def _dashboard(c):
+    asset_statuses = [key for key, _label in Asset.STATUS_CHOICES]
+    ticket_statuses = [key for key, _label in RepairTicket.STATUS_CHOICES]
+    return {
+        "total_assets": c["assets.total"],
+        "total_inventory": c["inventory.total"],
+        "assigned_assets": c["assignments.assigned"],
+        "low_stock": c["inventory.low_stock"],
+        "open_tickets": c["tickets.OPEN"] + c["tickets.IN_PROGRESS"],
+        "tickets_status": {s: c[f"tickets.{s}"] for s in ticket_statuses},
+        "assets_status": {s: c[f"assets.{s}"] for s in asset_statuses},
+    }
+
+
+def dashboard_stats():
+    """Payload for the admin dashboard: one counter lookup."""
+    return _dashboard(read(*_dashboard_keys()))
+
+
+async def adashboard_stats():
+    return _dashboard(await aread(*_dashboard_keys()))
+
+
+# =======================
+# REBUILD / CHECK
+# =======================
+
+def _stored():
+    return DashboardCounter.objects.exclude(key__startswith=STAMP_PREFIX).exclude(
+        key=REBUILDS
+    )
+
+
+def live_counts():
+    """Recompute every counter from the base tables."""
+    counts = Counter()
+
+    assets = Asset.objects
+    counts[("assets.total", None)] = assets.count()
+    for row in assets.values("status").annotate(n=Count("id")):
+        counts[(f"assets.{row['status']}", None)] = row["n"]
+
+    inventory = InventoryItem.objects.aggregate(
+        total=Count("id"),
+        low_stock=Count("id", filter=Q(quantity__lte=F("threshold"))),
+    )
+    counts[("inventory.total", None)] = inventory["total"]
+    counts[("inventory.low_stock", None)] = inventory["low_stock"]
+
+    assignments = Assignment.objects
+    counts[("assignments.assigned", None)] = assignments.filter(
+        date_returned__isnull=True
+    ).count()
+    for row in assignments.values("employee", "status").annotate(n=Count("id")):
+        counts[(f"assignments.{row['status']}", row["employee"])] = row["n"]
+
+    tickets = RepairTicket.objects
+    for row in tickets.values("status").annotate(n=Count("id")):
+        counts[(f"tickets.{row['status']}", None)] = row["n"]
+    for prefix, field in (("reported", "reported_by"), ("assigned", "technician")):
+        rows = tickets.filter(**{f"{field}__isnull": False})
+        for row in rows.values(field, "status").annotate(n=Count("id")):
+            counts[(f"{prefix}.{row['status']}", row[field])] = row["n"]
+
+    return +counts  # drop zero entries
+
+
+def rebuild():
+    with transaction.atomic():
+        counts = live_counts()
+        _stored().delete()
+        DashboardCounter.objects.bulk_create(
+            [
+                DashboardCounter(key=key, user_id=user_id, value=value)
+                for (key, user_id), value in counts.items()
+            ],
+            batch_size=1000,
+        )
+        bump(REBUILDS)
+    return len(counts)
+
+
+def check():
+    """Return ``{(key, user_id): (stored, live)}`` for every drifted counter."""
+    stored = Counter({
+        (key, user_id): value
+        for key, user_id, value in _stored().values_list("key", "user_id", "value")
+    })
+    live = live_counts()
+
+    return {
+        k: (stored[k], live[k])
+        for k in set(stored) | set(live)
+        if stored[k] != live[k]
+    }
+
+
+# =======================
+# SIGNALS
+# =======================
+
+def _user_deleted(sender, instance, **kwargs):
+    # The user's own counters go with it (DashboardCounter.user CASCADE)
+    # and tickets only lose their reporter / technician (SET_NULL), so
+    # what's left is the global share of the cascaded assignments
+    deltas = Counter()
+    deltas.subtract(
+        (key, user_id)
+        for assignment in Assignment.objects.filter(employee=instance)
+        for key, user_id in keys(assignment)
+        if user_id is None
+    )
+    _apply(deltas)
+
+
+def connect_signals():
+    pre_delete.connect(
+        _user_deleted, sender=get_user_model(), dispatch_uid="counters-user-delete"
+    )
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+# =======================
+# SERVER-SENT EVENTS
+# =======================
+# Writers publish small events ("ticket.updated", {"id": 7, ...}) to
+# channels: "user:<id>" and "role:<ROLE>". Each open /api/events/
+# stream subscribes to its user's and role's channels and gets every
+# event once, after the writing transaction commits. Events only say
+# what changed; clients refetch the affected view.
+#
+# The backend comes from settings.EVENTS. LocalBackend fans out within
+# this process, which is enough for a single worker (and for tests);
+# RedisBackend relays through Redis pub/sub so that every worker's
+# subscribers see events written by any worker.
+
+HEARTBEAT = 15        # seconds between keep-alive comments
+STREAM_SECONDS = 300  # streams end after this; EventSource reconnects
+RETRY_MS = 2000
+MAX_PENDING = 100     # per subscriber; a slow client loses the oldest
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class Subscription:
+    """Queue of ``(event, payload)`` for one stream, on its event loop."""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(MAX_PENDING)
+
+    def put(self, message):
+        # Called from any thread
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # loop closed: the stream is gone
+
+    def _put(self, message):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout):
+        """The next message, or None after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBackend:
+    """In-process fan-out."""
+
+    def __init__(self, location=None):
+        self._channels = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels)
+        with self._lock:
+            for channel in channels:
+                self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._channels.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._channels[channel]
+
+    def publish(self, channels, event, payload):
+        self.deliver(channels, event, payload)
+
+    def deliver(self, channels, event, payload):
+        with self._lock:
+            targets = set()
+            for channel in channels:
+                targets.update(self._channels.get(channel, ()))
+        for subscription in targets:
+            subscription.put((event, payload))
+
+
+class RedisBackend(LocalBackend):
+    """Relays events through one Redis pub/sub channel to every worker."""
+
+    CHANNEL = "core.events"
+
+    def __init__(self, location):
+        import redis  # only needed when configured
+
+        super().__init__()
+        self._redis = redis.Redis.from_url(location)
+        self._errors = (redis.RedisError,)
+        self._listener = None
+
+    def publish(self, channels, event, payload):
+        # Runs after the write committed; a Redis outage only loses the event
+        try:
+            self._redis.publish(self.CHANNEL, json.dumps([channels, event, payload]))
+        except self._errors:
+            logger.warning("Could not publish %s to Redis", event, exc_info=True)
+
+    def subscribe(self, channels):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, daemon=True)
+                self._listener.start()
+        return super().subscribe(channels)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    self.deliver(*json.loads(message["data"]))
+            except self._errors:
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def _load(path, location):
+    return import_string(path)(location)
+
+
+def backend():
+    config = settings.EVENTS
+    return _load(config["BACKEND"], config.get("LOCATION"))
+
+
+# =======================
+# PUBLISHING
+# =======================
+
+def publish(event, data, users=(), roles=()):
+    """Send ``event`` to ``users`` (ids) and ``roles`` once the current
+    transaction commits (immediately outside one)."""
+    channels = [f"user:{u}" for u in users if u] + [f"role:{r}" for r in roles]
+    payload = _encoder.encode(data)
+    transaction.on_commit(lambda: backend().publish(channels, event, payload))
+
+
+def ticket_changed(event, ticket):
+    publish(
+        event,
+        {"id": ticket.id, "asset": ticket.asset_id, "status": ticket.status},
+        users={ticket.reported_by_id, ticket.technician_id},
+        roles=["ADMIN"],
+    )
+
+
+def assignments_changed(event, assignments):
+    by_employee = defaultdict(list)
+    for assignment in assignments:
+        by_employee[assignment.employee_id].append(assignment.id)
+
+    for employee_id, ids in by_employee.items():
+        publish(event, {"ids": ids}, users=[employee_id])
+    publish(event, {"ids": [a.id for a in assignments]}, roles=["ADMIN"])
+
+
+# =======================
+# STREAM
+# =======================
+
+async def stream(user):
+    """``text/event-stream`` body for ``user``: their events and their role's."""
+    subscription = backend().subscribe([f"user:{user.id}", f"role:{user.role}"])
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_SECONDS
+    try:
+        yield f"retry: {RETRY_MS}\n: connected\n\n".encode()
+        while loop.time() < deadline:
+            message = await subscription.get(HEARTBEAT)
+            if message is None:
+                yield b": keepalive\n\n"
+            else:
+                event, payload = message
+                yield f"event: {event}\ndata: {payload}\n\n".encode()
+    finally:
+        backend().unsubscribe(subscription)
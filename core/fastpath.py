@@ -0,0 +1,157 @@
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+
+# =======================
+# FAST LIST SERIALIZATION
+# =======================
+# With settings.FAST_SERIALIZATION on, list views build their rows from
+# .values() dicts instead of model instances + ModelSerializer. The
+# serializer's fields are compiled once into a plain function
+#
+#     def convert(row):
+#         out = {}
+#         out["id"] = row["id"]
+#         value = row["purchase_date"]
+#         out["purchase_date"] = None if value is None else c1(value)
+#         return out
+#
+# whose converters reproduce DRF's to_representation, so the output is
+# the same JSON, byte for byte. Serializers with any other kind of field
+# raise Unsupported and take the normal path.
+
+class Unsupported(Exception):
+    pass
+
+
+# Fields whose to_representation is the identity for the database value
+IDENTITY = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+# ?fields= / ?exclude= let clients pick any subset of a serializer's
+# fields, so the compiled functions are kept in a bounded LRU
+MAX_COMPILED = 256
+_compiled = OrderedDict()
+
+
+def _datetime(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None:
+        return None
+    if output_format.lower() != ISO_8601:
+        raise Unsupported(field.field_name)
+
+    def convert(value):
+        value = field.enforce_timezone(value).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def _date(field):
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if output_format is None:
+        return None
+    if output_format.lower() != ISO_8601:
+        raise Unsupported(field.field_name)
+    return lambda value: value.isoformat()
+
+
+def _converter(field):
+    """Callable for non-null values of ``field``, or None for identity."""
+    if isinstance(field, serializers.ChoiceField):
+        # Only string choices come back unchanged
+        if all(isinstance(key, str) for key in field.choices):
+            return None
+        raise Unsupported(field.field_name)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime(field)
+    if isinstance(field, serializers.DateField):
+        return _date(field)
+    if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, IDENTITY) and type(field).to_representation in {
+        cls.to_representation for cls in IDENTITY
+    }:
+        return None
+    raise Unsupported(field.field_name)
+
+
+def _plan(fields, model):
+    """``[(name, values() key, converter, null-FK guard key), ...]``"""
+    plan = []
+    for name, field in fields.items():
+        if field.write_only:
+            continue
+        attrs = field.source_attrs
+        if not attrs or len(attrs) > 2:
+            raise Unsupported(name)
+        try:
+            model_field = model._meta.get_field(attrs[0])
+        except FieldDoesNotExist:
+            raise Unsupported(name)
+        if not model_field.concrete or (len(attrs) == 2 and not model_field.is_relation):
+            raise Unsupported(name)
+
+        # DRF drops a read-only "fk.attr" field when the FK is null
+        guard = attrs[0] if len(attrs) == 2 and model_field.null else None
+        plan.append((name, "__".join(attrs), _converter(field), guard))
+    return plan
+
+
+def _build(plan):
+    lines = ["def convert(row):", "    out = {}"]
+    namespace = {}
+
+    for index, (name, key, converter, guard) in enumerate(plan):
+        indent = "    "
+        if guard:
+            lines.append(f"    if row[{guard!r}] is not None:")
+            indent = "        "
+        if converter is None:
+            lines.append(f"{indent}out[{name!r}] = row[{key!r}]")
+        else:
+            namespace[f"c{index}"] = converter
+            lines.append(f"{indent}value = row[{key!r}]")
+            lines.append(
+                f"{indent}out[{name!r}] = None if value is None else c{index}(value)"
+            )
+
+    lines.append("    return out")
+    exec("\n".join(lines), namespace)
+    return namespace["convert"]
+
+
+def compile_serializer(serializer):
+    """``(convert, columns)`` for ``serializer``'s current fields.
+
+    ``convert(row)`` turns one ``.values(*columns)`` dict into the dict
+    the serializer would have produced. Cached per class and field set.
+    """
+    fields = serializer.fields
+    # get_fields() keeps declaration order, so the set decides the output
+    key = (type(serializer), frozenset(fields))
+    if key in _compiled:
+        _compiled.move_to_end(key)
+    else:
+        try:
+            plan = _plan(fields, serializer.Meta.model)
+            columns = {k for _, k, _, _ in plan} | {g for *_, g in plan if g}
+            _compiled[key] = (_build(plan), sorted(columns))
+        except Unsupported:
+            _compiled[key] = None
+        if len(_compiled) > MAX_COMPILED:
+            _compiled.popitem(last=False)
+
+    if _compiled[key] is None:
+        raise Unsupported(type(serializer).__name__)
+    return _compiled[key]
@@ -0,0 +1,104 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
+
+from . import search
+
+
+# =======================
+# FILTER BACKENDS
+# =======================
+
+class QueryParamFilter(BaseFilterBackend):
+    """Filter on the whitelisted query params in ``view.filter_params``.
+
+    ``filter_params = {"status": "status__in", "opened_after": "opened_on__gte"}``
+    ``__in`` lookups take a comma-separated list.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup in getattr(view, "filter_params", {}).items():
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            if lookup.endswith("__in"):
+                value = value.split(",")
+
+            try:
+                queryset = queryset.filter(**{lookup: value})
+            except (ValueError, TypeError, DjangoValidationError):
+                raise ValidationError({param: ["Invalid value."]})
+
+        return queryset
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """``?search=`` over the model's ``core.search.SEARCHABLE`` fields."""
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param)
+        if not text:
+            return queryset
+        return queryset.filter(search.matches(queryset.model, text))
+
+
+def ordering_columns(queryset, view):
+    """Columns the queryset and the view's cursor paginator order by."""
+    ordering = [f for f in queryset.query.order_by if isinstance(f, str)]
+    paginator_ordering = getattr(view.paginator, "ordering", None) or ()
+    if isinstance(paginator_ordering, str):
+        paginator_ordering = [paginator_ordering]
+    return {f.lstrip("-") for f in [*ordering, *paginator_ordering]}
+
+
+def narrow(queryset, fields, keep=()):
+    """``queryset`` loading only the columns serializer ``fields`` read.
+
+    ``"asset.name"`` sources are joined with select_related; a field whose
+    source is not a plain or forward-relation column (``"*"``, properties)
+    leaves the queryset as it was. ``keep`` adds extra columns.
+    """
+    model = queryset.model
+    local = {f.name for f in model._meta.concrete_fields}
+    columns, related = set(keep) & local, set()
+
+    for field in fields.values():
+        if field.write_only:
+            continue
+        attrs = field.source_attrs
+        if not attrs or len(attrs) > 2:
+            return queryset
+        try:
+            model_field = model._meta.get_field(attrs[0])
+        except FieldDoesNotExist:
+            return queryset
+        if not model_field.concrete:
+            return queryset
+
+        columns.add(attrs[0])
+        if len(attrs) == 2:
+            if not model_field.is_relation:
+                return queryset
+            related.add(attrs[0])
+            columns.add("__".join(attrs))
+
+    return queryset.select_related(None).select_related(*related).only(*columns)
+
+
+class SparseFieldsFilter(BaseFilterBackend):
+    """Load only what the response serializer reads (GET only).
+
+    Goes last in ``filter_backends`` so ordering columns are kept.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if request.method not in SAFE_METHODS:
+            return queryset
+
+        return narrow(
+            queryset, view.get_serializer().fields, ordering_columns(queryset, view)
+        )
@@ -0,0 +1,311 @@
+import logging
+import queue
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ActivityLog, Job, RepairTicket
+
+logger = logging.getLogger(__name__)
+
+
+# =======================
+# BACKGROUND JOBS
+# =======================
+# Side effects the response doesn't depend on (activity log rows,
+# notifications, alerts) go through enqueue(), which hands them to the
+# queue once the current transaction commits: a rolled-back write queues
+# nothing, and the request doesn't wait for the work.
+#
+# settings.JOBS_BACKEND picks the queue:
+#   ThreadQueue     a worker thread in each web process (default); jobs
+#                   still queued when the process exits are lost, except
+#                   durable ones
+#   DatabaseQueue   Job rows run by `manage.py run_jobs`; survives
+#                   restarts, failed jobs stay visible
+#   ImmediateQueue  runs the job inside on_commit (tests, scripts)
+#
+# Handlers are registered with @job and take JSON-serializable kwargs;
+# each run is one transaction. Failures are retried with exponential
+# backoff up to max_attempts. ``key`` makes enqueueing idempotent: a
+# second job with the same key is dropped (for the life of the process
+# with ThreadQueue, for good with DatabaseQueue).
+#
+# @job(durable=True) is for work that must not be lost (audit rows):
+# enqueue() writes its Job row in the caller's transaction, whatever the
+# backend, so it commits or rolls back with the change. After commit the
+# backend is woken with the row's id: ThreadQueue runs it in its thread,
+# ImmediateQueue at once, DatabaseQueue leaves it to run_jobs. Running
+# one row claims it with a conditional UPDATE, so two processes never
+# both run it.
+#
+# Rows a dead process left behind are picked up by run_jobs, or by a
+# ThreadQueue thread when it starts, but only where workers can skip
+# each other's locked rows (Postgres); on SQLite that takes run_jobs.
+# DONE rows are kept KEEP_DONE as idempotency keys, then pruned by
+# run_jobs and by ThreadQueue threads.
+
+HANDLERS = {}
+DURABLE = set()
+RETRY_DELAY = 2                 # seconds, doubled after every failure
+LEASE = timedelta(minutes=5)    # a RUNNING job older than this is retried
+MAX_KEYS = 10000
+KEEP_DONE = timedelta(days=7)
+PRUNE_EVERY = 3600              # seconds, per ThreadQueue thread
+
+
+def job(name=None, max_attempts=3, durable=False):
+    def decorator(fn):
+        HANDLERS[name or fn.__name__] = (fn, max_attempts)
+        if durable:
+            DURABLE.add(name or fn.__name__)
+        return fn
+
+    return decorator
+
+
+def enqueue(name, key=None, **kwargs):
+    """Queue ``name(**kwargs)`` to run after the current transaction commits."""
+    if name not in HANDLERS:
+        raise LookupError(f"Unknown job: {name}")
+    if name in DURABLE:
+        pk = save(name, kwargs, key)
+        if pk is not None:
+            transaction.on_commit(lambda: backend().wake(pk))
+    else:
+        transaction.on_commit(lambda: backend().push(name, kwargs, key))
+
+
+def save(name, kwargs, key):
+    """Insert the Job row for ``name(**kwargs)``; its pk, or None if ``key`` exists."""
+    _handler, max_attempts = HANDLERS[name]
+    job = Job(name=name, kwargs=kwargs, key=key, max_attempts=max_attempts,
+              run_at=timezone.now())
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        if key is None:
+            raise
+        return None  # same key: already queued or done
+    return job.pk
+
+
+def run(name, kwargs):
+    handler, _max_attempts = HANDLERS[name]
+    with transaction.atomic():
+        handler(**kwargs)
+
+
+def backoff(attempt):
+    return RETRY_DELAY * 2 ** (attempt - 1)
+
+
+@lru_cache(maxsize=None)
+def _load(path):
+    return import_string(path)()
+
+
+def backend():
+    return _load(settings.JOBS_BACKEND)
+
+
+# =======================
+# QUEUES
+# =======================
+
+class ImmediateQueue:
+    def push(self, name, kwargs, key):
+        _handler, max_attempts = HANDLERS[name]
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return run(name, kwargs)
+            except Exception:
+                if attempt == max_attempts:
+                    logger.exception("Job %s failed after %d attempts", name, attempt)
+
+    def wake(self, pk):
+        job = run_one(pk)
+        while job is not None and job.status == "PENDING":
+            job = run_one(pk)
+
+
+class ThreadQueue:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._next_prune = 0
+
+    def push(self, name, kwargs, key):
+        with self._lock:
+            if key is not None:
+                if key in self._keys:
+                    return
+                self._keys[key] = None
+                if len(self._keys) > MAX_KEYS:
+                    self._keys.popitem(last=False)
+
+            self._start()
+        self._queue.put((name, kwargs, 1))
+
+    def wake(self, pk):
+        with self._lock:
+            self._start()
+        self._queue.put(pk)
+
+    def _start(self):
+        # Started on first use, so it belongs to the forked worker
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, daemon=True)
+            self._thread.start()
+            if connection.features.has_select_for_update_skip_locked:
+                self._queue.put(None)  # durable jobs left by an earlier process
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            close_old_connections()
+            if item is None or isinstance(item, int):
+                try:
+                    self._durable(item)
+                except Exception:
+                    logger.exception("Running durable jobs failed")
+                continue
+
+            name, kwargs, attempt = item
+            try:
+                run(name, kwargs)
+            except Exception:
+                _handler, max_attempts = HANDLERS[name]
+                if attempt >= max_attempts:
+                    logger.exception("Job %s failed after %d attempts", name, attempt)
+                    continue
+                retry = threading.Timer(
+                    backoff(attempt), self._queue.put, [(name, kwargs, attempt + 1)]
+                )
+                retry.daemon = True
+                retry.start()
+
+    def _durable(self, pk):
+        """Run Job ``pk``, or every due row when ``pk`` is None."""
+        if pk is None:
+            while run_pending():
+                pass
+        else:
+            job = run_one(pk)
+            if job is not None and job.status == "PENDING":
+                retry = threading.Timer(backoff(job.attempts), self._queue.put, [pk])
+                retry.daemon = True
+                retry.start()
+
+        if time.monotonic() >= self._next_prune:
+            self._next_prune = time.monotonic() + PRUNE_EVERY
+            prune()
+
+
+class DatabaseQueue:
+    def push(self, name, kwargs, key):
+        save(name, kwargs, key)
+
+    def wake(self, pk):
+        pass  # run_jobs polls
+
+
+def claim(batch):
+    """Mark up to ``batch`` due jobs RUNNING and return them.
+
+    Workers skip each other's locked rows on Postgres; on SQLite run a
+    single worker.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="PENDING", run_at__lte=now)
+                | Q(status="RUNNING", locked_at__lt=now - LEASE)
+            )
+            .order_by("run_at")[:batch]
+        )
+        Job.objects.filter(pk__in=[j.pk for j in jobs]).update(
+            status="RUNNING", locked_at=now, attempts=F("attempts") + 1
+        )
+    for j in jobs:
+        j.attempts += 1
+    return jobs
+
+
+def run_pending(batch=20):
+    """Run one batch of due Job rows; returns how many were claimed."""
+    jobs = claim(batch)
+    for j in jobs:
+        _execute(j)
+    return len(jobs)
+
+
+def run_one(pk):
+    """Run Job ``pk`` if still PENDING; returns it, or None if another caller won."""
+    claimed = Job.objects.filter(pk=pk, status="PENDING").update(
+        status="RUNNING", locked_at=timezone.now(), attempts=F("attempts") + 1
+    )
+    if not claimed:
+        return None
+    return _execute(Job.objects.get(pk=pk))
+
+
+def _execute(j):
+    """Run a claimed job and record the outcome on it and its row."""
+    try:
+        if j.name not in HANDLERS:
+            raise LookupError(f"Unknown job: {j.name}")
+        run(j.name, j.kwargs)
+    except Exception:
+        j.status = "PENDING" if j.attempts < j.max_attempts else "FAILED"
+        Job.objects.filter(pk=j.pk).update(
+            status=j.status,
+            run_at=timezone.now() + timedelta(seconds=backoff(j.attempts)),
+            locked_at=None,
+            last_error=traceback.format_exc(),
+        )
+        if j.status == "FAILED":
+            logger.error("Job %s (%s) failed after %d attempts", j.pk, j.name, j.attempts)
+    else:
+        j.status = "DONE"
+        Job.objects.filter(pk=j.pk).update(status="DONE", locked_at=None)
+    return j
+
+
+def prune(keep=KEEP_DONE):
+    """Delete DONE jobs older than ``keep``; returns how many."""
+    done = Job.objects.filter(status="DONE", created_at__lt=timezone.now() - keep)
+    return done.delete()[0]
+
+
+# =======================
+# JOBS
+# =======================
+
+@job(durable=True)
+def ticket_activity(user_id, ticket_id, status):
+    """The technician's ActivityLog row for a ticket status change."""
+    asset_name = (
+        RepairTicket.objects.filter(pk=ticket_id)
+        .values_list("asset__name", flat=True)
+        .first()
+    )
+    if asset_name is None:
+        return
+    ActivityLog.objects.create(
+        user_id=user_id, message=f"Ticket for {asset_name} marked {status}"
+    )
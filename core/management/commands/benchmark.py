@@ -0,0 +1,373 @@
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import counters, search
+from core.authentication import ClaimsJWTAuthentication
+from core.filters import SparseFieldsFilter
+from core.models import Asset, Assignment, RepairTicket
+from core.serializers import AssetSerializer, AssignmentSerializer, RepairTicketSerializer
+from core.views import AssetViewSet, AssignmentViewSet, RepairTicketViewSet
+
+User = get_user_model()
+
+
+# =======================
+# HELPERS
+# =======================
+
+def timed(fn, repeat):
+    """Median wall time of ``fn()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def token_client_for(user):
+    """Client sending a real access token, as issued by login_view."""
+    refresh = RefreshToken.for_user(user)
+    refresh["role"] = user.role
+    refresh["username"] = user.username
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+def queries_per_request(fn):
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    return len(ctx.captured_queries)
+
+
+def make_assets(count, prefix="BENCH"):
+    Asset.objects.bulk_create(
+        (
+            Asset(
+                name=f"Laptop {i}",
+                type="LAPTOP",
+                serial_number=f"{prefix}-{i:08d}",
+                status="AVAILABLE",
+                purchase_date=date(2024, 1, 1),
+            )
+            for i in range(count)
+        ),
+        batch_size=2000,
+    )
+    return Asset.objects.filter(serial_number__startswith=f"{prefix}-")
+
+
+def make_tickets(count, asset, **fields):
+    RepairTicket.objects.bulk_create(
+        (RepairTicket(asset=asset, issue=f"Issue {i}", **fields) for i in range(count)),
+        batch_size=2000,
+    )
+    # opened_on is auto_now_add, so spread it out afterwards
+    tickets = list(RepairTicket.objects.filter(asset=asset).only("id"))
+    start = timezone.now()
+    for i, ticket in enumerate(tickets):
+        ticket.opened_on = start - timedelta(minutes=i)
+    RepairTicket.objects.bulk_update(tickets, ["opened_on"], batch_size=2000)
+    return RepairTicket.objects.filter(asset=asset)
+
+
+# =======================
+# SCENARIOS
+# =======================
+
+def bench_pagination(cmd, rows, repeat, page_size, **options):
+    """Latency of cursor pages 1 .. N on the asset and ticket lists."""
+    admin = User.objects.create_user("bench_admin", role="ADMIN")
+    client = client_for(admin)
+
+    assets = make_assets(rows)
+    make_tickets(rows, assets.first())
+
+    checkpoints = {1, 10, 100, 1000, rows // page_size}
+
+    for url in ("/api/assets/", "/api/tickets/"):
+        cmd.stdout.write(f"{url} (page_size={page_size})")
+        next_url = f"{url}?page_size={page_size}"
+        page = 0
+        while next_url:
+            page += 1
+            if page in checkpoints:
+                ms = timed(lambda: client.get(next_url), repeat)
+                cmd.stdout.write(f"  page {page:>6}: {ms:8.2f} ms")
+            next_url = client.get(next_url).json()["next"]
+
+
+def bench_technician(cmd, rows, repeat, **options):
+    """Technician dashboard for a technician with ``rows`` tickets."""
+    tech = User.objects.create_user("bench_tech", role="TECHNICIAN")
+    client = client_for(tech)
+
+    asset = make_assets(1).get()
+    make_tickets(rows, asset, technician=tech, status="CLOSED")
+    counters.rebuild()
+
+    url = "/api/technician/dashboard/"
+    size = len(client.get(url).content)
+    ms = timed(lambda: client.get(url), repeat)
+    cmd.stdout.write(
+        f"{url} with {rows} tickets: {ms:.2f} ms, {size / 1024:.1f} KiB"
+    )
+
+
+SYMPTOMS = [
+    "screen flickering", "battery drains fast", "keyboard keys sticking",
+    "fan is very loud", "overheating under load", "wifi keeps dropping",
+    "trackpad not responding", "dead pixels on display", "charger not working",
+    "blue screen on boot", "hinge is loose", "usb port broken",
+    "no sound from speakers", "webcam not detected", "slow to start",
+]
+
+
+def bench_ticket_search(cmd, rows, repeat, **options):
+    """Ranked /api/tickets/search/ over ``rows`` synthetic tickets."""
+    admin = User.objects.create_user("bench_admin", role="ADMIN")
+    client = client_for(admin)
+    asset = make_assets(1).get()
+
+    rng = random.Random(42)
+    RepairTicket.objects.bulk_create(
+        (
+            RepairTicket(
+                asset=asset,
+                issue=f"{rng.choice(SYMPTOMS)}, {rng.choice(SYMPTOMS)} since "
+                      f"update {rng.randint(1, 5000)}",
+            )
+            for _ in range(rows)
+        ),
+        batch_size=5000,
+    )
+
+    for q in ("flicker", "battery drains", "usb port", "update 4242", "xyzzy"):
+        url = f"/api/tickets/search/?q={q}"
+        ms = timed(lambda: client.get(url), repeat)
+        hits = len(search.ranked(RepairTicket, q, 20))
+        cmd.stdout.write(f"  q={q!r:18} {ms:8.2f} ms  ({hits} shown)")
+
+
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+def full_lists():
+    """Patch the list views back to full serializers over unnarrowed rows."""
+    stack = ExitStack()
+    for viewset in (AssetViewSet, AssignmentViewSet, RepairTicketViewSet):
+        backends = [b for b in viewset.filter_backends if b is not SparseFieldsFilter]
+        stack.enter_context(mock.patch.object(viewset, "summary_serializer_class", None))
+        stack.enter_context(mock.patch.object(viewset, "filter_backends", backends))
+    return stack
+
+
+def bench_serializers(cmd, rows, repeat, page_size, **options):
+    """Rows/sec and bytes/row of list pages: full vs summary vs ?fields=,
+    through serializers and through the FAST_SERIALIZATION path."""
+    admin = User.objects.create_user("bench_admin", role="ADMIN")
+    client = client_for(admin)
+    assets = list(make_assets(rows))
+
+    rng = random.Random(42)
+    RepairTicket.objects.bulk_create(
+        (
+            RepairTicket(
+                asset=asset,
+                reported_by=admin,
+                issue=". ".join(rng.choice(SYMPTOMS) for _ in range(8)),
+            )
+            for asset in assets
+        ),
+        batch_size=5000,
+    )
+    Assignment.objects.bulk_create(
+        (Assignment(asset=asset, employee=admin, status="ACTIVE") for asset in assets),
+        batch_size=5000,
+    )
+
+    def measure(label, url, full=False, fast=False):
+        # Time serialization, not the response cache
+        settings = override_settings(CACHES=NO_CACHE, FAST_SERIALIZATION=fast)
+        with settings, full_lists() if full else ExitStack():
+            size = len(client.get(url).content)
+            ms = timed(lambda: client.get(url), repeat)
+        cmd.stdout.write(
+            f"  {label:10} {page_size / ms * 1000:10.0f} rows/s "
+            f"{size / page_size:8.0f} B/row"
+        )
+
+    full_fields = {
+        "/api/assets/": ",".join(AssetSerializer().fields),
+        "/api/assignments/": ",".join(AssignmentSerializer().fields),
+        "/api/tickets/": ",".join(RepairTicketSerializer().fields),
+    }
+    sparse = {
+        "/api/assets/": "id,status",
+        "/api/assignments/": "id,status",
+        "/api/tickets/": "id,status",
+    }
+    for path, fields in sparse.items():
+        url = f"{path}?page_size={page_size}"
+        cmd.stdout.write(f"{path} (page_size={page_size})")
+        measure("full", url, full=True)
+        measure("summary", url)
+        measure(fields, f"{url}&fields={fields}")
+        measure("full/fast", f"{url}&fields={full_fields[path]}", fast=True)
+        measure("summ/fast", url, fast=True)
+
+
+def peak_kib(fn):
+    """Peak traced Python memory while running ``fn()``, in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_streaming(cmd, rows, **options):
+    """Peak memory of the streamed list views at 10% and 100% of ``rows``."""
+    employee = User.objects.create_user("bench_employee", role="EMPLOYEE")
+    client = client_for(employee)
+    assets = list(make_assets(rows))
+
+    def grow(count):
+        start = RepairTicket.objects.filter(reported_by=employee).count()
+        batch = assets[start:count]
+        RepairTicket.objects.bulk_create(
+            (RepairTicket(asset=a, reported_by=employee, issue="Fan noise") for a in batch),
+            batch_size=5000,
+        )
+        Assignment.objects.bulk_create(
+            (Assignment(asset=a, employee=employee) for a in batch), batch_size=5000
+        )
+        User.objects.bulk_create(
+            (User(username=f"bench_user_{a.id}", role="EMPLOYEE") for a in batch),
+            batch_size=5000,
+        )
+
+    def consume(url):
+        for _ in client.get(url).streaming_content:
+            pass
+
+    urls = {
+        "/api/users/": lambda: list(User.objects.all()),
+        "/api/employee/assignments/": lambda: list(
+            Assignment.objects.filter(employee=employee).select_related("asset")
+        ),
+        "/api/employee/tickets/": lambda: list(
+            RepairTicket.objects.filter(reported_by=employee)
+            .select_related("asset", "technician")
+        ),
+    }
+    for count in (rows // 10, rows):
+        grow(count)
+        cmd.stdout.write(f"{count} rows")
+        for url, materialize in urls.items():
+            streamed = peak_kib(lambda: consume(url))
+            listed = peak_kib(materialize)
+            cmd.stdout.write(
+                f"  {url:28} streamed {streamed:8.0f} KiB   "
+                f"(instances alone: {listed:8.0f} KiB)"
+            )
+
+
+def bench_auth(cmd, repeat, **options):
+    """DB round trips and latency per request: user-row vs claims JWT auth."""
+    users = {
+        role: User.objects.create_user(f"bench_{role.lower()}", role=role)
+        for role in ("ADMIN", "EMPLOYEE", "TECHNICIAN")
+    }
+    asset = make_assets(1).get()
+    make_tickets(20, asset, technician=users["TECHNICIAN"])
+    counters.rebuild()
+
+    urls = [
+        ("EMPLOYEE", "/api/employee/assets/"),
+        ("EMPLOYEE", "/api/employee/dashboard/"),
+        ("TECHNICIAN", "/api/technician/dashboard/"),
+        ("TECHNICIAN", "/api/technician/recent-activity/"),
+        ("ADMIN", "/api/dashboard/"),
+        ("ADMIN", "/api/tickets/?page_size=20"),
+    ]
+    modes = {
+        "user row": mock.patch.object(
+            ClaimsJWTAuthentication, "get_user", JWTAuthentication.get_user
+        ),
+        "claims": ExitStack(),
+    }
+    for role, url in urls:
+        client = token_client_for(users[role])
+        cmd.stdout.write(url)
+        for label, mode in modes.items():
+            with mode:
+                client.get(url)  # warm the status / response caches
+                queries = queries_per_request(lambda: client.get(url))
+                ms = timed(lambda: client.get(url), repeat)
+            cmd.stdout.write(f"  {label:9} {queries:3} queries {ms:8.2f} ms")
+
+    cmd.stdout.write("forbidden (403, claims auth)")
+    body = {"username": "x", "email": "x@example.com", "password": "x", "role": "ADMIN"}
+    for role, method, url in [
+        ("TECHNICIAN", "post", "/api/users/create/"),
+        ("EMPLOYEE", "get", "/api/dashboard/"),
+        ("EMPLOYEE", "get", "/api/tickets/?page_size=20"),
+    ]:
+        client = token_client_for(users[role])
+        call = lambda: getattr(client, method)(url, body if method == "post" else None)
+        call()
+        queries = queries_per_request(call)
+        ms = timed(call, repeat)
+        cmd.stdout.write(f"  {method.upper():4} {url:28} {queries} queries {ms:6.2f} ms")
+
+
+SCENARIOS = {
+    "auth": bench_auth,
+    "pagination": bench_pagination,
+    "serializers": bench_serializers,
+    "streaming": bench_streaming,
+    "technician": bench_technician,
+    "ticket_search": bench_ticket_search,
+}
+
+
+class Command(BaseCommand):
+    help = "Run an in-process benchmark scenario (all data is rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", choices=sorted(SCENARIOS))
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=20)
+
+    def handle(self, *args, **options):
+        scenario = SCENARIOS[options.pop("scenario")]
+
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            with transaction.atomic():
+                scenario(self, **options)
+                transaction.set_rollback(True)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import caching, counters
+
+
+class Command(BaseCommand):
+    help = "Compare DashboardCounter rows against live counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild the counters if any have drifted",
+        )
+
+    def handle(self, *args, **options):
+        drift = counters.check()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Counters are consistent"))
+            return
+
+        for (key, user_id), (stored, live) in sorted(
+            drift.items(), key=lambda item: (item[0][0], item[0][1] or 0)
+        ):
+            scope = f"user {user_id}" if user_id else "global"
+            self.stdout.write(f"{key} [{scope}]: stored={stored} live={live}")
+
+        if options["fix"]:
+            counters.rebuild()
+            caching.invalidate(*caching.COUNTED)
+            self.stdout.write(self.style.SUCCESS("Counters rebuilt"))
+        else:
+            raise CommandError(f"{len(drift)} counters have drifted")
@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
+
+from core import counters, search, views
+from core.models import Asset, Assignment, RepairTicket, ActivityLog, DashboardCounter
+
+User = get_user_model()
+
+PAGE = 50 + 1  # cursor pages read one row past the page size
+
+
+def _counter_rows(names, user=None):
+    # counters.read()
+    return DashboardCounter.objects.filter(key__in=names, user=user)
+
+
+# (endpoint, label, queryset factory) -- the queries core/views.py runs;
+# ``text`` is the --search term
+QUERIES = [
+    ("/api/dashboard/", "counters",
+     lambda user, text: _counter_rows(counters._dashboard_keys())),
+    ("/api/recent-activity/", "latest tickets",
+     lambda user, text: RepairTicket.objects.select_related("asset").order_by("-id")[:5]),
+    ("/api/assets/", "page",
+     lambda user, text: Asset.objects.order_by("-id")[:PAGE]),
+    ("/api/assets/?status=AVAILABLE", "page by status",
+     lambda user, text: Asset.objects.filter(status__in=["AVAILABLE"]).order_by("-id")[:PAGE]),
+    ("/api/assets/?search=", "full-text filter",
+     lambda user, text: Asset.objects.filter(search.matches(Asset, text)).order_by("-id")[:PAGE]),
+    ("/api/tickets/", "page",
+     lambda user, text: RepairTicket.objects.order_by("-opened_on", "-id")[:PAGE]),
+    ("/api/tickets/?search=", "full-text filter",
+     lambda user, text: RepairTicket.objects.filter(
+         search.matches(RepairTicket, text)).order_by("-opened_on", "-id")[:PAGE]),
+    ("/api/employee/dashboard/", "counters",
+     lambda user, text: _counter_rows(views.EMPLOYEE_COUNTERS, user)),
+    ("/api/employee/dashboard/", "active assignments",
+     lambda user, text: views._active_assignments(user.id)),
+    ("/api/employee/assignments/", "assignments",
+     lambda user, text: Assignment.objects.filter(employee_id=user.id).order_by("-id")
+     .values("id", asset_name=F("asset__name"))),
+    ("/api/employee/tickets/", "reported tickets",
+     lambda user, text: RepairTicket.objects.filter(reported_by_id=user.id).order_by("-id")
+     .values("id", asset_name=F("asset__name"), technician_name=F("technician__username"))),
+    ("/api/technician/dashboard/", "counters",
+     lambda user, text: _counter_rows(views.TECHNICIAN_COUNTERS, user)),
+    ("/api/technician/dashboard/", "ticket page",
+     lambda user, text: views._technician_tickets(user.id)
+     .order_by("-opened_on", "-id")[:PAGE]),
+    ("/api/technician/recent-activity/", "activity",
+     lambda user, text: ActivityLog.objects.filter(user_id=user.id)[:10]),
+]
+
+
+class Command(BaseCommand):
+    help = "Print EXPLAIN plans for the queries each endpoint runs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Username to plan per-user queries for (default: first user)",
+        )
+        parser.add_argument(
+            "--search", default="screen",
+            help="Term for the search plans; use a common one (default: screen)",
+        )
+
+    def handle(self, *args, **options):
+        if options["user"]:
+            user = User.objects.get(username=options["user"])
+        else:
+            # Plans only depend on the parameter type, any id will do
+            user = User.objects.order_by("id").first() or User(id=0)
+        text = options["search"]
+
+        self.stdout.write(f"Database: {connection.vendor}\n")
+
+        for endpoint, label, build in QUERIES:
+            if endpoint.endswith("="):
+                endpoint += text
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{endpoint} -- {label}"))
+            self.stdout.write(build(user, text).explain())
+            self.stdout.write("")
+
+        # search.ranked() is raw SQL, so EXPLAIN it by hand
+        query = search.ranked_sql(RepairTicket, text, 20)
+        if query is None:
+            return
+        sql, params = query
+        prefix = "EXPLAIN ANALYZE" if connection.vendor == "postgresql" else "EXPLAIN QUERY PLAN"
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"/api/tickets/search/?q={text} -- ranked search"))
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            for row in cursor.fetchall():
+                self.stdout.write(" ".join(str(col) for col in row))
+        self.stdout.write("")
@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from core import bulk
+
+
+class Command(BaseCommand):
+    help = "Stream every asset to a CSV or JSON Lines file (or stdout)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Defaults to stdout")
+        parser.add_argument("--format", choices=bulk.FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=bulk.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or bulk.guess_format(path or "")
+
+        out = open(path, "w", encoding="utf-8", newline="") if path else sys.stdout
+        try:
+            for chunk in bulk.export_assets(
+                file_format, chunk_size=options["chunk_size"]
+            ):
+                out.write(chunk)
+        finally:
+            if path:
+                out.close()
@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import bulk
+
+
+class Command(BaseCommand):
+    help = "Bulk-create assets from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=bulk.FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=bulk.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or bulk.guess_format(path)
+
+        try:
+            stream = open(path, encoding="utf-8-sig", newline="")
+        except OSError as exc:
+            raise CommandError(exc)
+
+        with stream:
+            report = bulk.import_assets(
+                bulk.read_rows(stream, file_format), options["chunk_size"]
+            )
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']} assets, {len(report['errors'])} rows rejected"
+        ))
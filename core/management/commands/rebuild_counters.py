@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core import caching, counters
+
+
+class Command(BaseCommand):
+    help = "Recompute every DashboardCounter from the base tables"
+
+    def handle(self, *args, **options):
+        total = counters.rebuild()
+        caching.invalidate(*caching.COUNTED)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} counters"))
@@ -0,0 +1,38 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued Job rows (JOBS_BACKEND=core.jobs.DatabaseQueue)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=20)
+        parser.add_argument("--sleep", type=float, default=1.0,
+                            help="Seconds to wait when no job is due")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no job is due")
+        parser.add_argument("--keep-days", type=float,
+                            default=jobs.KEEP_DONE.days,
+                            help="Delete DONE jobs older than this (their keys expire)")
+
+    def handle(self, *args, **options):
+        keep = timedelta(days=options["keep_days"])
+        total = pruned = 0
+        next_prune = 0
+        while True:
+            if time.monotonic() >= next_prune:
+                next_prune = time.monotonic() + jobs.PRUNE_EVERY
+                pruned += jobs.prune(keep)
+
+            claimed = jobs.run_pending(options["batch"])
+            total += claimed
+            if not claimed:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {total} jobs, pruned {pruned}"))
@@ -0,0 +1,303 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from core import caching, counters
+from core.models import ActivityLog, Asset, Assignment, InventoryItem, RepairTicket
+
+User = get_user_model()
+
+
+# =======================
+# DISTRIBUTIONS
+# =======================
+# Everything is drawn from one random.Random(seed) and dated back from
+# a fixed END, so a seed always produces the same rows. Per asset, on
+# average: 1.2 returned assignments, 0.3 closed tickets, and an activity
+# row for each ticket a technician started or closed. About 3.7 rows
+# per asset in all.
+
+END = datetime(2025, 6, 30, 17, 0)
+HISTORY = timedelta(days=5 * 365)
+PREFIX = "FLEET"
+
+ROLES = {"EMPLOYEE": 0.90, "TECHNICIAN": 0.08, "ADMIN": 0.02}
+ASSET_TYPES = {"LAPTOP": 0.40, "MONITOR": 0.25, "KEYBOARD": 0.175, "MOUSE": 0.175}
+ASSET_STATUSES = {"ASSIGNED": 0.60, "AVAILABLE": 0.32, "UNDER_REPAIR": 0.08}
+PAST_ASSIGNMENTS = {0: 0.30, 1: 0.35, 2: 0.20, 3: 0.15}
+PAST_TICKETS = {0: 0.75, 1: 0.20, 2: 0.05}
+CURRENT_TICKET = {"OPEN": 0.40, "IN_PROGRESS": 0.60}
+LOW_STOCK = 0.12
+
+MODELS = {
+    "LAPTOP": ["ThinkPad T14", "Latitude 5440", "MacBook Air", "EliteBook 840"],
+    "MONITOR": ["Dell P2422H", "LG 27UL500", "HP E24 G5"],
+    "KEYBOARD": ["Logitech K120", "Keychron K2", "Microsoft Wired 600"],
+    "MOUSE": ["Logitech M185", "MX Master 3", "Microsoft Basic Optical"],
+}
+ISSUES = [
+    "screen flickering", "battery drains fast", "keys sticking",
+    "fan is very loud", "overheating under load", "wifi keeps dropping",
+    "trackpad not responding", "dead pixels", "charger not working",
+    "blue screen on boot", "loose hinge", "usb port broken",
+    "no sound", "cable frayed", "scroll wheel skips", "flickers when moved",
+]
+INVENTORY = ["HDMI cable", "USB-C charger", "Laptop bag", "Docking station",
+             "Mouse pad", "Webcam", "Headset", "Ethernet cable"]
+
+
+class Picker:
+    """Weighted choices from ``{value: weight}``, a batch at a time."""
+
+    def __init__(self, rng, weights):
+        self.rng = rng
+        self.values = list(weights)
+        self.cum_weights = []
+        total = 0
+        for weight in weights.values():
+            total += weight
+            self.cum_weights.append(total)
+
+    def __call__(self, k):
+        return self.rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the dates we set on auto_now(_add) fields.
+
+    Also saves a now() call per row and field.
+    """
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    try:
+        for field, _auto_now, _auto_now_add in fields:
+            field.auto_now = field.auto_now_add = False
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+# =======================
+# GENERATOR
+# =======================
+
+class Fleet:
+    def __init__(self, seed, batch_size):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.created = {}
+        self.end = END.replace(tzinfo=timezone.utc) if settings.USE_TZ else END
+        self.now = now()  # updated_at of every row
+
+    def save(self, model, rows):
+        model.objects.bulk_create(rows, batch_size=self.batch_size)
+        if rows and rows[0].pk is None:
+            # The generated history points at these rows by pk
+            raise CommandError(
+                "This database doesn't return primary keys from bulk_create; "
+                "seed on PostgreSQL or SQLite 3.35+."
+            )
+        name = str(model._meta.verbose_name_plural)
+        self.created[name] = self.created.get(name, 0) + len(rows)
+        return rows
+
+    def moment(self, after, before=None):
+        before = before or self.end
+        return after + (before - after) * self.rng.random()
+
+    def users(self, count, password):
+        password = make_password(password)  # hashed once, shared by all
+        roles = Picker(self.rng, ROLES)(count)
+        users = self.save(User, [
+            User(
+                username=f"{PREFIX.lower()}_{role.lower()}_{i:06d}",
+                email=f"{role.lower()}{i}@fleet.example.com",
+                role=role,
+                password=password,
+                is_staff=role == "ADMIN",
+            )
+            for i, role in enumerate(roles)
+        ])
+        by_role = {role: [] for role in ROLES}
+        for user in users:
+            by_role[user.role].append(user.id)
+        if not by_role["EMPLOYEE"] or not by_role["TECHNICIAN"]:
+            raise CommandError("Need at least one employee and one technician; raise --users.")
+        return by_role
+
+    def inventory(self, count):
+        rng = self.rng
+        self.save(InventoryItem, [
+            InventoryItem(
+                item_type=f"{rng.choice(INVENTORY)} #{i}",
+                threshold=(threshold := rng.randint(5, 30)),
+                quantity=(
+                    rng.randint(0, threshold) if rng.random() < LOW_STOCK
+                    else rng.randint(threshold + 1, threshold * 10)
+                ),
+                updated_at=self.now,
+            )
+            for i in range(count)
+        ])
+
+    def assets(self, start, count, users):
+        rng = self.rng
+        employees, technicians = users["EMPLOYEE"], users["TECHNICIAN"]
+        statuses = Picker(rng, ASSET_STATUSES)(count)
+        types = Picker(rng, ASSET_TYPES)(count)
+        past_assignments = Picker(rng, PAST_ASSIGNMENTS)(count)
+        past_tickets = Picker(rng, PAST_TICKETS)(count)
+        current_tickets = Picker(rng, CURRENT_TICKET)(count)
+
+        purchased = [self.end - HISTORY * rng.random() for _ in range(count)]
+        assets = self.save(Asset, [
+            Asset(
+                name=f"{rng.choice(MODELS[type])} {start + i:07d}",
+                type=type,
+                serial_number=f"{PREFIX}-{start + i:08d}",
+                status=status,
+                purchase_date=purchased[i].date(),
+                updated_at=self.now,
+            )
+            for i, (type, status) in enumerate(zip(types, statuses))
+        ])
+
+        assignments, tickets, activity = [], [], []
+        stamp = self.now
+        for i, asset in enumerate(assets):
+            asset_id = asset.id
+            # Returned assignments, oldest first, then the current one
+            points = sorted(
+                self.moment(purchased[i]) for _ in range(2 * past_assignments[i])
+            )
+            for assigned, returned in zip(points[::2], points[1::2]):
+                assignments.append(Assignment(
+                    asset_id=asset_id, employee_id=rng.choice(employees), status="RETURNED",
+                    date_assigned=assigned, date_returned=returned, updated_at=stamp,
+                ))
+            if asset.status == "ASSIGNED":
+                assignments.append(Assignment(
+                    asset_id=asset_id, employee_id=rng.choice(employees), status="ACTIVE",
+                    date_assigned=self.moment(points[-1] if points else purchased[i]),
+                    updated_at=stamp,
+                ))
+
+            for _ in range(past_tickets[i]):
+                opened = self.moment(purchased[i], self.end - timedelta(days=14))
+                started = opened + timedelta(hours=rng.uniform(1, 72))
+                resolved = started + timedelta(hours=rng.uniform(2, 240))
+                technician = rng.choice(technicians)
+                tickets.append(RepairTicket(
+                    asset_id=asset_id, reported_by_id=rng.choice(employees),
+                    technician_id=technician, status="CLOSED",
+                    issue=f"{rng.choice(ISSUES)}, {rng.choice(ISSUES)}",
+                    opened_on=opened, assigned_on=started, resolved_on=resolved,
+                    updated_at=stamp,
+                ))
+                activity += self.activity(asset, technician, started, resolved)
+            if asset.status == "UNDER_REPAIR":
+                status = current_tickets[i]
+                opened = self.end - timedelta(days=30) * rng.random()
+                technician = (
+                    rng.choice(technicians)
+                    if status == "IN_PROGRESS" or rng.random() < 0.5 else None
+                )
+                started = self.moment(opened) if status == "IN_PROGRESS" else None
+                tickets.append(RepairTicket(
+                    asset_id=asset_id, reported_by_id=rng.choice(employees),
+                    technician_id=technician, status=status,
+                    issue=f"{rng.choice(ISSUES)}, {rng.choice(ISSUES)}",
+                    opened_on=opened, assigned_on=started, updated_at=stamp,
+                ))
+                activity += self.activity(asset, technician, started)
+
+        self.save(Assignment, assignments)
+        self.save(RepairTicket, tickets)
+        self.save(ActivityLog, activity)
+
+    def activity(self, asset, technician, started, resolved=None):
+        """What core.jobs.ticket_activity writes for each status change."""
+        return [
+            ActivityLog(
+                user_id=technician, created_at=when,
+                message=f"Ticket for {asset.name} marked {status}",
+            )
+            for status, when in (("IN_PROGRESS", started), ("CLOSED", resolved))
+            if when and technician
+        ]
+
+
+# =======================
+# COMMAND
+# =======================
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert a deterministic synthetic fleet (users, assets, "
+        "assignments, tickets, activity) for scale testing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=300_000,
+                            help="About 3.7 rows are created per asset")
+        parser.add_argument("--users", type=int, default=5_000)
+        parser.add_argument("--inventory", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--password", default="fleet-password",
+                            help="Password of every generated user")
+
+    def handle(self, *args, **options):
+        if (
+            Asset.objects.filter(serial_number__startswith=f"{PREFIX}-").exists()
+            or User.objects.filter(username__startswith=f"{PREFIX.lower()}_").exists()
+        ):
+            raise CommandError("Fleet data is already present; run `manage.py flush` first.")
+
+        fleet = Fleet(options["seed"], options["batch_size"])
+        chunk = options["batch_size"]
+        start = time.perf_counter()
+
+        timestamps = explicit_timestamps(
+            Asset, InventoryItem, Assignment, RepairTicket, ActivityLog
+        )
+        with transaction.atomic(), timestamps:
+            users = fleet.users(options["users"], options["password"])
+            fleet.inventory(options["inventory"])
+
+            # One chunk of assets and their history at a time keeps
+            # memory flat however many rows are asked for
+            for offset in range(0, options["assets"], chunk):
+                count = min(chunk, options["assets"] - offset)
+                fleet.assets(offset, count, users)
+                self.stdout.write(
+                    f"\r{offset + count:>10,} / {options['assets']:,} assets", ending=""
+                )
+                self.stdout.flush()
+
+            self.stdout.write("\nRebuilding dashboard counters")
+            counters.rebuild()
+            # bulk_create sends no signals
+            caching.invalidate(*{ns for nss in caching.INVALIDATES.values() for ns in nss})
+
+        elapsed = time.perf_counter() - start
+        total = sum(fleet.created.values())
+        for name, count in fleet.created.items():
+            self.stdout.write(f"  {name:16} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)"
+        ))
@@ -0,0 +1,164 @@
+import http.client
+import statistics
+import threading
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks.server import MODES, bench_host, serve
+from core import counters
+from core.models import Asset, Assignment, RepairTicket
+
+User = get_user_model()
+
+
+# =======================
+# WSGI vs ASGI UNDER POLLING
+# =======================
+# Unlike ``benchmark``, this serves the app from real gunicorn workers
+# (sync, then uvicorn with ASYNC_VIEWS=1), so its data has to be
+# committed; everything it creates is prefixed SERVE and deleted again.
+# Pollers are threads with keep-alive connections cycling through the
+# dashboard endpoints as fast as the server answers.
+
+ENDPOINTS = [
+    ("ADMIN", "/api/dashboard/"),
+    ("ADMIN", "/api/recent-activity/"),
+    ("EMPLOYEE", "/api/employee/dashboard/"),
+    ("TECHNICIAN", "/api/technician/dashboard/"),
+]
+
+def seed(rows):
+    users = {}
+    for role in ("ADMIN", "EMPLOYEE", "TECHNICIAN"):
+        user, _ = User.objects.get_or_create(
+            username=f"serve_{role.lower()}", defaults={"role": role}
+        )
+        refresh = RefreshToken.for_user(user)
+        refresh["role"] = role
+        refresh["username"] = user.username
+        users[role] = str(refresh.access_token)
+
+    assets = Asset.objects.bulk_create(
+        Asset(
+            name=f"Laptop {i}",
+            type="LAPTOP",
+            serial_number=f"SERVE-{i:08d}",
+            status="ASSIGNED",
+            purchase_date=date(2024, 1, 1),
+        )
+        for i in range(rows)
+    )
+    employee = User.objects.get(username="serve_employee")
+    technician = User.objects.get(username="serve_technician")
+    Assignment.objects.bulk_create(
+        Assignment(asset=a, employee=employee, status="ACTIVE") for a in assets[:20]
+    )
+    RepairTicket.objects.bulk_create(
+        RepairTicket(asset=a, issue=f"Issue {i}", technician=technician,
+                     reported_by=employee)
+        for i, a in enumerate(assets)
+    )
+    counters.rebuild()
+    return users
+
+
+def cleanup():
+    RepairTicket.objects.filter(asset__serial_number__startswith="SERVE-").delete()
+    Assignment.objects.filter(asset__serial_number__startswith="SERVE-").delete()
+    Asset.objects.filter(serial_number__startswith="SERVE-").delete()
+    User.objects.filter(username__startswith="serve_").delete()
+    counters.rebuild()
+
+
+def poll(port, host, tokens, deadline, latencies, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    i = 0
+    while time.monotonic() < deadline:
+        role, url = ENDPOINTS[i % len(ENDPOINTS)]
+        i += 1
+        headers = {"Host": host, "Authorization": f"Bearer {tokens[role]}"}
+        start = time.perf_counter()
+        try:
+            conn.request("GET", url, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(url)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        if response.status != 200:
+            errors.append(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+    conn.close()
+
+
+def run(mode, port, host, tokens, options):
+    env = {"RESPONSE_CACHE_TIMEOUT": "0"} if options["no_cache"] else {}
+
+    with serve(mode, port, options["workers"], **env):
+        latencies, errors = [], []
+        deadline = time.monotonic() + options["duration"]
+        pollers = [
+            threading.Thread(
+                target=poll, args=(port, host, tokens, deadline, latencies, errors)
+            )
+            for _ in range(options["pollers"])
+        ]
+        for t in pollers:
+            t.start()
+        for t in pollers:
+            t.join()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / options["duration"],
+        "p50": statistics.median(latencies) if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99)] if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+class Command(BaseCommand):
+    help = "Requests/sec and p99 of the dashboard endpoints: gunicorn sync vs uvicorn"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["wsgi", "asgi"])
+        parser.add_argument("--rows", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--pollers", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--no-cache", action="store_true",
+            help="Disable the response cache, so every request reaches the DB",
+        )
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith="serve_").exists():
+            raise CommandError("serve_* users exist; a previous run didn't clean up")
+
+        host = bench_host()
+        tokens = seed(options["rows"])
+        try:
+            self.stdout.write(
+                f"{options['pollers']} pollers, {options['workers']} workers, "
+                f"{options['duration']:.0f}s per mode"
+            )
+            for mode in options["modes"]:
+                try:
+                    r = run(mode, options["port"], host, tokens, options)
+                except RuntimeError as e:  # the server didn't start
+                    raise CommandError(str(e))
+                self.stdout.write(
+                    f"  {mode}: {r['rps']:8.1f} req/s  p50 {r['p50']:7.2f} ms  "
+                    f"p99 {r['p99']:7.2f} ms  ({r['requests']} requests, "
+                    f"{r['errors']} errors)"
+                )
+        finally:
+            cleanup()
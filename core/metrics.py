@@ -0,0 +1,279 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import caching, counters
+
+logger = logging.getLogger(__name__)
+
+
+# =======================
+# PROMETHEUS METRICS
+# =======================
+# Served as text at /metrics (views.metrics_view). Each process keeps its
+# own counters and latency histograms, fed by ServerTimingMiddleware once
+# a core request finishes; observe() only takes a lock and bumps a few
+# numbers.
+#
+# Gunicorn runs several processes and a scrape reaches just one of them,
+# so with settings.METRICS_DIR set every process writes its numbers to
+# <METRICS_DIR>/<pid>.json every METRICS_FLUSH_SECONDS, and a scrape adds up all
+# the files. Files of exited workers are kept, so totals never go down;
+# empty the directory when deploying.
+#
+# The domain gauges come from the materialized counters (one query) and
+# are refreshed every METRICS_SAMPLE_SECONDS by a thread that starts on
+# the process's first scrape. A scrape only reports the newest sample.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HELP = {
+    "core_http_requests_total": ("counter", "Requests to core views."),
+    "core_http_request_duration_seconds": ("histogram", "Core view latency."),
+    "core_db_queries_total": ("counter", "SQL queries run by core views."),
+    "core_db_query_seconds_total": ("counter", "Time spent in SQL by core views."),
+    "core_response_cache_requests_total": ("counter", "Response cache lookups."),
+    "core_response_cache_hit_ratio": ("gauge", "Response cache hits / lookups."),
+    "core_tickets": ("gauge", "Repair tickets by status."),
+    "core_assets": ("gauge", "Assets by status."),
+    "core_inventory_low_stock": ("gauge", "Inventory items at or below threshold."),
+    "core_active_assignments": ("gauge", "Assignments not yet returned."),
+}
+
+_lock = threading.Lock()
+_counters = defaultdict(Counter)    # metric -> {labels: value}
+_histograms = {}                    # labels -> [count per bucket..., +Inf, sum]
+_gauges = {}                        # metric -> {labels: value}
+_sampled_at = 0.0
+_thread = None
+_sampling = False
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+    return ",".join(f'{k}="{escape(v)}"' for k, v in labels.items())
+
+
+def observe(view, method, status, timing):
+    """Record one finished request (a core.timing.RequestTiming)."""
+    seconds = timing.total
+    labels = _labels(view=view)
+    with _lock:
+        _counters["core_http_requests_total"][
+            _labels(view=view, method=method, status=status)
+        ] += 1
+        _counters["core_db_queries_total"][labels] += timing.queries
+        _counters["core_db_query_seconds_total"][labels] += timing.sql
+
+        histogram = _histograms.get(labels)
+        if histogram is None:
+            histogram = _histograms[labels] = [0] * (len(BUCKETS) + 1) + [0.0]
+        histogram[bisect_left(BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+    if settings.METRICS_DIR and _thread is None:
+        _start()
+
+
+# =======================
+# DOMAIN GAUGES
+# =======================
+
+def sample():
+    """Refresh the domain gauges from the dashboard counters."""
+    global _sampled_at
+
+    stats = counters.dashboard_stats()
+    gauges = {
+        "core_tickets": {
+            _labels(status=s): n for s, n in stats["tickets_status"].items()
+        },
+        "core_assets": {
+            _labels(status=s): n for s, n in stats["assets_status"].items()
+        },
+        "core_inventory_low_stock": {"": stats["low_stock"]},
+        "core_active_assignments": {"": stats["assigned_assets"]},
+    }
+    with _lock:
+        _gauges.clear()
+        _gauges.update(gauges)
+        _sampled_at = time.time()
+
+
+def start_sampler():
+    """Start sampling the gauges in this process (no-op if already on)."""
+    global _sampling
+    if settings.METRICS_SAMPLE_SECONDS <= 0 or _sampling:
+        return
+    _sampling = True
+    _start()
+
+
+def _start():
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_loop, daemon=True)
+            _thread.start()
+
+
+def _loop():
+    while True:
+        if _sampling and time.time() - _sampled_at >= settings.METRICS_SAMPLE_SECONDS:
+            close_old_connections()
+            try:
+                sample()
+            except Exception:
+                logger.exception("Metrics sample failed")
+        if settings.METRICS_DIR:
+            try:
+                flush()
+            except OSError:
+                logger.exception("Could not write metrics to %s", settings.METRICS_DIR)
+        time.sleep(settings.METRICS_FLUSH_SECONDS)
+
+
+# =======================
+# SNAPSHOTS
+# =======================
+
+def snapshot():
+    """This process's numbers, in the form written to METRICS_DIR."""
+    with _lock:
+        data = {
+            "counters": {name: dict(values) for name, values in _counters.items()},
+            "histograms": {labels: list(h) for labels, h in _histograms.items()},
+            "gauges": {name: dict(values) for name, values in _gauges.items()},
+            "sampled_at": _sampled_at,
+        }
+
+    cache_lookups = {}
+    for endpoint, outcomes in caching.metrics().items():
+        cache_lookups[_labels(endpoint=endpoint, result="hit")] = outcomes["hits"]
+        cache_lookups[_labels(endpoint=endpoint, result="miss")] = outcomes["misses"]
+    data["counters"]["core_response_cache_requests_total"] = cache_lookups
+    return data
+
+
+def _path(pid):
+    return os.path.join(settings.METRICS_DIR, f"{pid}.json")
+
+
+def flush():
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    path = _path(os.getpid())
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(snapshot(), f)
+    os.replace(f"{path}.tmp", path)  # readers never see half a file
+
+
+def collect():
+    """Every process's snapshot: this one live, the others from disk."""
+    snapshots = [snapshot()]
+    if not settings.METRICS_DIR:
+        return snapshots
+
+    own = _path(os.getpid())
+    try:
+        names = os.listdir(settings.METRICS_DIR)
+    except FileNotFoundError:
+        return snapshots
+
+    for name in names:
+        path = os.path.join(settings.METRICS_DIR, name)
+        if not name.endswith(".json") or path == own:
+            continue
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # replaced or removed while listing
+    return snapshots
+
+
+def merge(snapshots):
+    """Sum counters and histograms; take gauges from the newest sample."""
+    total = {"counters": defaultdict(Counter), "histograms": {}, "gauges": {}}
+
+    for data in snapshots:
+        for name, values in data["counters"].items():
+            total["counters"][name].update(values)
+        for labels, histogram in data["histograms"].items():
+            merged = total["histograms"].get(labels)
+            if merged is None:
+                total["histograms"][labels] = list(histogram)
+            else:
+                for i, value in enumerate(histogram):
+                    merged[i] += value
+
+    newest = max(snapshots, key=lambda data: data["sampled_at"])
+    total["gauges"] = newest["gauges"]
+    return total
+
+
+# =======================
+# EXPOSITION
+# =======================
+
+def _series(name, labels, value):
+    return f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+def render(total):
+    lines = []
+
+    def header(name):
+        kind, text = HELP[name]
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for name, values in sorted(total["counters"].items()):
+        if not values:
+            continue
+        header(name)
+        for labels, value in sorted(values.items()):
+            lines.append(_series(name, labels, value))
+
+    cache_lookups = total["counters"].get("core_response_cache_requests_total", {})
+    endpoints = defaultdict(lambda: [0, 0])
+    for labels, value in cache_lookups.items():
+        endpoint, result = labels.rsplit(",", 1)
+        endpoints[endpoint][result == 'result="hit"'] += value
+    if endpoints:
+        header("core_response_cache_hit_ratio")
+        for endpoint, (misses, hits) in sorted(endpoints.items()):
+            lines.append(_series(
+                "core_response_cache_hit_ratio", endpoint, hits / ((hits + misses) or 1)
+            ))
+
+    name = "core_http_request_duration_seconds"
+    if total["histograms"]:
+        header(name)
+    for labels, histogram in sorted(total["histograms"].items()):
+        cumulative = 0
+        for le, count in zip((*BUCKETS, "+Inf"), histogram):
+            cumulative += count
+            lines.append(_series(f"{name}_bucket", f'{labels},le="{le}"', cumulative))
+        lines.append(_series(f"{name}_sum", labels, histogram[-1]))
+        lines.append(_series(f"{name}_count", labels, cumulative))
+
+    for name, values in sorted(total["gauges"].items()):
+        header(name)
+        for labels, value in sorted(values.items()):
+            lines.append(_series(name, labels, value))
+
+    return "\n".join(lines) + "\n"
+
+
+def exposition():
+    return render(merge(collect()))
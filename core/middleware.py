@@ -0,0 +1,216 @@
+import logging
+import re
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics, timing as timing_
+
+
+# =======================
+# ASYNC-CAPABLE MIDDLEWARE
+# =======================
+# Under ASGI, one sync-only middleware makes Django run everything below
+# it through async_to_sync on the shared sync thread, so each worker
+# serves one request at a time and async views gain nothing.
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """``WhiteNoiseMiddleware`` that stays async under ASGI.
+
+    Only the static file lookup and response run in a thread; every other
+    request is passed straight on to the (async) handler.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+# =======================
+# N+1 DETECTION
+# =======================
+# Dev/test aid, enabled with QUERY_INSPECTION=1. Tallies each request's
+# queries by SQL shape (the statement with parameter placeholders, IN
+# lists collapsed) and logs a warning when one shape runs
+# N_PLUS_ONE_THRESHOLD times or more, which is what reading a lazy
+# relation inside a loop looks like. Responses get X-Query-Count.
+# Sync only: under ASGI it costs each request a thread hop.
+
+N_PLUS_ONE_THRESHOLD = getattr(settings, "N_PLUS_ONE_THRESHOLD", 5)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+logger = logging.getLogger("core.queries")
+
+
+def sql_shape(sql):
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryInspector:
+    """``connection.execute_wrapper`` that counts queries by shape."""
+
+    def __init__(self):
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.shapes[sql_shape(sql)] += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return sum(self.shapes.values())
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """``[(shape, times)]`` for shapes run at least ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        inspector = QueryInspector()
+        with connection.execute_wrapper(inspector):
+            response = self.get_response(request)
+
+        if response.streaming:
+            # The body's queries run while it is sent; under ASGI in
+            # another thread, on a connection this wrapper doesn't see
+            if not response.is_async:
+                response.streaming_content = self._stream(
+                    response.streaming_content, inspector, request
+                )
+        else:
+            response["X-Query-Count"] = str(inspector.count)
+            self.report(request, inspector)
+        return response
+
+    def _stream(self, content, inspector, request):
+        with connection.execute_wrapper(inspector):
+            yield from content
+        self.report(request, inspector)
+
+    def report(self, request, inspector):
+        for shape, times in inspector.repeated():
+            logger.warning(
+                "Possible N+1 on %s %s: %d x %s",
+                request.method, request.path, times, shape,
+            )
+
+
+# =======================
+# SERVER TIMING
+# =======================
+
+class ServerTimingMiddleware:
+    """Server-Timing header, sampled timing log and metrics for core views.
+
+    See core.timing and core.metrics. Goes near the top of MIDDLEWARE so
+    "app" covers the rest of the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timing, token = timing_.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing_.end(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing, token = timing_.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing_.end(token)
+        return self.finish(request, response, timing)
+
+    def finish(self, request, response, timing):
+        match = request.resolver_match
+        if match is None or not getattr(match.func, "__module__", "").startswith("core."):
+            return response
+
+        if response.streaming:
+            response["Server-Timing"] = timing.header()
+            if not response.is_async:
+                response.streaming_content = self._stream(
+                    response.streaming_content, request, response, timing
+                )
+            elif response["Content-Type"] != "text/event-stream":  # never finish
+                response.streaming_content = self._astream(
+                    response.streaming_content, request, response, timing
+                )
+            return response
+
+        timing.stop()
+        timing.size = len(response.content)
+        response["Server-Timing"] = timing.header()
+        self.record(request, response, timing)
+        return response
+
+    def _stream(self, content, request, response, timing):
+        content = iter(content)
+        while True:
+            # Each chunk may be pulled in a different context (ASGI)
+            with timing_.resumed(timing):
+                chunk = next(content, None)
+            if chunk is None:
+                break
+            timing.size += len(chunk)
+            yield chunk
+
+        timing.stop()
+        self.record(request, response, timing)
+
+    async def _astream(self, content, request, response, timing):
+        content = aiter(content)
+        while True:
+            with timing_.resumed(timing):
+                chunk = await anext(content, None)
+            if chunk is None:
+                break
+            timing.size += len(chunk)
+            yield chunk
+
+        timing.stop()
+        self.record(request, response, timing)
+
+    def record(self, request, response, timing):
+        timing.log(request, response.status_code)
+        metrics.observe(
+            request.resolver_match.view_name, request.method, response.status_code, timing
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-18 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_activitylog'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='repairticket',
+            index=models.Index(fields=['opened_on', 'id'], name='ticket_opened_id_idx'),
+        ),
+    ]
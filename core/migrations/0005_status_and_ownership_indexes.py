@@ -0,0 +1,41 @@
+# Generated by Django 4.2.25 on 2026-10-18 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_repairticket_opened_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['user', 'created_at'], name='activity_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['status'], name='asset_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['employee', 'status'], name='assignment_employee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['asset'], name='assignment_active_asset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repairticket',
+            index=models.Index(fields=['reported_by', 'status'], name='ticket_reporter_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repairticket',
+            index=models.Index(fields=['technician', 'status', 'opened_on'], name='ticket_tech_status_opened_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repairticket',
+            index=models.Index(condition=models.Q(('status', 'CLOSED'), _negated=True), fields=['status'], name='ticket_not_closed_idx'),
+        ),
+    ]
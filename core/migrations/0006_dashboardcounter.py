@@ -0,0 +1,79 @@
+# Generated by Django 4.2.25 on 2026-10-18 07:26
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+import django.db.models.deletion
+
+
+def build_counters(apps, schema_editor):
+    """Fill the counters from the base tables (see core.counters.live_counts)."""
+    Asset = apps.get_model("core", "Asset")
+    InventoryItem = apps.get_model("core", "InventoryItem")
+    Assignment = apps.get_model("core", "Assignment")
+    RepairTicket = apps.get_model("core", "RepairTicket")
+    DashboardCounter = apps.get_model("core", "DashboardCounter")
+
+    counts = Counter()
+    counts[("assets.total", None)] = Asset.objects.count()
+    for row in Asset.objects.values("status").annotate(n=Count("id")):
+        counts[(f"assets.{row['status']}", None)] = row["n"]
+
+    inventory = InventoryItem.objects.aggregate(
+        total=Count("id"),
+        low_stock=Count("id", filter=Q(quantity__lte=F("threshold"))),
+    )
+    counts[("inventory.total", None)] = inventory["total"]
+    counts[("inventory.low_stock", None)] = inventory["low_stock"]
+
+    counts[("assignments.assigned", None)] = Assignment.objects.filter(
+        date_returned__isnull=True
+    ).count()
+    for row in Assignment.objects.values("employee", "status").annotate(n=Count("id")):
+        counts[(f"assignments.{row['status']}", row["employee"])] = row["n"]
+
+    for row in RepairTicket.objects.values("status").annotate(n=Count("id")):
+        counts[(f"tickets.{row['status']}", None)] = row["n"]
+    for prefix, field in (("reported", "reported_by"), ("assigned", "technician")):
+        rows = RepairTicket.objects.filter(**{f"{field}__isnull": False})
+        for row in rows.values(field, "status").annotate(n=Count("id")):
+            counts[(f"{prefix}.{row['status']}", row[field])] = row["n"]
+
+    DashboardCounter.objects.bulk_create(
+        [
+            DashboardCounter(key=key, user_id=user_id, value=value)
+            for (key, user_id), value in counts.items()
+            if value
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_status_and_ownership_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='counters', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardcounter',
+            constraint=models.UniqueConstraint(fields=('key', 'user'), name='counter_key_user_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardcounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('key',), name='counter_global_key_uniq'),
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-18 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_dashboardcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='repairticket',
+            index=models.Index(fields=['technician', 'opened_on', 'id'], name='ticket_tech_opened_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.25 on 2026-10-18 07:33
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def return_duplicate_assignments(apps, schema_editor):
+    """Keep only the newest ACTIVE assignment of each asset."""
+    Assignment = apps.get_model("core", "Assignment")
+
+    doubled = (
+        Assignment.objects.filter(status="ACTIVE")
+        .values("asset")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("asset", flat=True)
+    )
+    if not doubled:
+        return
+
+    for asset_id in doubled:
+        stale = Assignment.objects.filter(
+            asset_id=asset_id, status="ACTIVE"
+        ).order_by("-date_assigned", "-id")[1:]
+        Assignment.objects.filter(id__in=[a.id for a in stale]).update(
+            status="RETURNED", date_returned=timezone.now()
+        )
+
+    # Recount what the returns changed: the per-employee status counters
+    # and the global "assignments.assigned" (see core.counters)
+    DashboardCounter = apps.get_model("core", "DashboardCounter")
+    DashboardCounter.objects.filter(key__startswith="assignments.").delete()
+    rows = [
+        DashboardCounter(
+            key="assignments.assigned",
+            value=Assignment.objects.filter(date_returned__isnull=True).count(),
+        )
+    ]
+    for row in Assignment.objects.values("employee", "status").annotate(n=Count("id")):
+        rows.append(DashboardCounter(
+            key=f"assignments.{row['status']}", user_id=row["employee"], value=row["n"]
+        ))
+    DashboardCounter.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='assignment',
+            name='assignment_active_asset_idx',
+        ),
+        migrations.RunPython(
+            return_duplicate_assignments, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='assignment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'ACTIVE')), fields=('asset',), name='one_active_assignment_per_asset'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.25 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_one_active_assignment_per_asset'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['type'], name='asset_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['purchase_date'], name='asset_purchase_date_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+
+
+# Postgres only: a stored tsvector column per searchable table (see
+# core/search.py) and its GIN index. Changing a ts_config or the indexed
+# fields needs a new migration.
+
+def vector_sql(table, ts_config, fields):
+    columns = " || ' ' || ".join(f"coalesce({f}, '')" for f in fields)
+    return [
+        f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{ts_config}', {columns})) STORED",
+        f"CREATE INDEX {table}_search_vector_idx ON {table} USING GIN (search_vector)",
+    ]
+
+
+def drop_sql(table):
+    return [
+        f"DROP INDEX {table}_search_vector_idx",
+        f"ALTER TABLE {table} DROP COLUMN search_vector",
+    ]
+
+
+class PostgresRunSQL(migrations.RunSQL):
+    """RunSQL that is skipped on other databases (SQLite uses FTS5)."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_job'),
+    ]
+
+    operations = [
+        PostgresRunSQL(
+            vector_sql("core_asset", "simple", ["name", "serial_number"]),
+            drop_sql("core_asset"),
+        ),
+        PostgresRunSQL(
+            vector_sql("core_repairticket", "english", ["issue"]),
+            drop_sql("core_repairticket"),
+        ),
+    ]
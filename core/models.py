@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 
@@ -36,6 +37,14 @@ class Asset(models.Model):
     serial_number = models.CharField(max_length=100, unique=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
     purchase_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status"], name="asset_status_idx"),
+            models.Index(fields=["type"], name="asset_type_idx"),
+            models.Index(fields=["purchase_date"], name="asset_purchase_date_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -46,6 +55,7 @@ class InventoryItem(models.Model):
     item_type = models.CharField(max_length=100)
     quantity = models.PositiveIntegerField()
     threshold = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.item_type
@@ -77,6 +87,24 @@ class Assignment(models.Model):
 
     date_assigned = models.DateTimeField(auto_now_add=True)
     date_returned = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "status"],
+                name="assignment_employee_status_idx",
+            ),
+        ]
+        constraints = [
+            # An asset is held by at most one employee at a time; the
+            # partial unique index only covers the ACTIVE rows
+            models.UniqueConstraint(
+                fields=["asset"],
+                condition=Q(status="ACTIVE"),
+                name="one_active_assignment_per_asset",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} → {self.employee.username}"
@@ -114,6 +142,32 @@ class RepairTicket(models.Model):
     opened_on = models.DateTimeField(auto_now_add=True)
     assigned_on = models.DateTimeField(null=True, blank=True)
     resolved_on = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Keyset for TicketCursorPagination
+            models.Index(fields=["opened_on", "id"], name="ticket_opened_id_idx"),
+            models.Index(
+                fields=["reported_by", "status"],
+                name="ticket_reporter_status_idx",
+            ),
+            models.Index(
+                fields=["technician", "status", "opened_on"],
+                name="ticket_tech_status_opened_idx",
+            ),
+            # Technician dashboard: newest-first page across all statuses
+            models.Index(
+                fields=["technician", "opened_on", "id"],
+                name="ticket_tech_opened_idx",
+            ),
+            # Open + in-progress tickets; closed ones are the bulk of the table
+            models.Index(
+                fields=["status"],
+                condition=~Q(status="CLOSED"),
+                name="ticket_not_closed_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} - {self.status}"
@@ -130,6 +184,75 @@ class ActivityLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="activity_user_created_idx"),
+        ]
 
     def __str__(self):
         return self.message
+
+
+class DashboardCounter(models.Model):
+    """Materialized dashboard number, global (user=None) or per user.
+
+    Maintained by core.counters in the same transaction as the write
+    that changes it; rebuilt from live counts by ``rebuild_counters``.
+    """
+
+    key = models.CharField(max_length=50)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="counters"
+    )
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key", "user"],
+                name="counter_key_user_uniq",
+            ),
+            # NULLs are distinct in the constraint above
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=Q(user__isnull=True),
+                name="counter_global_key_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+
+class Job(models.Model):
+    """A queued side effect, run by ``manage.py run_jobs`` (see core.jobs)."""
+
+    STATUS_CHOICES = (
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    )
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict)
+    # Enqueueing the same key again is a no-op, even after the job ran
+    key = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
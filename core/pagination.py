@@ -0,0 +1,115 @@
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+# =======================
+# CURSOR PAGINATION
+# =======================
+# Keyset pagination: each page is "WHERE key < last_seen ORDER BY key
+# LIMIT n", so page 1000 costs the same as page 1 (no OFFSET scan).
+#
+# DRF's CursorPagination keys on the first ordering column only and
+# falls back to OFFSET when that column has ties (two assets with the
+# same name). Here the key is every ordering column plus id, which is
+# unique, so a cursor always points at exactly one row:
+#
+#   ?ordering=name  ->  ORDER BY name, id
+#                       WHERE name > 'x' OR (name = 'x' AND id > 7)
+#
+# Ordering columns must not be nullable.
+
+
+class KeysetPagination(CursorPagination):
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if "id" not in {f.lstrip("-") for f in ordering}:
+            # Ties go the same way as the last column
+            ordering = (*ordering, "-id" if ordering[-1].startswith("-") else "id")
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        try:
+            if position is not None:
+                queryset = queryset.filter(self._after(ordering, position))
+            results = list(queryset[:self.page_size + 1])
+        except (ValueError, DjangoValidationError):
+            # A position the columns can't hold
+            raise NotFound(self.invalid_cursor_message)
+        self.page = results[:self.page_size]
+        more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, more
+        else:
+            self.has_next, self.has_previous = more, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _after(self, ordering, position):
+        """Rows past ``position`` in ``ordering``, compared column by column."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        after, equal = Q(), {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "__lt" if field.startswith("-") else "__gt"
+            after |= Q(**equal, **{name + lookup: value})
+            equal[name] = value
+        return after
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _position(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(str(value))
+        return json.dumps(values, separators=(",", ":"))
+
+
+class IdCursorPagination(KeysetPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-id"
+
+
+class TicketCursorPagination(IdCursorPagination):
+    # Newest first; id breaks ties between tickets opened in the same instant
+    ordering = ("-opened_on", "-id")
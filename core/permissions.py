@@ -0,0 +1,64 @@
+import ipaddress
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+
+# =======================
+# ROLE PERMISSIONS
+# =======================
+# DRF checks permission_classes before the handler runs, so a request
+# with the wrong role is refused before any queryset or serializer work.
+# The role comes from request.user: for token users, the cached account
+# status (see core.authentication), so the check costs no queries.
+# Combine with DRF's operators: ``IsAdminRole | IsTechnician``.
+#
+# The /api/employee/ views only need IsAuthenticated: they read the
+# caller's own rows, which admins and technicians can have too.
+
+class HasRole(BasePermission):
+    roles = ()
+    message = "You do not have permission to perform this action."
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user
+            and user.is_authenticated
+            and getattr(user, "role", None) in self.roles
+        )
+
+
+class IsAdminRole(HasRole):
+    roles = ("ADMIN",)
+    message = "Only admins can do this."
+
+
+class IsTechnician(HasRole):
+    roles = ("TECHNICIAN",)
+    message = "Only technicians can do this."
+
+
+class ReadOnly(BasePermission):
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS
+
+
+class IsInternal(BasePermission):
+    """Callers on settings.METRICS_ALLOWED_IPS (e.g. a Prometheus scraper).
+
+    Checks REMOTE_ADDR, so scrape the app server directly, not through
+    the proxy.
+    """
+
+    message = "Only admins and internal callers can do this."
+
+    def has_permission(self, request, view):
+        try:
+            address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+        except ValueError:
+            return False
+        return any(
+            address in ipaddress.ip_network(network)
+            for network in settings.METRICS_ALLOWED_IPS
+        )
@@ -0,0 +1,48 @@
+from rest_framework.renderers import JSONRenderer
+
+from . import timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+# =======================
+# RENDERERS
+# =======================
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that hands fast-path responses to orjson.
+
+    Only views that set ``fast_rendering`` (core.fastpath rows: strings,
+    ints, bools and None) go through orjson, which writes those exactly
+    as DRF's compact, unicode json.dumps does. Everything else, and
+    every response when orjson isn't installed, uses the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timing.span("render"):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        view = renderer_context.get("view")
+
+        if (
+            orjson is None
+            or data is None
+            or not getattr(view, "fast_rendering", False)
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same JavaScript-safe escaping as JSONRenderer
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
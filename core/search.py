@@ -0,0 +1,205 @@
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Asset, RepairTicket
+
+
+# =======================
+# FULL-TEXT SEARCH
+# =======================
+# Each searchable table carries a precomputed inverted index that the
+# database keeps in step with every write (bulk_create/update() too):
+#
+# Postgres: a stored generated "search_vector" tsvector column with a
+#           GIN index, created by migration 0012_search_vector. Its
+#           ts_config and fields must match SEARCHABLE; changing either
+#           needs a new migration.
+# SQLite:   an FTS5 external-content table "<table>_fts" maintained by
+#           triggers, created by install() after every migrate. That also
+#           restores the triggers when a migration rebuilds a table.
+# Anything else falls back to icontains (and no ranking).
+#
+# Every search term is matched as a prefix ("lap" finds "laptop").
+
+
+class SearchSpec:
+    def __init__(self, fields, ts_config, fts_tokenizer):
+        self.fields = fields
+        # Postgres text search configuration / SQLite FTS5 tokenizer
+        self.ts_config = ts_config
+        self.fts_tokenizer = fts_tokenizer
+
+
+SEARCHABLE = {
+    # Names and serial numbers: no stemming
+    Asset: SearchSpec(["name", "serial_number"], "simple", "unicode61"),
+    # Free-text symptoms: "flickering" should find "flicker"
+    RepairTicket: SearchSpec(["issue"], "english", "porter unicode61"),
+}
+
+VECTOR_COLUMN = "search_vector"
+
+# Ranked search scores at most this many of the newest matching rows
+RANK_WINDOW = 5000
+
+
+def terms(text):
+    return re.findall(r"\w+", text or "")
+
+
+def _fts_table(model):
+    return f"{model._meta.db_table}_fts"
+
+
+def _pg_query(words):
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _fts_query(words):
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def matches(model, text):
+    """``Q`` selecting the rows of ``model`` whose search fields match ``text``."""
+    words = terms(text)
+    if not words:
+        return Q()
+
+    spec = SEARCHABLE[model]
+    table = connection.ops.quote_name(model._meta.db_table)
+
+    if connection.vendor == "postgresql":
+        return Q(pk__in=RawSQL(
+            f"SELECT id FROM {table} "
+            f"WHERE {VECTOR_COLUMN} @@ to_tsquery('{spec.ts_config}', %s)",
+            [_pg_query(words)],
+        ))
+
+    if connection.vendor == "sqlite":
+        fts = _fts_table(model)
+        return Q(pk__in=RawSQL(
+            f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [_fts_query(words)]
+        ))
+
+    condition = Q()
+    for word in words:
+        any_field = Q()
+        for field in spec.fields:
+            any_field |= Q(**{f"{field}__icontains": word})
+        condition &= any_field
+    return condition
+
+
+def ranked(model, text, limit):
+    """``[(pk, score), ...]`` best match first; higher score is better.
+
+    Only the newest RANK_WINDOW matches are scored, so a common term
+    costs the same on a million rows as on ten thousand.
+    """
+    query = ranked_sql(model, text, limit)
+    if query is None:
+        if not terms(text):
+            return []
+        ids = model.objects.filter(matches(model, text)).order_by("-pk")
+        return [(pk, 0.0) for pk in ids.values_list("pk", flat=True)[:limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(*query)
+        return [(pk, float(score)) for pk, score in cursor.fetchall()]
+
+
+def ranked_sql(model, text, limit):
+    """``(sql, params)`` for ranked(), or None without an index to rank on."""
+    words = terms(text)
+    if not words:
+        return None
+
+    spec = SEARCHABLE[model]
+    table = connection.ops.quote_name(model._meta.db_table)
+
+    if connection.vendor == "postgresql":
+        query = f"to_tsquery('{spec.ts_config}', %s)"
+        sql = (
+            f"SELECT id, ts_rank_cd({VECTOR_COLUMN}, {query}) AS score FROM ("
+            f"SELECT id, {VECTOR_COLUMN} FROM {table} "
+            f"WHERE {VECTOR_COLUMN} @@ {query} ORDER BY id DESC LIMIT %s"
+            f") recent ORDER BY score DESC, id DESC LIMIT %s"
+        )
+        params = [_pg_query(words), _pg_query(words), RANK_WINDOW, limit]
+    elif connection.vendor == "sqlite":
+        fts = _fts_table(model)
+        # bm25() is lower-is-better; the rowid floor is the window's oldest match
+        sql = (
+            f"SELECT rowid, -bm25({fts}) FROM {fts} "
+            f"WHERE {fts} MATCH %s AND rowid >= coalesce(("
+            f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s "
+            f"ORDER BY rowid DESC LIMIT 1 OFFSET %s), 0) "
+            f"ORDER BY bm25({fts}), rowid DESC LIMIT %s"
+        )
+        params = [_fts_query(words), _fts_query(words), RANK_WINDOW - 1, limit]
+    else:
+        return None
+    return sql, params
+
+
+# =======================
+# INDEX INSTALLATION (SQLITE)
+# =======================
+
+def _install_sqlite(cursor, model, spec):
+    table = model._meta.db_table
+    fts = _fts_table(model)
+    columns = ", ".join(spec.fields)
+    new = ", ".join(f"new.{f}" for f in spec.fields)
+    old = ", ".join(f"old.{f}" for f in spec.fields)
+    create = (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', "
+        f"content_rowid='id', tokenize='{spec.fts_tokenizer}')"
+    )
+
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE name IN (%s, %s)",
+        [fts, f"{fts}_au"],
+    )
+    existing = dict(cursor.fetchall())
+    if existing.get(fts) == create and f"{fts}_au" in existing:
+        return
+
+    if fts in existing and existing[fts] != create:
+        # Definition changed (e.g. tokenizer): start over
+        cursor.execute(f"DROP TABLE {fts}")
+
+    if existing.get(fts) != create:
+        cursor.execute(create)
+
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new}); END"
+    )
+    # Triggers were missing, so the index may be behind the table
+    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def install(using="default", **kwargs):
+    """Create (or repair) the FTS5 tables and triggers; safe to re-run."""
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return
+
+    with conn.cursor() as cursor:
+        for model, spec in SEARCHABLE.items():
+            _install_sqlite(cursor, model, spec)
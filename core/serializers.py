@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
@@ -20,19 +21,69 @@ class UserCreateSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         return user
+
+
+# =====================
+# SPARSE FIELDSETS
+# =====================
+def field_names(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """``?fields=a,b`` keeps and ``?exclude=c`` drops fields of a GET response.
+
+    Only the top-level serializer of the request is trimmed.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        root = self.parent
+        if isinstance(root, serializers.ListSerializer):
+            root = root.parent
+        if root is not None:
+            return fields
+
+        for param, keep in (("fields", True), ("exclude", False)):
+            names = field_names(request.query_params.get(param))
+            if not names:
+                continue
+            unknown = sorted(names - set(fields))
+            if unknown:
+                raise serializers.ValidationError(
+                    {param: [f"Unknown field: {name}." for name in unknown]}
+                )
+            fields = {
+                name: field for name, field in fields.items()
+                if (name in names) == keep
+            }
+
+        return fields
+
+
 # =====================
 # ASSET SERIALIZER
 # =====================
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Asset
         fields = "__all__"
 
 
+class AssetSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Asset
+        fields = ["id", "name", "type", "serial_number", "status"]
+
+
 # =====================
 # INVENTORY SERIALIZER
 # =====================
-class InventorySerializer(serializers.ModelSerializer):
+class InventorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     status = serializers.SerializerMethodField()
 
     class Meta:
@@ -54,7 +105,7 @@ class InventorySerializer(serializers.ModelSerializer):
 # =====================
 # ASSIGNMENT SERIALIZER
 # =====================
-class AssignmentSerializer(serializers.ModelSerializer):
+class AssignmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     asset_name = serializers.CharField(source="asset.name", read_only=True)
     employee_name = serializers.CharField(source="employee.username", read_only=True)
 
@@ -72,10 +123,24 @@ class AssignmentSerializer(serializers.ModelSerializer):
         ]
 
 
+class AssignmentSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # Ids only: no joins
+    class Meta:
+        model = Assignment
+        fields = [
+            "id",
+            "asset",
+            "employee",
+            "status",
+            "date_assigned",
+            "date_returned",
+        ]
+
+
 # =====================
 # REPAIR TICKET SERIALIZER
 # =====================
-class RepairTicketSerializer(serializers.ModelSerializer):
+class RepairTicketSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     asset_name = serializers.CharField(source="asset.name", read_only=True)
 
     class Meta:
@@ -83,10 +148,24 @@ class RepairTicketSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class RepairTicketSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # No issue text; ask for it with ?fields=...,issue
+    class Meta:
+        model = RepairTicket
+        fields = [
+            "id",
+            "asset",
+            "status",
+            "technician",
+            "opened_on",
+            "updated_at",
+        ]
+
+
 # =====================
 # USER LIST SERIALIZER
 # =====================
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     role = serializers.CharField(read_only=True)
 
     class Meta:
@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# =======================
+# STREAMING JSON
+# =======================
+# Unbounded lists are written as a JSON array a chunk of rows at a time,
+# straight from QuerySet.iterator(), so neither the model instances nor
+# the row dicts of the whole result are ever held at once. The bytes are
+# the same as Response(list(rows)) rendered by DRF's JSONRenderer.
+
+CHUNK_SIZE = 500
+
+_encoder = JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _encode(row):
+    # Same JavaScript-safe escaping as JSONRenderer
+    return (
+        _encoder.encode(row).replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+    )
+
+
+def json_array(rows, chunk_size=CHUNK_SIZE):
+    """Yield ``rows`` (an iterable of dicts) as a JSON array, in chunks."""
+    yield b"["
+    chunk = []
+    first = True
+    for row in rows:
+        chunk.append(_encode(row))
+        if len(chunk) == chunk_size:
+            yield (("" if first else ",") + ",".join(chunk)).encode()
+            chunk = []
+            first = False
+    if chunk:
+        yield (("" if first else ",") + ",".join(chunk)).encode()
+    yield b"]"
+
+
+def stream_rows(request, queryset, convert=dict, chunk_size=CHUNK_SIZE):
+    """StreamingHttpResponse of ``convert(row)`` for every row of ``queryset``.
+
+    ``queryset`` is read with ``.iterator(chunk_size)``; ``convert`` maps
+    one of its rows (instance or ``.values()`` dict) to the output dict.
+    """
+    rows = (convert(row) for row in queryset.iterator(chunk_size=chunk_size))
+    return streaming_response(
+        request, json_array(rows, chunk_size), content_type="application/json"
+    )
+
+
+# =======================
+# ASGI
+# =======================
+# Under ASGI, Django 4.2 sends a body given as a sync iterator with
+# sync_to_async(list): the whole body is built in memory before the
+# first byte goes out. For ASGI requests the chunks are pulled one at a
+# time instead, each in the request's sync thread (thread_sensitive),
+# which is where the view ran and the queryset's cursor lives.
+
+async def _pull(chunks):
+    chunks = iter(chunks)
+    pull = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await pull(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def streaming_response(request, chunks, **kwargs):
+    """StreamingHttpResponse of ``chunks`` that also streams under ASGI."""
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = _pull(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
@@ -1,3 +1,1938 @@
-from django.test import TestCase
+import io
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import warnings
+from collections import defaultdict
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib import admin as django_admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import (
+    assignments, authentication, caching, counters, events, fastpath, jobs, metrics, streaming, views,
+)
+from .models import ActivityLog, Asset, InventoryItem, Assignment, Job, RepairTicket
+from .middleware import NPlusOneMiddleware
+from .management.commands.seed_fleet import Fleet
+from .pagination import IdCursorPagination
+from .serializers import AssetSerializer, AssignmentSerializer, RepairTicketSerializer
+
+User = get_user_model()
+
+
+def make_asset(serial, status="AVAILABLE", type="LAPTOP"):
+    return Asset.objects.create(
+        name=f"Asset {serial}",
+        type=type,
+        serial_number=serial,
+        status=status,
+        purchase_date=date(2024, 1, 1),
+    )
+
+
+def streamed_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+def core_routes():
+    """Every route in core/urls.py, router format suffixes left out."""
+    from . import urls
+
+    routes = set()
+    for pattern in urls.urlpatterns:
+        prefix = str(pattern.pattern) if hasattr(pattern, "url_patterns") else ""
+        for p in getattr(pattern, "url_patterns", [pattern]):
+            if "format" not in str(p.pattern):
+                routes.add(prefix + str(p.pattern).lstrip("^"))
+    return routes
+
+
+# No job threads writing to the test database behind the tests' backs
+@override_settings(JOBS_BACKEND="core.jobs.ImmediateQueue")
+class CoreTestCase(TestCase):
+    def setUp(self):
+        # Cached responses would otherwise leak between tests
+        cache.clear()
+        authentication.forget()
+
+
+class DashboardStatsTests(CoreTestCase):
+    # Version stamps for the ETag + a single DashboardCounter lookup
+    QUERY_BUDGET = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.employee = User.objects.create_user("emp", password="x")
+
+        available = make_asset("SN-1")
+        assigned = make_asset("SN-2", status="ASSIGNED")
+        repair = make_asset("SN-3", status="UNDER_REPAIR")
+
+        InventoryItem.objects.create(item_type="Cables", quantity=2, threshold=5)
+        InventoryItem.objects.create(item_type="Mice", quantity=50, threshold=5)
+
+        Assignment.objects.create(asset=assigned, employee=cls.employee)
+        Assignment.objects.create(
+            asset=available, employee=cls.employee, status="RETURNED",
+            date_returned=date(2024, 2, 1),
+        )
+
+        RepairTicket.objects.create(asset=repair, issue="Broken", status="OPEN")
+        RepairTicket.objects.create(asset=repair, issue="Fan", status="IN_PROGRESS")
+        RepairTicket.objects.create(asset=repair, issue="Fixed", status="CLOSED")
+
+        counters.rebuild()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_counters(self):
+        data = self.client.get("/api/dashboard/").json()
+
+        self.assertEqual(data["total_assets"], 3)
+        self.assertEqual(data["total_inventory"], 2)
+        self.assertEqual(data["assigned_assets"], 1)
+        self.assertEqual(data["low_stock"], 1)
+        self.assertEqual(data["open_tickets"], 2)
+        self.assertEqual(
+            data["tickets_status"],
+            {"OPEN": 1, "IN_PROGRESS": 1, "CLOSED": 1},
+        )
+        self.assertEqual(
+            data["assets_status"],
+            {"AVAILABLE": 1, "ASSIGNED": 1, "UNDER_REPAIR": 1},
+        )
+
+    def test_matches_live_counts(self):
+        self.assertEqual(counters.check(), {})
+
+    def test_query_budget(self):
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            self.client.get("/api/dashboard/")
+
+
+class CursorPaginationTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        for i in range(5):
+            make_asset(f"SN-{i}")
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_walks_every_row_once(self):
+        seen = []
+        url = "/api/assets/?page_size=2"
+        while url:
+            page = self.client.get(url).json()
+            seen += [row["serial_number"] for row in page["results"]]
+            url = page["next"]
+
+        self.assertEqual(seen, [f"SN-{i}" for i in reversed(range(5))])
+
+    def walk(self, url, direction="next"):
+        pages, queries = [], []
+        while url:
+            with CaptureQueriesContext(connection) as captured:
+                page = self.client.get(url).json()
+            pages.append(([row["id"] for row in page["results"]], url))
+            queries += [q["sql"] for q in captured]
+            url = page[direction]
+        return pages, queries
+
+    def test_ties_are_broken_by_id(self):
+        for i in range(30):
+            asset = make_asset(f"TIE-{i}")
+            asset.name = "Same name"
+            asset.save()
+        expected = list(Asset.objects.order_by("name", "id").values_list("id", flat=True))
+
+        for fast in (False, True):
+            with self.subTest(fast=fast), self.settings(FAST_SERIALIZATION=fast):
+                pages, queries = self.walk("/api/assets/?ordering=name&page_size=7")
+                self.assertEqual([pk for ids, _url in pages for pk in ids], expected)
+                self.assertFalse([sql for sql in queries if "OFFSET" in sql])
+
+        # ... and back again from the last page
+        back, _ = self.walk(pages[-1][1], "previous")
+        self.assertEqual([ids for ids, _url in back], [ids for ids, _url in reversed(pages)])
+
+    def test_page_size_is_capped(self):
+        paginator = IdCursorPagination()
+        request = Request(APIRequestFactory().get("/", {"page_size": 100000}))
+        self.assertEqual(paginator.get_page_size(request), paginator.max_page_size)
+
+
+class DashboardCounterTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.employee = User.objects.create_user("emp", password="x")
+        cls.tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+
+    def as_user(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_writes_keep_counters_consistent(self):
+        admin = self.as_user(self.admin)
+        employee = self.as_user(self.employee)
+
+        asset = admin.post("/api/assets/", {
+            "name": "Laptop", "type": "LAPTOP", "serial_number": "SN-1",
+            "status": "AVAILABLE", "purchase_date": "2024-01-01",
+        }).json()
+        admin.post("/api/inventory/", {
+            "item_type": "Cables", "quantity": 1, "threshold": 5,
+        })
+
+        assignment = admin.post("/api/assignments/", {
+            "asset": asset["id"], "employee": self.employee.id,
+        }).json()
+        employee.post("/api/tickets/report/", {
+            "asset": asset["id"], "issue": "Screen flickers",
+        })
+        admin.patch(
+            f"/api/assignments/{assignment['id']}/", {"status": "RETURNED"}
+        )
+
+        ticket = RepairTicket.objects.get()
+        admin.patch(f"/api/tickets/{ticket.id}/", {"technician": self.tech.id})
+        self.as_user(self.tech).patch(
+            f"/api/technician/tickets/{ticket.id}/status/", {"status": "CLOSED"}
+        )
+
+        self.assertEqual(counters.check(), {})
+        self.assertEqual(
+            employee.get("/api/employee/dashboard/").json()["stats"],
+            {"my_assets": 0, "active_tickets": 0, "resolved_tickets": 1},
+        )
+
+        admin.delete(f"/api/assets/{asset['id']}/")
+        self.assertEqual(counters.check(), {})
+
+    def test_check_reports_drift(self):
+        make_asset("SN-1")
+        self.assertEqual(counters.check(), {
+            ("assets.total", None): (0, 1),
+            ("assets.AVAILABLE", None): (0, 1),
+        })
+
+    def test_fix_invalidates_cached_dashboards(self):
+        admin = self.as_user(self.admin)
+        self.assertEqual(admin.get("/api/dashboard/").json()["total_assets"], 0)
+
+        Asset.objects.bulk_create([Asset(  # no signals: the counters drift
+            name="Laptop", type="LAPTOP", serial_number="SN-1",
+            status="AVAILABLE", purchase_date=date(2024, 1, 1),
+        )])
+        self.assertEqual(admin.get("/api/dashboard/")["X-Cache"], "HIT")
+
+        with self.assertRaises(CommandError):
+            call_command("check_counters", stdout=io.StringIO())
+        call_command("check_counters", fix=True, stdout=io.StringIO())
+        self.assertEqual(admin.get("/api/dashboard/").json()["total_assets"], 1)
+
+    def test_admin_writes_keep_counters_consistent(self):
+        request = RequestFactory().post("/admin/")
+        request.user = self.admin
+        asset_admin = django_admin.site._registry[Asset]
+        ticket_admin = django_admin.site._registry[RepairTicket]
+
+        asset = Asset(name="Laptop", type="LAPTOP", serial_number="SN-1",
+                      status="AVAILABLE", purchase_date=date(2024, 1, 1))
+        asset_admin.save_model(request, asset, None, change=False)
+        ticket = RepairTicket(asset=asset, issue="Broken", reported_by=self.employee)
+        ticket_admin.save_model(request, ticket, None, change=False)
+        assignments.assign(asset, self.employee)
+
+        ticket.status = "CLOSED"
+        ticket_admin.save_model(request, ticket, None, change=True)
+        self.assertEqual(counters.check(), {})
+
+        second = make_asset("SN-2")
+        counters.rebuild()
+        asset.refresh_from_db()  # as the admin loads it
+        asset_admin.delete_model(request, asset)
+        asset_admin.delete_queryset(request, Asset.objects.filter(pk=second.pk))
+        self.assertEqual(counters.check(), {})
+
+    def test_deleting_a_user_keeps_counters_consistent(self):
+        asset = make_asset("SN-1")
+        counters.rebuild()
+        assignments.assign(asset, self.employee)
+        self.as_user(self.employee).post("/api/tickets/report/", {
+            "asset": asset.id, "issue": "Screen flickers",
+        })
+
+        self.employee.delete()  # assignments cascade, tickets lose reported_by
+        self.assertEqual(counters.check(), {})
+
+    def test_rebuild_changes_etags(self):
+        admin = self.as_user(self.admin)
+        etag = admin.get("/api/dashboard/")["ETag"]
+
+        call_command("rebuild_counters", stdout=io.StringIO())
+        response = admin.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class TechnicianDashboardTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+        asset = make_asset("SN-1")
+        RepairTicket.objects.bulk_create(
+            RepairTicket(asset=asset, issue=f"Issue {i}", technician=cls.tech)
+            for i in range(60)
+        )
+        counters.rebuild()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.tech)
+
+    def test_page_is_bounded(self):
+        # Stamps + counter lookup + one page of tickets, regardless of
+        # history size
+        with self.assertNumQueries(3):
+            data = self.client.get("/api/technician/dashboard/?page_size=20").json()
+
+        self.assertEqual(data["stats"], {"open": 60, "in_progress": 0, "closed": 0})
+        self.assertEqual(len(data["tickets"]), 20)
+        self.assertEqual(len(data["activity"]), 20)
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(data["tickets"][0]["asset"], "Asset SN-1")
+
+
+class ResponseCacheTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_second_read_is_a_hit(self):
+        self.assertEqual(self.client.get("/api/dashboard/")["X-Cache"], "MISS")
+
+        # Only the ETag version stamps
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/dashboard/")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertGreaterEqual(caching.metrics()["dashboard"]["hits"], 1)
+
+    def test_write_invalidates(self):
+        self.assertEqual(self.client.get("/api/assets/").json()["results"], [])
+        make_asset("SN-1")
+
+        response = self.client.get("/api/assets/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_per_user_keys(self):
+        self.client.get("/api/technician/dashboard/")
+
+        other = APIClient()
+        other.force_authenticate(self.tech)
+        self.assertEqual(other.get("/api/technician/dashboard/")["X-Cache"], "MISS")
+
+
+class ConditionalGetTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_not_modified(self):
+        make_asset("SN-1")
+        etag = self.client.get("/api/dashboard/")["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.revalidate("/api/dashboard/", etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_changes_etag(self):
+        asset = make_asset("SN-1")
+        etag = self.client.get("/api/dashboard/")["ETag"]
+
+        asset.status = "ASSIGNED"
+        asset.save()
+        self.assertEqual(self.revalidate("/api/dashboard/", etag).status_code, 200)
+
+    def test_delete_changes_etag(self):
+        older = make_asset("SN-1")
+        make_asset("SN-2")
+        etag = self.client.get("/api/assets/")["ETag"]
+
+        # Neither MAX(id) nor MAX(updated_at) moves
+        Asset.objects.filter(pk=older.pk).delete()
+        self.assertEqual(self.revalidate("/api/assets/", etag).status_code, 200)
+
+    def test_no_last_modified(self):
+        # It couldn't see deletions or two writes in the same second
+        make_asset("SN-1")
+        response = self.client.get("/api/assets/")
+        self.assertNotIn("Last-Modified", response)
+
+        Asset.objects.all().delete()
+        response = self.client.get(
+            "/api/assets/", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class BulkAssetTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        make_asset("SN-EXISTING")
+        counters.rebuild()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, name, content):
+        return self.client.post(
+            "/api/assets/import/",
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        ).json()
+
+    def test_csv_import_reports_bad_rows(self):
+        report = self.upload("assets.csv", (
+            "name,type,serial_number,status,purchase_date\n"
+            "Laptop,LAPTOP,SN-1,AVAILABLE,2024-01-01\n"
+            "Mouse,MOUSE,SN-2,AVAILABLE,not-a-date\n"
+            "Dup,LAPTOP,SN-EXISTING,AVAILABLE,2024-01-01\n"
+            "Dup,LAPTOP,SN-1,AVAILABLE,2024-01-01\n"
+            "Screen,MONITOR,SN-3,ASSIGNED,2024-01-01\n"
+        ))
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(
+            [(e["row"], list(e["errors"])) for e in report["errors"]],
+            [(3, ["purchase_date"]), (4, ["serial_number"]), (5, ["serial_number"])],
+        )
+        self.assertEqual(counters.check(), {})
+
+    def test_jsonl_import(self):
+        report = self.upload("assets.jsonl", (
+            '{"name": "Laptop", "type": "LAPTOP", "serial_number": "SN-1",'
+            ' "status": "AVAILABLE", "purchase_date": "2024-01-01"}\n'
+            "not json\n"
+        ))
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["errors"][0]["row"], 2)
+
+    def test_export_round_trips(self):
+        response = self.client.get("/api/assets/export/?file_format=csv")
+        content = b"".join(response.streaming_content).decode()
+
+        Asset.objects.all().delete()
+        report = self.upload("assets.csv", content)
+        self.assertEqual(report, {"created": 1, "errors": []})
+        self.assertTrue(Asset.objects.filter(serial_number="SN-EXISTING").exists())
+
+
+class AssignmentWorkflowTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.employee = User.objects.create_user("emp", password="x")
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def assign(self, asset):
+        return self.client.post("/api/assignments/", {
+            "asset": asset.id, "employee": self.employee.id,
+        })
+
+    def test_assigned_asset_cannot_be_assigned_again(self):
+        asset = make_asset("SN-1")
+        self.assertEqual(self.assign(asset).status_code, 201)
+
+        response = self.assign(asset)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"asset": ["Asset is not available."]})
+
+    def test_return_frees_the_asset(self):
+        asset = make_asset("SN-1")
+        assignment = self.assign(asset).json()
+
+        response = self.client.patch(
+            f"/api/assignments/{assignment['id']}/", {"status": "RETURNED"}
+        )
+        self.assertEqual(response.json()["status"], "RETURNED")
+        self.assertIsNotNone(response.json()["date_returned"])
+
+        asset.refresh_from_db()
+        self.assertEqual(asset.status, "AVAILABLE")
+        self.assertEqual(self.assign(asset).status_code, 201)
+
+
+    def test_asset_status_changes_only_through_the_service(self):
+        asset, other = make_asset("SN-1"), make_asset("SN-2")
+        counters.rebuild()
+        url = f"/api/assignments/{self.assign(asset).json()['id']}/"
+        another = User.objects.create_user("emp2", password="x")
+
+        for body in (
+            {"asset": other.id},
+            {"status": "RETURNED", "employee": another.id},
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.patch(url, body).status_code, 400)
+
+        # A full PUT that only changes the status is a plain return
+        response = self.client.put(url, {
+            "asset": asset.id, "employee": self.employee.id, "status": "RETURNED",
+        })
+        self.assertEqual(response.json()["status"], "RETURNED")
+
+        self.assertEqual(self.client.patch(url, {"status": "ACTIVE"}).status_code, 400)
+        asset.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((asset.status, other.status), ("AVAILABLE", "AVAILABLE"))
+        self.assertEqual(counters.check(), {})
+
+    def test_only_the_active_constraint_means_unavailable(self):
+        from django.db import IntegrityError
+
+        self.assertTrue(assignments.lost_race(IntegrityError(
+            'duplicate key value violates unique constraint "one_active_assignment_per_asset"'
+        )))
+        self.assertTrue(assignments.lost_race(IntegrityError(
+            "UNIQUE constraint failed: core_assignment.asset_id"
+        )))
+        self.assertFalse(assignments.lost_race(IntegrityError(
+            "FOREIGN KEY constraint failed"
+        )))
+
+@override_settings(JOBS_BACKEND="core.jobs.ImmediateQueue")
+class AssignmentConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def test_parallel_assigns_of_one_asset(self):
+        asset = make_asset("SN-1")
+        employees = [
+            User.objects.create_user(f"emp{i}", password="x")
+            for i in range(self.THREADS)
+        ]
+        barrier = threading.Barrier(self.THREADS)
+        outcomes = []
+
+        def worker(employee):
+            try:
+                barrier.wait()
+                assignments.assign(asset, employee)
+                outcomes.append("assigned")
+            except Exception as exc:
+                outcomes.append(type(exc).__name__)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(e,)) for e in employees]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        winners = outcomes.count("assigned")
+        active = Assignment.objects.filter(asset=asset, status="ACTIVE").count()
+
+        # Never a double assignment; with row locks exactly one thread wins
+        self.assertLessEqual(winners, 1)
+        self.assertEqual(active, winners)
+        if connection.features.has_select_for_update:
+            self.assertEqual(winners, 1)
+
+
+@override_settings(JOBS_BACKEND="core.jobs.ImmediateQueue")
+class CounterConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def setUp(self):
+        cache.clear()
+        authentication.forget()
+
+    def race(self, user, method, url, bodies):
+        """Send ``bodies`` to ``url`` at once; returns the status codes."""
+        barrier = threading.Barrier(len(bodies))
+        codes = []
+
+        def worker(body):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                codes.append(getattr(client, method)(url, body, format="json").status_code)
+            except Exception as exc:
+                codes.append(type(exc).__name__)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(b,)) for b in bodies]
+        # SQLite's "database table is locked" 500s aren't worth a traceback each
+        with mock.patch.object(logging.getLogger("django.request"), "disabled", True):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return codes
+
+    def assert_no_drift(self, codes):
+        # SQLite refuses some of the racing writes outright; row-locking
+        # databases serialize them. Either way the counters must add up.
+        self.assertEqual(counters.check(), {})
+        if connection.features.has_select_for_update:
+            self.assertEqual(codes, [200] * self.THREADS)
+
+    def test_parallel_ticket_status_updates(self):
+        tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+        ticket = RepairTicket.objects.create(
+            asset=make_asset("SN-1"), issue="Broken", status="OPEN", technician=tech
+        )
+        counters.rebuild()
+
+        statuses = itertools.islice(itertools.cycle(["IN_PROGRESS", "CLOSED"]), self.THREADS)
+        codes = self.race(
+            tech, "patch", f"/api/technician/tickets/{ticket.id}/status/",
+            [{"status": s} for s in statuses],
+        )
+        self.assert_no_drift(codes)
+
+    def test_parallel_asset_updates(self):
+        admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        asset = make_asset("SN-1")
+        counters.rebuild()
+
+        statuses = itertools.islice(itertools.cycle(["UNDER_REPAIR", "ASSIGNED"]), self.THREADS)
+        codes = self.race(
+            admin, "patch", f"/api/assets/{asset.id}/", [{"status": s} for s in statuses]
+        )
+        self.assert_no_drift(codes)
+
+
+class BulkAssignmentTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.employees = [
+            User.objects.create_user(f"emp{i}", password="x") for i in range(3)
+        ]
+        cls.assets = [make_asset(f"SN-{i}") for i in range(3)]
+        counters.rebuild()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_assign_reports_per_item(self):
+        a, b, c = self.assets
+        e = self.employees[0]
+        items = [
+            {"asset": a.id, "employee": e.id},
+            {"asset": a.id, "employee": self.employees[1].id},
+            {"asset": 999999, "employee": e.id},
+            {"asset": b.id},
+            {"asset": c.id, "employee": self.employees[2].id},
+        ]
+
+        # Lock assets, check employees, one INSERT, one asset UPDATE and
+        # batched counter writes -- the same for 5 items or 500
+        with self.assertNumQueries(15):
+            results = self.client.post(
+                "/api/assignments/bulk-assign/", {"items": items}, format="json"
+            ).json()["results"]
+
+        self.assertEqual(
+            [r.get("status") or list(r["errors"]) for r in results],
+            ["ACTIVE", ["asset"], ["asset"], ["non_field_errors"], "ACTIVE"],
+        )
+        self.assertEqual(
+            set(Asset.objects.filter(status="ASSIGNED").values_list("id", flat=True)),
+            {a.id, c.id},
+        )
+        self.assertEqual(counters.check(), {})
+
+    def test_bulk_return(self):
+        ids = [
+            assignments.assign(asset, employee).id
+            for asset, employee in zip(self.assets, self.employees)
+        ]
+
+        results = self.client.post(
+            "/api/assignments/bulk-return/", {"ids": ids + [999999]}, format="json"
+        ).json()["results"]
+
+        self.assertEqual([r.get("status") for r in results], ["RETURNED"] * 3 + [None])
+        self.assertFalse(Asset.objects.exclude(status="AVAILABLE").exists())
+        self.assertFalse(Assignment.objects.filter(status="ACTIVE").exists())
+        self.assertEqual(counters.check(), {})
+
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        # Fresh employees in each batch, so both create their counter rows
+        employees = [User.objects.create_user(f"batch{i}", password="x") for i in range(23)]
+        assets = [make_asset(f"B-{i}") for i in range(23)]
+        counters.rebuild()
+        # ... and the global counters exist before either runs
+        assignments.assign(assets.pop(), employees.pop())
+
+        def queries(url, body, expected):
+            with CaptureQueriesContext(connection) as captured:
+                results = self.client.post(url, body, format="json").json()["results"]
+            self.assertEqual([r.get("status") for r in results], [expected] * len(results))
+            return len(captured)
+
+        def assign(assets, employees):
+            return queries("/api/assignments/bulk-assign/", {"items": [
+                {"asset": a.id, "employee": e.id} for a, e in zip(assets, employees)
+            ]}, "ACTIVE")
+
+        def give_back(assets):
+            ids = Assignment.objects.filter(asset__in=assets).values_list("id", flat=True)
+            return queries("/api/assignments/bulk-return/", {"ids": list(ids)}, "RETURNED")
+
+        small = assign(assets[:2], employees[:2])
+        self.assertEqual(assign(assets[2:], employees[2:]), small)
+        small = give_back(assets[:2])
+        self.assertEqual(give_back(assets[2:]), small)
+        self.assertEqual(counters.check(), {})
+
+    def test_body_must_be_an_object(self):
+        for url in ("/api/assignments/bulk-assign/", "/api/assignments/bulk-return/"):
+            with self.subTest(url=url):
+                response = self.client.post(url, [1], format="json")
+                self.assertEqual(response.status_code, 400)
+
+    def test_batch_errors_name_the_payload_key(self):
+        for url, key in (
+            ("/api/assignments/bulk-assign/", "items"),
+            ("/api/assignments/bulk-return/", "ids"),
+        ):
+            with self.subTest(url=url):
+                response = self.client.post(url, {key: "nope"}, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), [key])
+
+
+class FilterSearchTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+        laptop = make_asset("LT-100")
+        make_asset("MS-200", status="ASSIGNED", type="MOUSE")
+        monitor = make_asset("MN-300", status="UNDER_REPAIR", type="MONITOR")
+        monitor.name = "Dell monitor"
+        monitor.save()
+
+        RepairTicket.objects.create(asset=laptop, issue="Battery drains overnight")
+        RepairTicket.objects.create(
+            asset=monitor, issue="Flickering screen", technician=cls.tech,
+            status="IN_PROGRESS",
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def serials(self, query):
+        results = self.client.get(f"/api/assets/?{query}").json()["results"]
+        return [row["serial_number"] for row in results]
+
+    def test_asset_filters(self):
+        self.assertEqual(self.serials("status=AVAILABLE,ASSIGNED&ordering=id"),
+                         ["LT-100", "MS-200"])
+        self.assertEqual(self.serials("type=MONITOR"), ["MN-300"])
+        self.assertEqual(self.serials("purchased_after=2025-01-01"), [])
+
+    def test_invalid_filter_value(self):
+        response = self.client.get("/api/assets/?purchased_after=yesterday")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"purchased_after": ["Invalid value."]})
+
+    def test_prefix_search(self):
+        self.assertEqual(self.serials("search=dell"), ["MN-300"])
+        self.assertEqual(self.serials("search=LT-10"), ["LT-100"])
+        self.assertEqual(self.serials("search=mon"), ["MN-300"])
+
+    def test_search_follows_updates(self):
+        asset = Asset.objects.get(serial_number="LT-100")
+        asset.name = "ThinkPad"
+        asset.save()
+        self.assertEqual(self.serials("search=thinkpad"), ["LT-100"])
+
+    def test_ordering(self):
+        self.assertEqual(self.serials("ordering=serial_number"),
+                         ["LT-100", "MN-300", "MS-200"])
+        self.assertEqual(self.serials("ordering=-serial_number"),
+                         ["MS-200", "MN-300", "LT-100"])
+
+    def test_ticket_filters_and_search(self):
+        def issues(query):
+            results = self.client.get(
+                f"/api/tickets/?fields=issue&{query}"
+            ).json()["results"]
+            return [row["issue"] for row in results]
+
+        self.assertEqual(issues(f"technician={self.tech.id}"), ["Flickering screen"])
+        self.assertEqual(issues("status=OPEN"), ["Battery drains overnight"])
+        self.assertEqual(issues("search=flicker"), ["Flickering screen"])
+        self.assertEqual(issues("search=battery overnight"), ["Battery drains overnight"])
+
+
+class TicketSearchTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        asset = make_asset("SN-1")
+        for issue in [
+            "Screen flickers when the lid moves",
+            "Battery will not charge",
+            "Flickering screen and flickering backlight after update",
+        ]:
+            RepairTicket.objects.create(asset=asset, issue=issue)
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_ranked_with_stemming(self):
+        results = self.client.get("/api/tickets/search/?q=flickering").json()
+
+        self.assertEqual(
+            [r["issue"] for r in results],
+            [
+                "Flickering screen and flickering backlight after update",
+                "Screen flickers when the lid moves",
+            ],
+        )
+        self.assertEqual(results[0]["asset_name"], "Asset SN-1")
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_index_follows_writes(self):
+        ticket = RepairTicket.objects.get(issue="Battery will not charge")
+        ticket.issue = "Charger cable frayed"
+        ticket.save()
+
+        self.assertEqual(self.client.get("/api/tickets/search/?q=battery").json(), [])
+        self.assertEqual(
+            [r["id"] for r in self.client.get("/api/tickets/search/?q=frayed").json()],
+            [ticket.id],
+        )
+
+    def test_empty_query(self):
+        self.assertEqual(self.client.get("/api/tickets/search/?q=").json(), [])
+
+    def test_explain_queries(self):
+        from core.management.commands.explain_queries import QUERIES
+
+        out = io.StringIO()
+        call_command("explain_queries", search="screen", stdout=out)
+
+        output = out.getvalue()
+        for endpoint, label, _build in QUERIES:
+            endpoint += "screen" if endpoint.endswith("=") else ""
+            self.assertIn(f"{endpoint} -- {label}", output)
+        self.assertIn("/api/tickets/search/?q=screen -- ranked search", output)
+
+
+class SparseFieldsetTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.asset = make_asset("SN-1")
+        for issue in ["Fan noise", "Dead pixel"]:
+            RepairTicket.objects.create(asset=cls.asset, issue=issue)
+        Assignment.objects.create(asset=cls.asset, employee=cls.admin, status="ACTIVE")
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def keys(self, url):
+        return set(self.client.get(url).json()["results"][0])
+
+    def test_lists_use_summary_serializers(self):
+        self.assertEqual(self.keys("/api/assets/"),
+                         {"id", "name", "type", "serial_number", "status"})
+        self.assertNotIn("issue", self.keys("/api/tickets/"))
+        self.assertNotIn("asset_name", self.keys("/api/assignments/"))
+
+    def test_fields_and_exclude(self):
+        self.assertEqual(self.keys("/api/assets/?fields=id,purchase_date"),
+                         {"id", "purchase_date"})
+        self.assertEqual(self.keys("/api/tickets/?fields=issue,asset_name"),
+                         {"issue", "asset_name"})
+        self.assertEqual(self.keys("/api/assets/?exclude=name,type"),
+                         {"id", "serial_number", "status"})
+
+        detail = self.client.get(f"/api/assets/{self.asset.id}/?exclude=updated_at")
+        self.assertNotIn("updated_at", detail.json())
+        self.assertIn("purchase_date", detail.json())
+
+        users = self.client.get("/api/users/?fields=username")
+        self.assertEqual(streamed_json(users), [{"username": "admin"}])
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/tickets/?fields=id,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"fields": ["Unknown field: secret."]})
+
+    def test_queryset_is_narrowed(self):
+        with self.assertNumQueries(1) as ctx:
+            self.client.get("/api/tickets/?fields=issue,asset_name")
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertIn('"core_asset"."name"', sql)
+        self.assertNotIn("resolved_on", sql)
+        self.assertNotIn('"core_asset"."serial_number"', sql)
+
+
+class FastSerializationTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+        odd = 'Ünïcødé "quoted" \\ tab\t nl\n ctrl\x01 sep\u2028\u2029 😀 </script>'
+        assets = [make_asset("SN-1"), make_asset("SN-2", type="MONITOR"), make_asset(odd)]
+        for i, asset in enumerate(assets):
+            RepairTicket.objects.create(
+                asset=asset, issue=f"{odd} {i}", reported_by=cls.admin,
+                technician=cls.tech if i % 2 else None,
+            )
+            Assignment.objects.create(asset=asset, employee=cls.admin, status="ACTIVE")
+        assignment = Assignment.objects.first()
+        assignment.status, assignment.date_returned = "RETURNED", assignment.date_assigned
+        assignment.save()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, url, fast):
+        cache.clear()
+        with override_settings(FAST_SERIALIZATION=fast):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_byte_for_byte(self):
+        full = {
+            "/api/assets/": AssetSerializer,
+            "/api/tickets/": RepairTicketSerializer,
+            "/api/assignments/": AssignmentSerializer,
+        }
+        for path, serializer in full.items():
+            everything = ",".join(serializer().fields)
+            for query in [
+                "",
+                "page_size=2",
+                f"fields={everything}",
+                f"fields={everything}&page_size=1&ordering=-id",
+                "exclude=id,status",
+            ]:
+                url = f"{path}?{query}"
+                with self.subTest(url=url):
+                    self.assertEqual(self.get(url, fast=True), self.get(url, fast=False))
+
+    def test_next_page_matches(self):
+        url = "/api/tickets/?fields=id,issue&page_size=2"
+        fast = self.client.get(url).json()
+        with override_settings(FAST_SERIALIZATION=True):
+            page = self.client.get(fast["next"])
+        self.assertEqual(page.content, self.get(fast["next"], fast=False))
+
+    def test_skips_serializer(self):
+        with mock.patch.object(
+            RepairTicketSerializer, "to_representation", side_effect=AssertionError
+        ):
+            self.get("/api/tickets/?fields=id,asset_name,opened_on", fast=True)
+
+    def test_compiled_cache_is_bounded(self):
+        with mock.patch.dict(fastpath._compiled, clear=True), \
+                mock.patch.object(fastpath, "MAX_COMPILED", 3):
+            # Same field set in any order is one entry
+            first = self.get("/api/assets/?fields=id,name", fast=True)
+            self.assertEqual(self.get("/api/assets/?fields=name,id", fast=True), first)
+            self.assertEqual(len(fastpath._compiled), 1)
+
+            for fields in ["id", "name", "status", "type", "serial_number"]:
+                self.get(f"/api/assets/?fields={fields}", fast=True)
+            self.assertEqual(len(fastpath._compiled), 3)
+
+
+class StreamingJSONTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user("emp", password="x", role="EMPLOYEE")
+        cls.tech = User.objects.create_user("tech", password="x", role="TECHNICIAN")
+        for i in range(5):
+            asset = make_asset(f"SN-{i}")
+            Assignment.objects.create(asset=asset, employee=cls.employee)
+            RepairTicket.objects.create(
+                asset=asset, issue=f"Issue {i}\u2028", reported_by=cls.employee,
+                technician=cls.tech if i % 2 else None,
+            )
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def test_chunks_form_one_array(self):
+        rows = [{"id": i, "when": date(2024, 1, i + 1)} for i in range(7)]
+        chunks = list(streaming.json_array(iter(rows), chunk_size=3))
+
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(b"".join(chunks), JSONRenderer().render(rows))
+        self.assertEqual(b"".join(streaming.json_array(iter([]))), b"[]")
+
+    def test_employee_lists(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/employee/tickets/")
+            tickets = streamed_json(response)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual([t["issue"] for t in tickets][:2], ["Issue 4\u2028", "Issue 3\u2028"])
+        self.assertEqual(
+            {t["technician"] for t in tickets}, {"tech", "Not assigned"}
+        )
+
+        with self.assertNumQueries(1):
+            assignments = streamed_json(self.client.get("/api/employee/assignments/"))
+        self.assertEqual(len(assignments), 5)
+        self.assertEqual(assignments[0]["asset"], "Asset SN-4")
+
+    def test_users_list(self):
+        self.client.force_authenticate(
+            User.objects.create_user("admin", password="x", role="ADMIN")
+        )
+        users = streamed_json(self.client.get("/api/users/"))
+        self.assertEqual([u["username"] for u in users], ["admin", "emp", "tech"])
+        self.assertEqual(set(users[0]), {"id", "username", "email", "role"})
+
+    def test_streams_under_asgi(self):
+        admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        headers = {"authorization": f"Bearer {RefreshToken.for_user(admin).access_token}"}
+        client = AsyncClient()
+
+        async def fetch(url):
+            response = await client.get(url, headers=headers)
+            return response, [chunk async for chunk in response.streaming_content]
+
+        for url in ["/api/users/", "/api/assets/export/?file_format=jsonl"]:
+            with self.subTest(url=url), warnings.catch_warnings():
+                # Django warns when it has to buffer a sync iterator
+                warnings.filterwarnings("error", "StreamingHttpResponse must consume")
+                response, chunks = async_to_sync(fetch)(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.is_async)
+
+                sync = APIClient()
+                sync.force_authenticate(admin)
+                self.assertEqual(
+                    b"".join(chunks), b"".join(sync.get(url).streaming_content)
+                )
+
+
+class StatelessAuthTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user(
+            "emp", email="emp@example.com", password="pw", role="EMPLOYEE"
+        )
+        cls.admin = User.objects.create_user("admin", password="pw", role="ADMIN")
+
+    def client_for(self, username, url="/api/login/"):
+        token = self.client.post(url, {"username": username, "password": "pw"}).json()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token['access']}")
+        return client
+
+    def test_no_user_query_per_request(self):
+        client = self.client_for("emp")
+
+        # Account status, then the view's own query
+        with self.assertNumQueries(2):
+            self.assertEqual(client.get("/api/employee/assets/").status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get("/api/employee/assets/").status_code, 200)
+
+    def test_full_row_loads_lazily(self):
+        client = self.client_for("emp")
+        client.get("/api/employee/assets/")
+
+        with self.assertNumQueries(1):
+            profile = client.get("/api/profile/").json()
+        self.assertEqual(
+            profile, {"username": "emp", "email": "emp@example.com", "role": "EMPLOYEE"}
+        )
+
+    def test_deactivated_user_is_rejected(self):
+        client = self.client_for("emp")
+        client.get("/api/employee/assets/")
+
+        self.employee.is_active = False
+        self.employee.save()
+        self.assertEqual(client.get("/api/employee/assets/").status_code, 401)
+
+    def test_role_claim_is_normalized(self):
+        # /api/token/ writes role as "Admin"
+        client = self.client_for("admin", url="/api/token/")
+        response = client.post("/api/users/create/", {
+            "username": "new", "email": "new@example.com", "password": "pw",
+            "role": "EMPLOYEE",
+        })
+        self.assertEqual(response.status_code, 201)
+
+    def test_demoted_admin_loses_access(self):
+        client = self.client_for("admin")
+        self.assertEqual(client.get("/api/users/").status_code, 200)
+
+        # The token still says ADMIN; the row wins
+        self.admin.role = "EMPLOYEE"
+        self.admin.save()
+        self.assertEqual(client.get("/api/users/").status_code, 403)
+
+    def test_django_flags_come_from_the_row(self):
+        self.admin.is_staff = self.admin.is_superuser = True
+        self.admin.save()
+
+        token = RefreshToken.for_user(self.admin).access_token
+        user = authentication.ClaimsJWTAuthentication().get_user(token)
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.has_perm("core.delete_asset"))
+        self.assertEqual(user.role, "ADMIN")
+
+        employee = authentication.ClaimsJWTAuthentication().get_user(
+            RefreshToken.for_user(self.employee).access_token
+        )
+        self.assertFalse(employee.is_staff)
+        self.assertFalse(employee.has_perm("core.delete_asset"))
+        self.assertEqual(list(employee.groups.all()), [])
+
+    def test_change_password(self):
+        client = self.client_for("emp")
+        response = client.post("/api/change-password/", {
+            "current_password": "pw", "new_password": "pw2",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.employee.refresh_from_db()
+        self.assertTrue(self.employee.check_password("pw2"))
+
+
+class RolePermissionTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            role: User.objects.create_user(role.lower(), password="x", role=role)
+            for role in ("ADMIN", "EMPLOYEE", "TECHNICIAN")
+        }
+
+    def status_for(self, role, method, url, data=None):
+        client = APIClient()
+        client.force_authenticate(self.users[role])
+        return getattr(client, method)(url, data, format="json").status_code
+
+    def test_forbidden_before_any_query(self):
+        for role, method, url in [
+            ("EMPLOYEE", "get", "/api/dashboard/"),
+            ("EMPLOYEE", "get", "/api/users/"),
+            ("TECHNICIAN", "post", "/api/users/create/"),
+            ("EMPLOYEE", "get", "/api/tickets/"),
+            ("TECHNICIAN", "post", "/api/tickets/"),
+            ("EMPLOYEE", "post", "/api/assets/"),
+            ("TECHNICIAN", "get", "/api/assignments/"),
+            ("ADMIN", "get", "/api/technician/dashboard/"),
+        ]:
+            with self.subTest(role=role, url=url), self.assertNumQueries(0):
+                # An empty body would be a 400 if validation ran first
+                self.assertEqual(self.status_for(role, method, url, {}), 403)
+
+    def test_allowed(self):
+        self.assertEqual(self.status_for("TECHNICIAN", "get", "/api/tickets/"), 200)
+        self.assertEqual(self.status_for("EMPLOYEE", "get", "/api/assets/"), 200)
+        self.assertEqual(self.status_for("EMPLOYEE", "get", "/api/profile/"), 200)
+        self.assertEqual(self.status_for("ADMIN", "get", "/api/users/"), 200)
+
+    def test_own_records_for_every_role(self):
+        # Admins and technicians can hold assignments and report tickets too
+        for role in ("ADMIN", "TECHNICIAN", "EMPLOYEE"):
+            for url in ["/api/employee/dashboard/", "/api/employee/assets/",
+                        "/api/employee/assignments/", "/api/employee/tickets/"]:
+                with self.subTest(role=role, url=url):
+                    self.assertEqual(self.status_for(role, "get", url), 200)
+
+    def test_anonymous(self):
+        self.assertEqual(APIClient().get("/api/dashboard/").status_code, 401)
+
+
+class AsyncViewTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            role: User.objects.create_user(role.lower(), role=role)
+            for role in ("ADMIN", "EMPLOYEE", "TECHNICIAN")
+        }
+        for i in range(3):
+            asset = make_asset(f"SN-{i}", status="ASSIGNED")
+            Assignment.objects.create(asset=asset, employee=cls.users["EMPLOYEE"])
+            RepairTicket.objects.create(
+                asset=asset, issue="Broken", technician=cls.users["TECHNICIAN"],
+                reported_by=cls.users["EMPLOYEE"],
+            )
+        counters.rebuild()
+
+    def call(self, view, url, role=None, method="get"):
+        headers = {}
+        if role:
+            token = RefreshToken.for_user(self.users[role])
+            token["role"] = role
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {token.access_token}"
+        request = getattr(RequestFactory(), method)(url, **headers)
+        response = async_to_sync(view)(request)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def test_same_output_as_sync_views(self):
+        for view, url, role in [
+            (views.adashboard_stats, "/api/dashboard/", "ADMIN"),
+            (views.arecent_activity, "/api/recent-activity/", "ADMIN"),
+            (views.aemployee_dashboard, "/api/employee/dashboard/", "EMPLOYEE"),
+            (views.atechnician_dashboard, "/api/technician/dashboard/?page_size=2", "TECHNICIAN"),
+        ]:
+            with self.subTest(url=url):
+                client = APIClient()
+                client.force_authenticate(self.users[role])
+                expected = client.get(url).json()
+                cache.clear()
+
+                response = self.call(view, url, role)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(json.loads(response.content), expected)
+
+    def test_auth_and_permissions(self):
+        response = self.call(views.adashboard_stats, "/api/dashboard/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = self.call(views.adashboard_stats, "/api/dashboard/", "EMPLOYEE")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(json.loads(response.content), {"detail": "Only admins can do this."})
+
+        response = self.call(views.adashboard_stats, "/api/dashboard/", "ADMIN", "post")
+        self.assertEqual(response.status_code, 405)
+
+    def test_conditional_and_cache(self):
+        first = self.call(views.aemployee_dashboard, "/api/employee/dashboard/", "EMPLOYEE")
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        again = self.call(views.aemployee_dashboard, "/api/employee/dashboard/", "EMPLOYEE")
+        self.assertEqual(again["X-Cache"], "HIT")
+        self.assertEqual(again["ETag"], first["ETag"])
+
+
+class EventTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user("emp", role="EMPLOYEE")
+        cls.tech = User.objects.create_user("tech", role="TECHNICIAN")
+        cls.ticket = RepairTicket.objects.create(
+            asset=make_asset("SN-1"), issue="Broken",
+            reported_by=cls.employee, technician=cls.tech,
+        )
+
+    def test_fan_out_once_per_stream(self):
+        async def run():
+            backend = events.LocalBackend()
+            admin = backend.subscribe(["user:1", "role:ADMIN"])
+            employee = backend.subscribe(["user:2", "role:EMPLOYEE"])
+            backend.publish(["user:1", "role:ADMIN"], "ticket.updated", "{}")
+            received = [await admin.get(0.1), await admin.get(0.01)]
+            received.append(await employee.get(0.01))
+
+            backend.unsubscribe(admin)
+            backend.publish(["role:ADMIN"], "ticket.updated", "{}")
+            received.append(await admin.get(0.01))
+            return received
+
+        self.assertEqual(
+            async_to_sync(run)(), [("ticket.updated", "{}"), None, None, None]
+        )
+
+    def test_published_after_commit(self):
+        client = APIClient()
+        client.force_authenticate(self.tech)
+
+        with mock.patch.object(events, "backend") as backend:
+            with self.captureOnCommitCallbacks() as callbacks:
+                client.patch(
+                    f"/api/technician/tickets/{self.ticket.id}/status/",
+                    {"status": "IN_PROGRESS"}, format="json",
+                )
+            backend.assert_not_called()
+
+            for callback in callbacks:
+                callback()
+
+        channels, event, payload = backend().publish.call_args.args
+        self.assertEqual(
+            sorted(channels),
+            ["role:ADMIN", f"user:{self.employee.id}", f"user:{self.tech.id}"],
+        )
+        self.assertEqual(event, "ticket.updated")
+        self.assertEqual(json.loads(payload)["status"], "IN_PROGRESS")
+
+    def test_redis_outage_is_logged_not_raised(self):
+        class Down(Exception):
+            pass
+
+        # redis itself isn't needed: the client is replaced
+        backend = events.RedisBackend.__new__(events.RedisBackend)
+        events.LocalBackend.__init__(backend)
+        backend._redis = mock.Mock(**{"publish.side_effect": Down})
+        backend._errors = (Down,)
+
+        client = APIClient()
+        client.force_authenticate(self.tech)
+        with mock.patch.object(events, "backend", return_value=backend), \
+                self.assertLogs("core.events", "WARNING"), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(
+                f"/api/technician/tickets/{self.ticket.id}/status/",
+                {"status": "CLOSED"}, format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_stream(self):
+        token = RefreshToken.for_user(self.employee)
+        token["role"] = "EMPLOYEE"
+        request = RequestFactory().get(f"/api/events/?token={token.access_token}")
+
+        async def run():
+            response = await views.event_stream(request)
+            body = response.streaming_content
+            chunks = [await anext(body)]
+            events.backend().publish(
+                [f"user:{self.employee.id}"], "assignment.created", '{"ids":[1]}'
+            )
+            chunks.append(await anext(body))
+            await body.aclose()
+            return response, chunks
+
+        response, chunks = async_to_sync(run)()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(chunks[0].startswith(b"retry: "))
+        self.assertEqual(chunks[1], b'event: assignment.created\ndata: {"ids":[1]}\n\n')
+
+        anonymous = async_to_sync(views.event_stream)(RequestFactory().get("/api/events/"))
+        self.assertEqual(anonymous.status_code, 401)
+
+
+@override_settings(JOBS_BACKEND="core.jobs.DatabaseQueue")
+class JobQueueTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tech = User.objects.create_user("tech", role="TECHNICIAN")
+        cls.ticket = RepairTicket.objects.create(
+            asset=make_asset("SN-1"), issue="Broken", technician=cls.tech
+        )
+
+    def test_activity_log_written_by_worker(self):
+        client = APIClient()
+        client.force_authenticate(self.tech)
+        url = f"/api/technician/tickets/{self.ticket.id}/status/"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                client.patch(url, {"status": "IN_PROGRESS"}, format="json")
+        # Neither the asset name nor the log row is on the request path
+        sql = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn("core_asset", sql)
+        self.assertNotIn("core_activitylog", sql)
+        self.assertFalse(ActivityLog.objects.exists())
+
+        job = Job.objects.get()
+        self.assertEqual(job.name, "ticket_activity")
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(
+            ActivityLog.objects.get().message, "Ticket for Asset SN-1 marked IN_PROGRESS"
+        )
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("DONE", 1))
+
+    def test_idempotency_key(self):
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                jobs.enqueue(
+                    "ticket_activity", key="once",
+                    user_id=self.tech.id, ticket_id=self.ticket.id, status="CLOSED",
+                )
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_nothing_queued_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                jobs.enqueue(
+                    "ticket_activity",
+                    user_id=self.tech.id, ticket_id=self.ticket.id, status="CLOSED",
+                )
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_BACKEND="core.jobs.ThreadQueue")
+    def test_activity_log_survives_a_restart(self):
+        client = APIClient()
+        client.force_authenticate(self.tech)
+        url = f"/api/technician/tickets/{self.ticket.id}/status/"
+
+        # The process dies before its thread gets to the job
+        with self.captureOnCommitCallbacks(execute=False):
+            client.patch(url, {"status": "CLOSED"}, format="json")
+        self.assertEqual(Job.objects.get().status, "PENDING")
+
+        # The next process's thread sweeps it up first thing
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(
+            ActivityLog.objects.get().message, "Ticket for Asset SN-1 marked CLOSED"
+        )
+
+    @override_settings(JOBS_BACKEND="core.jobs.ImmediateQueue")
+    def test_durable_job_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue(
+                "ticket_activity",
+                user_id=self.tech.id, ticket_id=self.ticket.id, status="CLOSED",
+            )
+        self.assertEqual(Job.objects.get().status, "DONE")
+        self.assertTrue(ActivityLog.objects.exists())
+
+    def test_a_durable_job_is_claimed_once(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            jobs.enqueue(
+                "ticket_activity",
+                user_id=self.tech.id, ticket_id=self.ticket.id, status="CLOSED",
+            )
+        pk = Job.objects.get().pk
+
+        self.assertEqual(jobs.run_one(pk).status, "DONE")
+        self.assertIsNone(jobs.run_one(pk))
+        self.assertEqual(ActivityLog.objects.count(), 1)
+
+    def test_threads_only_sweep_with_skip_locked(self):
+        queue = jobs.ThreadQueue()
+        with mock.patch("threading.Thread"):
+            queue.wake(7)
+        items = list(queue._queue.queue)
+        if connection.features.has_select_for_update_skip_locked:
+            self.assertEqual(items, [None, 7])
+        else:
+            self.assertEqual(items, [7])
+
+    def test_run_jobs_prunes_old_done_rows(self):
+        now = timezone.now()
+        for key, status, age in [("old", "DONE", 30), ("new", "DONE", 1),
+                                 ("failed", "FAILED", 30)]:
+            job = Job.objects.create(name="ticket_activity", key=key,
+                                     status=status, run_at=now)
+            Job.objects.filter(pk=job.pk).update(created_at=now - timedelta(days=age))
+
+        out = io.StringIO()
+        call_command("run_jobs", once=True, stdout=out)
+        self.assertIn("pruned 1", out.getvalue())
+        self.assertEqual(
+            set(Job.objects.values_list("key", flat=True)), {"new", "failed"}
+        )
+
+    def test_retries_then_fails(self):
+        calls = []
+
+        @jobs.job(name="flaky", max_attempts=2)
+        def flaky():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        self.addCleanup(jobs.HANDLERS.pop, "flaky")
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue("flaky")
+
+        jobs.run_pending()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ("PENDING", 1))
+        self.assertIn("boom", job.last_error)
+        self.assertEqual(jobs.run_pending(), 0)  # backing off
+
+        Job.objects.update(run_at=timezone.now())
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, len(calls)), ("FAILED", 2))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+    METRICS_SAMPLE_SECONDS=0,
+)
+class QueryBudgetTests(CoreTestCase):
+    """Every URL in core/urls.py runs as many queries for 2 rows as for 12."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            role: User.objects.create_user(role.lower(), password="pw", role=role)
+            for role in ("ADMIN", "EMPLOYEE", "TECHNICIAN")
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.serial = 0
+        self.statuses = itertools.cycle(["IN_PROGRESS", "OPEN"])
+
+    def next_serial(self):
+        self.serial += 1
+        return f"QB-{self.serial}"
+
+    def seed(self, n):
+        employee, tech = self.users["EMPLOYEE"], self.users["TECHNICIAN"]
+        for i in range(n):
+            serial = self.next_serial()
+            asset = make_asset(serial, status="ASSIGNED")
+            Assignment.objects.create(asset=asset, employee=employee)
+            RepairTicket.objects.create(
+                asset=asset, issue=f"Broken screen {serial}",
+                technician=tech, reported_by=employee,
+                status=("OPEN", "IN_PROGRESS")[i % 2],
+            )
+            InventoryItem.objects.create(item_type=serial, quantity=1, threshold=5)
+            ActivityLog.objects.create(user=tech, message=serial)
+            User.objects.create_user(serial.lower(), role="EMPLOYEE")
+        counters.rebuild()
+
+    def endpoints(self):
+        """``(role, method, url, data)``; ``data`` may be a callable."""
+        asset = Asset.objects.order_by("id").first()
+        ticket = RepairTicket.objects.order_by("id").first()
+        assignment = Assignment.objects.order_by("id").first()
+        item = InventoryItem.objects.order_by("id").first()
+        login = {"username": "employee", "password": "pw"}
+
+        def available_asset():
+            return make_asset(self.next_serial())
+
+        def active_assignment():
+            return assignments.assign(available_asset(), self.users["EMPLOYEE"])
+
+        def csv_upload():
+            return {"file": SimpleUploadedFile(
+                "assets.csv",
+                f"name,type,serial_number,status,purchase_date\n"
+                f"New,LAPTOP,{self.next_serial()},AVAILABLE,2024-01-01\n".encode(),
+            )}
+
+        return [
+            (None, "post", "/api/token/", login),
+            (None, "post", "/api/login/", login),
+            ("EMPLOYEE", "get", "/api/profile/", None),
+            ("EMPLOYEE", "post", "/api/change-password/",
+             {"current_password": "pw", "new_password": "pw"}),
+            ("ADMIN", "get", "/api/users/", None),
+            ("ADMIN", "post", "/api/users/create/", lambda: {
+                "username": self.next_serial(), "email": "x@example.com",
+                "password": "pw", "role": "EMPLOYEE",
+            }),
+            ("ADMIN", "get", "/api/dashboard/", None),
+            ("ADMIN", "get", "/api/recent-activity/", None),
+            ("EMPLOYEE", "get", "/api/employee/dashboard/", None),
+            ("EMPLOYEE", "get", "/api/employee/assets/", None),
+            ("EMPLOYEE", "post", "/api/tickets/report/", {"asset": asset.id, "issue": "x"}),
+            ("EMPLOYEE", "get", "/api/employee/assignments/", None),
+            ("EMPLOYEE", "get", "/api/employee/tickets/", None),
+            ("TECHNICIAN", "get", "/api/technician/dashboard/", None),
+            ("TECHNICIAN", "patch", f"/api/technician/tickets/{ticket.id}/status/",
+             lambda: {"status": next(self.statuses)}),
+            ("TECHNICIAN", "get", "/api/technician/recent-activity/", None),
+            ("ADMIN", "get", "/metrics", None),
+            ("ADMIN", "get", "/api/", None),
+            ("ADMIN", "get", "/api/assets/", None),
+            ("ADMIN", "get", "/api/assets/?fields=id,name,purchase_date", None),
+            ("ADMIN", "get", f"/api/assets/{asset.id}/", None),
+            ("ADMIN", "get", "/api/assets/export/", None),
+            ("ADMIN", "post", "/api/assets/import/", csv_upload),
+            ("ADMIN", "get", "/api/inventory/", None),
+            ("ADMIN", "get", f"/api/inventory/{item.id}/", None),
+            ("ADMIN", "get", "/api/assignments/", None),
+            ("ADMIN", "get", "/api/assignments/?fields=id,asset_name,employee_name", None),
+            ("ADMIN", "get", f"/api/assignments/{assignment.id}/", None),
+            ("ADMIN", "post", "/api/assignments/bulk-assign/", lambda: {"items": [
+                {"asset": available_asset().id, "employee": self.users["EMPLOYEE"].id}
+            ]}),
+            ("ADMIN", "post", "/api/assignments/bulk-return/",
+             lambda: {"ids": [active_assignment().id]}),
+            ("ADMIN", "get", "/api/tickets/", None),
+            ("ADMIN", "get", "/api/tickets/?fields=id,asset_name,issue", None),
+            ("ADMIN", "get", f"/api/tickets/{ticket.id}/", None),
+            ("ADMIN", "get", "/api/tickets/search/?q=broken", None),
+        ]
+
+    def queries(self, role, method, url, data):
+        client = APIClient()
+        if role:
+            client.force_authenticate(self.users[role])
+        if callable(data):
+            data = data()
+        fmt = "multipart" if url.endswith("/import/") else "json"
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(client, method)(url, data, format=fmt)
+            body = (
+                b"".join(response.streaming_content)
+                if response.streaming else response.content
+            )
+        self.assertLess(response.status_code, 400, (url, body[:200]))
+        return len(ctx.captured_queries)
+
+    def test_constant_queries(self):
+        self.seed(2)
+        for endpoint in self.endpoints():
+            self.queries(*endpoint)  # first writes create counter rows
+        small = [self.queries(*endpoint) for endpoint in self.endpoints()]
+        self.seed(10)
+        for endpoint, before in zip(self.endpoints(), small):
+            with self.subTest(url=endpoint[2]):
+                self.assertEqual(self.queries(*endpoint), before)
+
+    def test_every_url_is_covered(self):
+        self.seed(1)
+        covered = {
+            resolve(url.split("?")[0]).route for _r, _m, url, _d in self.endpoints()
+        }
+        missing = core_routes() - covered
+        self.assertEqual(missing, set())
+
+    @override_settings(
+        STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
+    def test_admin_changelists(self):
+        admin = User.objects.create_superuser("root", "root@example.com", "pw")
+        self.client.force_login(admin)
+        urls = ["/admin/core/assignment/", "/admin/core/repairticket/"]
+
+        self.seed(2)
+        small = [self.queries_for(url) for url in urls]
+        self.seed(10)
+        self.assertEqual([self.queries_for(url) for url in urls], small)
+
+    def queries_for(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_middleware_flags_n_plus_one(self):
+        self.seed(6)
+        request = RequestFactory().get("/api/x/")
+
+        def view(request):
+            for ticket in RepairTicket.objects.all():
+                ticket.asset.name  # lazy load per row
+            return HttpResponse()
+
+        with self.assertLogs("core.queries", "WARNING") as logs:
+            response = NPlusOneMiddleware(view)(request)
+        self.assertEqual(response["X-Query-Count"], "7")
+        self.assertIn("6 x SELECT", logs.output[0])
+
+
+class ServerTimingTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user("emp", password="x", role="EMPLOYEE")
+        for i in range(3):
+            Assignment.objects.create(asset=make_asset(f"ST-{i}"), employee=cls.employee)
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def metrics(self, response):
+        return {
+            part.split(";")[0].strip(): part for part in response["Server-Timing"].split(",")
+        }
+
+    def test_header(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/employee/assets/")
+
+        metrics = self.metrics(response)
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', metrics["db"])
+        self.assertIn(f'desc="{len(response.content)} bytes"', metrics["size"])
+        self.assertEqual(set(metrics), {"db", "view", "render", "app", "size"})
+
+    @override_settings(TIMING_SAMPLE_RATE=1)
+    def test_sampled_log_for_streamed_response(self):
+        with self.assertLogs("core.timing", "INFO") as logs:
+            response = self.client.get("/api/employee/assignments/")
+            body = b"".join(response.streaming_content)
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["bytes"], len(body))
+        self.assertEqual(line["queries"], 1)
+        self.assertEqual(line["status"], 200)
+
+    @override_settings(TIMING_SAMPLE_RATE=0, SLOW_REQUEST_MS=0)
+    def test_slow_request_logs_sql(self):
+        with self.assertLogs("core.timing", "WARNING") as logs:
+            self.client.get("/api/employee/assets/")
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertTrue(line["slowest_sql"])
+        self.assertIn("core_asset", " ".join(q["sql"] for q in line["slowest_sql"]))
+
+    @override_settings(
+        STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
+    def test_other_apps_untouched(self):
+        self.assertNotIn("Server-Timing", self.client.get("/admin/login/"))
+
+
+@override_settings(METRICS_SAMPLE_SECONDS=0, METRICS_ALLOWED_IPS=["10.0.0.0/8"])
+class MetricsTests(CoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", role="ADMIN")
+        cls.employee = User.objects.create_user("emp", password="x", role="EMPLOYEE")
+        Assignment.objects.create(asset=make_asset("MT-1"), employee=cls.employee)
+        make_asset("MT-2")
+        RepairTicket.objects.create(asset=make_asset("MT-3"), issue="x", reported_by=cls.employee)
+        counters.rebuild()
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient(REMOTE_ADDR="203.0.113.5")
+
+    def scrape(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode().splitlines()
+
+    def value(self, lines, series):
+        [line] = [line for line in lines if line.startswith(series + " ")]
+        return float(line.rsplit(" ", 1)[1])
+
+    def test_access(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+        internal = APIClient(REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(internal.get("/metrics").status_code, 200)
+
+    def test_latency_and_queries(self):
+        view = 'view="core.views.dashboard_stats"'
+        before = self.scrape()
+        count = f"core_http_request_duration_seconds_count{{{view}}}"
+        start = self.value(before, count) if any(l.startswith(count) for l in before) else 0
+
+        self.client.get("/api/dashboard/")
+        self.client.get("/api/dashboard/")
+        lines = self.scrape()
+
+        self.assertEqual(self.value(lines, count), start + 2)
+        self.assertEqual(
+            self.value(lines, f'core_http_request_duration_seconds_bucket{{{view},le="+Inf"}}'),
+            start + 2,
+        )
+        self.assertIn(f"core_db_queries_total{{{view}}}", "\n".join(lines))
+        self.assertEqual(
+            self.value(lines, 'core_response_cache_hit_ratio{endpoint="dashboard"}'),
+            caching.metrics()["dashboard"]["hits"]
+            / sum(caching.metrics()["dashboard"].values()),
+        )
+
+    def test_gauges_come_from_the_sample(self):
+        metrics.sample()
+        lines = self.scrape()
+        self.assertEqual(self.value(lines, 'core_assets{status="AVAILABLE"}'), 3)
+        self.assertEqual(self.value(lines, 'core_tickets{status="OPEN"}'), 1)
+        self.assertEqual(self.value(lines, "core_active_assignments"), 1)
+
+        # Not recomputed on scrape
+        make_asset("MT-4")
+        counters.rebuild()
+        self.assertEqual(self.value(self.scrape(), 'core_assets{status="AVAILABLE"}'), 3)
+
+    def test_processes_add_up(self):
+        self.client.get("/api/dashboard/")
+        series = 'core_http_requests_total{view="core.views.dashboard_stats",method="GET",status="200"}'
+        single = self.value(metrics.exposition().splitlines(), series)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_DIR=directory):
+                metrics.flush()
+                # Pretend another worker wrote the same numbers
+                os.rename(
+                    os.path.join(directory, f"{os.getpid()}.json"),
+                    os.path.join(directory, "1.json"),
+                )
+                lines = metrics.exposition().splitlines()
+
+        self.assertEqual(self.value(lines, series), single * 2)
+
+
+class SeedFleetTests(CoreTestCase):
+    def seed(self):
+        call_command("seed_fleet", assets=300, users=60, inventory=10, stdout=io.StringIO())
+        return (
+            list(Asset.objects.order_by("serial_number").values_list(
+                "serial_number", "name", "status", "purchase_date"
+            )),
+            list(RepairTicket.objects.order_by("asset__serial_number", "opened_on").values_list(
+                "asset__serial_number", "status", "issue", "opened_on", "technician__username"
+            )),
+        )
+
+    def test_same_seed_same_rows(self):
+        with transaction.atomic():
+            first = self.seed()
+            transaction.set_rollback(True)
+
+        self.assertEqual(self.seed(), first)
+        self.assertEqual(counters.check(), {})
+
+    def test_history_is_consistent(self):
+        self.seed()
+        assigned = Asset.objects.filter(status="ASSIGNED")
+        self.assertEqual(
+            Assignment.objects.filter(status="ACTIVE").count(), assigned.count()
+        )
+        self.assertFalse(
+            Assignment.objects.filter(date_returned__lt=F("date_assigned")).exists()
+        )
+        self.assertEqual(
+            set(RepairTicket.objects.exclude(status="CLOSED").values_list("asset__status", flat=True)),
+            {"UNDER_REPAIR"},
+        )
+        self.assertTrue(ActivityLog.objects.filter(user__role="TECHNICIAN").exists())
+
+    def test_refuses_to_seed_twice(self):
+        # Left by an earlier run that failed before any asset
+        User.objects.create_user("fleet_employee_000000")
+        with self.assertRaisesMessage(CommandError, "already present"):
+            self.seed()
+
+    def test_timestamp_flags_restored_on_error(self):
+        created_at = ActivityLog._meta.get_field("created_at")
+        with mock.patch.object(Fleet, "inventory", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.seed()
+        self.assertTrue(created_at.auto_now_add)
+
+
+class BenchmarkTests(SimpleTestCase):
+    def test_every_route_is_benchmarked(self):
+        from benchmarks.endpoints import ENDPOINTS, EXCLUDED
+
+        ids = defaultdict(lambda: 1)
+        covered = {
+            resolve(e.path.format_map(ids).split("?")[0]).route for e in ENDPOINTS
+        }
+        self.assertEqual(core_routes() - covered - set(EXCLUDED), set())
+
+    def test_regressions(self):
+        from benchmarks.compare import regressions
+
+        def run(**endpoint):
+            base = {"rps": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "queries": 2.0, "errors": 0}
+            return {"meta": {}, "endpoints": {"assets": {**base, **endpoint}}}
+
+        baseline = run()
+        self.assertEqual(regressions(run(p50_ms=10.9, rps=91.0), baseline), [])
+        self.assertEqual(regressions(run(p50_ms=11.5), baseline, threshold=10), [
+            ("assets", "p50_ms 10.0 -> 11.5"),
+        ])
+        self.assertEqual(regressions(run(p50_ms=11.5), baseline, threshold=20), [])
+        # sub-millisecond changes are noise, however large in percent
+        self.assertEqual(regressions(run(p50_ms=10.5), baseline, min_ms=1.0, threshold=1), [])
+        self.assertEqual(
+            [message for _name, message in regressions(run(queries=3.0, errors=2), baseline)],
+            ["queries 2.0 -> 3.0", "2 errors"],
+        )
+
+    def test_queries_from_worker_snapshots(self):
+        from benchmarks.load import queries_per_request, server_counts
+
+        def write(directory, pid, requests, queries):
+            with open(os.path.join(directory, f"{pid}.json"), "w") as f:
+                json.dump({"counters": {
+                    "core_http_requests_total": {
+                        'view="asset-list",method="GET",status="200"': requests,
+                    },
+                    "core_db_queries_total": {'view="asset-list"': queries},
+                }}, f)
+
+        with tempfile.TemporaryDirectory() as directory:
+            write(directory, 1, 10, 20)
+            before = server_counts(directory)
+            write(directory, 1, 30, 60)
+            write(directory, 2, 20, 80)
+            after = server_counts(directory)
+
+        self.assertEqual(queries_per_request(before, after, "asset-list"), 3.0)
+        self.assertIsNone(queries_per_request(before, after, "ticket-list"))
@@ -0,0 +1,172 @@
+import heapq
+import json
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("core.timing")
+
+
+# =======================
+# REQUEST TIMING
+# =======================
+# ServerTimingMiddleware (core/middleware.py) puts a RequestTiming in a
+# context variable for the length of each request. A wrapper installed
+# on every DB connection adds each query's time to it, and span()
+# records named phases (the JSON renderer times itself as "render").
+# Context variables follow the request into sync_to_async threads, so
+# this works the same under WSGI and ASGI.
+#
+# Every core response gets a Server-Timing header. A JSON log line goes
+# to "core.timing" for TIMING_SAMPLE_RATE of requests, and always, at
+# WARNING with the slowest statements, for requests over SLOW_REQUEST_MS.
+
+SLOWEST_SQL = 5  # statements kept per request for the slow log
+
+_current = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.start = perf_counter()
+        self.end = None
+        self.queries = 0
+        self.sql = 0.0
+        self.spans = {}
+        self.size = 0
+        self._slowest = []  # min-heap of (seconds, n, sql)
+
+    def query(self, sql, seconds):
+        self.queries += 1
+        self.sql += seconds
+        entry = (seconds, self.queries, sql)
+        if len(self._slowest) < SLOWEST_SQL:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    def stop(self):
+        self.end = perf_counter()
+
+    @property
+    def total(self):
+        return (self.end or perf_counter()) - self.start
+
+    def slowest(self):
+        return [
+            {"ms": round(seconds * 1000, 2), "sql": sql}
+            for seconds, _n, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def milliseconds(self):
+        """``{"app": .., "db": .., "view": .., "render": ..}`` in ms."""
+        render = self.spans.get("render", 0.0)
+        return {
+            "app": self.total * 1000,
+            "db": self.sql * 1000,
+            "view": (self.total - render) * 1000,
+            "render": render * 1000,
+        }
+
+    def header(self):
+        ms = self.milliseconds()
+        parts = [
+            f'db;dur={ms["db"]:.1f};desc="{self.queries} queries"',
+            f'view;dur={ms["view"]:.1f}',
+            f'render;dur={ms["render"]:.1f}',
+            f'app;dur={ms["app"]:.1f}',
+        ]
+        if self.size:
+            parts.append(f'size;desc="{self.size} bytes"')
+        return ", ".join(parts)
+
+    def log(self, request, status):
+        slow = self.total * 1000 >= settings.SLOW_REQUEST_MS
+        if not slow and random.random() >= settings.TIMING_SAMPLE_RATE:
+            return
+
+        match = request.resolver_match
+        line = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": status,
+            "queries": self.queries,
+            **{f"{k}_ms": round(v, 2) for k, v in self.milliseconds().items()},
+            "bytes": self.size,
+        }
+        if slow:
+            line["slowest_sql"] = self.slowest()
+            logger.warning(json.dumps(line))
+        else:
+            logger.info(json.dumps(line))
+
+
+def begin():
+    """Start timing the current request; returns the token for end()."""
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def end(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """Add the time spent in the block to the current request's ``name``."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timing.spans[name] = timing.spans.get(name, 0.0) + perf_counter() - start
+
+
+@contextmanager
+def resumed(timing):
+    """Attribute the block's queries to ``timing`` (streamed bodies)."""
+    token = _current.set(timing)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+# =======================
+# DB WRAPPER
+# =======================
+
+def _execute(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.query(sql, perf_counter() - start)
+
+
+def _install(sender, connection, **kwargs):
+    # First, so connection.execute_wrapper() blocks still pop their own
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _execute)
+
+
+def connect_signals():
+    connection_created.connect(_install, dispatch_uid="request_timing")
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import views
+
 from .views import (
     profile_view,
     change_password,
@@ -24,6 +27,13 @@ from .views import (
     CreateUserView,
 )
 
+# Under ASGI the read-heavy dashboards use their async versions
+if settings.ASYNC_VIEWS:
+    dashboard_stats = views.adashboard_stats
+    recent_activity = views.arecent_activity
+    employee_dashboard = views.aemployee_dashboard
+    technician_dashboard = views.atechnician_dashboard
+
 router = DefaultRouter()
 router.register("assets", AssetViewSet)
 router.register("inventory", InventoryViewSet)
@@ -64,6 +74,12 @@ path("api/technician/recent-activity/", technician_recent_activity),
 
 
 
+    # ---------- PUSH (ASGI only; see core/events.py) ----------
+    *([path("api/events/", views.event_stream)] if settings.ASYNC_VIEWS else []),
+
+    # ---------- MONITORING ----------
+    path("metrics", views.metrics_view),
+
     # ---------- ROUTER (LAST) ----------
     path("api/", include(router.urls),),
 ]
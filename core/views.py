@@ -1,21 +1,46 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
 from django.utils.timezone import now
 
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework import status
 
 from django.contrib.auth.hashers import check_password
 
 from .models import Asset, InventoryItem, Assignment, RepairTicket
+from . import assignments, bulk, counters, events, fastpath, jobs, metrics, search
+from .asyncapi import async_api_view
+from .authentication import QueryTokenAuthentication
+from .caching import cached_response
+from .conditional import conditional
+from .filters import (
+    FullTextSearchFilter, QueryParamFilter, SparseFieldsFilter, narrow, ordering_columns,
+)
+from .pagination import IdCursorPagination, TicketCursorPagination
+from .permissions import IsAdminRole, IsInternal, IsTechnician, ReadOnly
+from .streaming import stream_rows, streaming_response
 from .serializers import (
     AssetSerializer,
+    AssetSummarySerializer,
     InventorySerializer,
     AssignmentSerializer,
+    AssignmentSummarySerializer,
     RepairTicketSerializer,
+    RepairTicketSummarySerializer,
+    UserListSerializer,
 )
 
 from rest_framework import generics, permissions
@@ -28,13 +53,8 @@ class CreateUserView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserCreateSerializer
 
-    # 🔐 ONLY ADMIN CAN CREATE USERS
-    permission_classes = [permissions.IsAuthenticated]
-
-    def perform_create(self, serializer):
-        if self.request.user.role != "ADMIN":
-            raise PermissionError("Only admin can create users")
-        serializer.save()
+    # 🔐 ONLY ADMIN CAN CREATE USERS (checked before the body is validated)
+    permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
 
 
@@ -43,44 +63,259 @@ class CreateUserView(generics.CreateAPIView):
 # VIEWSETS
 # =======================
 
-class AssetViewSet(ModelViewSet):
+class CountedModelMixin:
+    """Keep ``DashboardCounter`` rows in step with plain CRUD writes."""
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            counters.created(serializer.instance)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            # Re-read under a row lock: concurrent updates of the same row
+            # would otherwise both take their delta from the same old values
+            instance = serializer.instance
+            serializer.instance = type(instance)._default_manager.select_for_update().get(
+                pk=instance.pk
+            )
+            before = counters.keys(serializer.instance)
+            super().perform_update(serializer)
+            counters.changed(before, serializer.instance)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            counters.deleted(instance, *counters.cascaded(instance))
+            super().perform_destroy(instance)
+
+
+class SummaryListMixin:
+    """List with ``summary_serializer_class`` unless ``?fields=`` is given.
+
+    ``?fields=`` picks from the full serializer, so any field the detail
+    view returns can still be listed.
+    """
+
+    summary_serializer_class = None
+
+    def get_serializer_class(self):
+        if (
+            self.action == "list"
+            and self.summary_serializer_class is not None
+            and "fields" not in self.request.query_params
+        ):
+            return self.summary_serializer_class
+        return super().get_serializer_class()
+
+
+class FastListMixin:
+    """With ``settings.FAST_SERIALIZATION``, list from ``.values()`` rows.
+
+    The response is the same JSON the serializer would produce; see
+    core.fastpath. Serializers it can't compile use the normal path.
+    """
+
+    fast_rendering = False
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, "FAST_SERIALIZATION", False):
+            return super().list(request, *args, **kwargs)
+        try:
+            convert, columns = fastpath.compile_serializer(self.get_serializer())
+        except fastpath.Unsupported:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # The cursor paginator reads its position from the row dicts
+        local = {f.name for f in queryset.model._meta.concrete_fields}
+        ordering = ordering_columns(queryset, self) & local
+        rows = queryset.values(*columns, *(ordering - set(columns)))
+
+        self.fast_rendering = True
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([convert(row) for row in page])
+        return Response([convert(row) for row in rows])
+
+
+class AssetViewSet(
+    FastListMixin, SummaryListMixin, CountedModelMixin, ModelViewSet
+):
     queryset = Asset.objects.all()
     serializer_class = AssetSerializer
-    permission_classes = [IsAuthenticated]
+    summary_serializer_class = AssetSummarySerializer
+    # Everyone reads; only admins write
+    permission_classes = [IsAuthenticated, IsAdminRole | ReadOnly]
+    pagination_class = IdCursorPagination
+
+    filter_backends = [
+        QueryParamFilter, FullTextSearchFilter, OrderingFilter, SparseFieldsFilter,
+    ]
+    filter_params = {
+        "status": "status__in",
+        "type": "type__in",
+        "purchased_after": "purchase_date__gte",
+        "purchased_before": "purchase_date__lte",
+    }
+    ordering_fields = ["id", "name", "serial_number", "purchase_date"]
+
+    @method_decorator(conditional([Asset]))
+    @method_decorator(cached_response("assets", ["assets"]))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_assets(self, request):
+        """Upload a CSV / JSON Lines file as ``file``; rows are reported, not fatal."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Upload a CSV or JSON Lines file as 'file'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        file_format = request.query_params.get(
+            "file_format", bulk.guess_format(upload.name)
+        )
+        if file_format not in bulk.FORMATS:
+            return Response(
+                {"error": f"file_format must be one of {', '.join(bulk.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = bulk.read_rows(bulk.text_stream(upload.file), file_format)
+        return Response(bulk.import_assets(rows))
+
+    @action(
+        detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdminRole]
+    )
+    def export(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in bulk.FORMATS:
+            return Response(
+                {"error": f"file_format must be one of {', '.join(bulk.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        content_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+        response = streaming_response(
+            request, bulk.export_assets(file_format), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="assets.{file_format}"'
+        )
+        return response
 
 
-class InventoryViewSet(ModelViewSet):
+class InventoryViewSet(CountedModelMixin, ModelViewSet):
     queryset = InventoryItem.objects.all()
     serializer_class = InventorySerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsAdminRole | (IsTechnician & ReadOnly)]
+    pagination_class = IdCursorPagination
+    filter_backends = [SparseFieldsFilter]
 
 
-class AssignmentViewSet(ModelViewSet):
+class AssignmentViewSet(
+    FastListMixin, SummaryListMixin, CountedModelMixin, ModelViewSet
+):
     queryset = Assignment.objects.select_related("asset", "employee")
     serializer_class = AssignmentSerializer
-    permission_classes = [IsAuthenticated]
+    summary_serializer_class = AssignmentSummarySerializer
+    permission_classes = [IsAuthenticated, IsAdminRole]
+    pagination_class = IdCursorPagination
+    filter_backends = [SparseFieldsFilter]
 
     def perform_create(self, serializer):
-        assignment = serializer.save(status="ACTIVE")
-        asset = assignment.asset
-        asset.status = "ASSIGNED"
-        asset.save()
+        serializer.instance = assignments.assign(
+            serializer.validated_data["asset"],
+            serializer.validated_data["employee"],
+        )
 
     def perform_update(self, serializer):
-        assignment = serializer.save()
-        if assignment.status == "RETURNED" and assignment.date_returned is None:
-            assignment.date_returned = now()
-            assignment.save()
-
-            asset = assignment.asset
-            asset.status = "AVAILABLE"
-            asset.save()
-
-
-class RepairTicketViewSet(ModelViewSet):
-    queryset = RepairTicket.objects.all().order_by("-opened_on")
+        with transaction.atomic():
+            # Asset before assignment, the order core.assignments locks in
+            assignments.lock_asset(serializer.instance.asset_id)
+            assignment = Assignment.objects.select_for_update().get(pk=serializer.instance.pk)
+
+            if assignments.check_update(assignment, serializer.validated_data) == "return":
+                serializer.instance = assignments.return_assignment(assignment)
+                return
+
+            super().perform_update(serializer)
+            events.assignments_changed("assignment.updated", [serializer.instance])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            events.assignments_changed("assignment.deleted", [instance])
+            super().perform_destroy(instance)
+
+    @action(detail=False, methods=["post"], url_path="bulk-assign")
+    def bulk_assign(self, request):
+        """``{"items": [{"asset": id, "employee": id}, ...]}``"""
+        results = assignments.bulk_assign(self.batch(request, "items"))
+        return Response({"results": results})
+
+    @action(detail=False, methods=["post"], url_path="bulk-return")
+    def bulk_return(self, request):
+        """``{"ids": [assignment_id, ...]}``"""
+        results = assignments.bulk_return(self.batch(request, "ids"))
+        return Response({"results": results})
+
+    def batch(self, request, key):
+        # The body may be any JSON value, not just an object
+        if not isinstance(request.data, dict):
+            raise ValidationError({"non_field_errors": [
+                f'Expected an object like {{"{key}": [...]}}.'
+            ]})
+        return request.data.get(key)
+
+
+class RepairTicketViewSet(
+    FastListMixin, SummaryListMixin, CountedModelMixin, ModelViewSet
+):
+    # asset_name; reads re-plan the joins in SparseFieldsFilter
+    queryset = RepairTicket.objects.select_related("asset").order_by("-opened_on")
     serializer_class = RepairTicketSerializer
-    permission_classes = [IsAuthenticated]
+    summary_serializer_class = RepairTicketSummarySerializer
+    # Technicians change status through update_ticket_status
+    permission_classes = [IsAuthenticated, IsAdminRole | (IsTechnician & ReadOnly)]
+    pagination_class = TicketCursorPagination
+
+    filter_backends = [
+        QueryParamFilter, FullTextSearchFilter, OrderingFilter, SparseFieldsFilter,
+    ]
+    filter_params = {
+        "status": "status__in",
+        "asset": "asset",
+        "technician": "technician",
+        "reported_by": "reported_by",
+        "opened_after": "opened_on__gte",
+        "opened_before": "opened_on__lte",
+    }
+    ordering_fields = ["opened_on", "updated_at", "id"]
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Best-matching tickets for ``?q=``, most relevant first."""
+        text = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            limit = 20
+
+        hits = search.ranked(RepairTicket, text, max(limit, 1))
+        rows = {
+            row["id"]: row
+            for row in RepairTicket.objects.filter(
+                pk__in=[pk for pk, _ in hits]
+            ).values(
+                "id", "issue", "status", "opened_on", asset_name=F("asset__name")
+            )
+        }
+
+        return Response([
+            {**rows[pk], "score": score} for pk, score in hits if pk in rows
+        ])
 
 
 # =======================
@@ -103,29 +338,18 @@ def profile_view(request):
 # =======================
 
 @api_view(["GET"])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
+@conditional([Asset, InventoryItem, Assignment, RepairTicket])
+@cached_response("dashboard", ["dashboard"])
 def dashboard_stats(request):
-    return Response({
-        "total_assets": Asset.objects.count(),
-        "total_inventory": InventoryItem.objects.count(),
-        "assigned_assets": Assignment.objects.filter(
-            date_returned__isnull=True
-        ).count(),
-        "low_stock": InventoryItem.objects.filter(
-            quantity__lte=F("threshold")
-        ).count(),
-        "open_tickets": RepairTicket.objects.exclude(status="CLOSED").count(),
-        "tickets_status": {
-            "OPEN": RepairTicket.objects.filter(status="OPEN").count(),
-            "IN_PROGRESS": RepairTicket.objects.filter(status="IN_PROGRESS").count(),
-            "CLOSED": RepairTicket.objects.filter(status="CLOSED").count(),
-        },
-        "assets_status": {
-            "AVAILABLE": Asset.objects.filter(status="AVAILABLE").count(),
-            "ASSIGNED": Asset.objects.filter(status="ASSIGNED").count(),
-            "UNDER_REPAIR": Asset.objects.filter(status="UNDER_REPAIR").count(),
-        },
-    })
+    return Response(counters.dashboard_stats())
+
+
+@async_api_view(["GET"], permission_classes=[IsAuthenticated, IsAdminRole])
+@conditional([Asset, InventoryItem, Assignment, RepairTicket])
+@cached_response("dashboard", ["dashboard"])
+async def adashboard_stats(request):
+    return Response(await counters.adashboard_stats())
 
 
 # =======================
@@ -133,17 +357,62 @@ def dashboard_stats(request):
 # =======================
 
 @api_view(["GET"])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
+@conditional([RepairTicket, Asset])
+@cached_response("recent_activity", ["tickets", "assets"])
 def recent_activity(request):
+    return Response(_activity(
+        RepairTicket.objects.select_related("asset").order_by("-id")[:5]
+    ))
+
+
+@async_api_view(["GET"], permission_classes=[IsAuthenticated, IsAdminRole])
+@conditional([RepairTicket, Asset])
+@cached_response("recent_activity", ["tickets", "assets"])
+async def arecent_activity(request):
     tickets = RepairTicket.objects.select_related("asset").order_by("-id")[:5]
+    return Response(_activity([t async for t in tickets]))
 
-    return Response([
+
+def _activity(tickets):
+    return [
         {
             "message": f"Ticket for {t.asset.name} marked {t.status}",
             "time": t.opened_on,
         }
         for t in tickets
-    ])
+    ]
+
+
+# =======================
+# EVENTS (SSE)
+# =======================
+
+@async_api_view(
+    ["GET"],
+    permission_classes=[IsAuthenticated],
+    authentication_class=QueryTokenAuthentication,
+)
+async def event_stream(request):
+    """Ticket and assignment changes for this user and role (see core.events)."""
+    response = StreamingHttpResponse(
+        events.stream(request.user), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+    return response
+
+
+# =======================
+# METRICS (PROMETHEUS)
+# =======================
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole | IsInternal])
+def metrics_view(request):
+    """Prometheus text format, all worker processes (see core.metrics)."""
+    metrics.start_sampler()
+    return HttpResponse(metrics.exposition(), content_type=metrics.CONTENT_TYPE)
 
 
 # =======================
@@ -151,19 +420,13 @@ def recent_activity(request):
 # =======================
 
 @api_view(["GET"])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsAdminRole])
 def users_list(request):
-    users = User.objects.all().order_by("username")
+    # Streamed, so not cached (see core.caching.INVALIDATES)
+    serializer = UserListSerializer(context={"request": request})
+    users = narrow(User.objects.order_by("username"), serializer.fields)
 
-    return Response([
-        {
-            "id": u.id,
-            "username": u.username,
-            "email": u.email,
-            "role": u.role,
-        }
-        for u in users
-    ])
+    return stream_rows(request, users, serializer.to_representation)
 
 
 # =======================
@@ -237,20 +500,54 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Assignment, RepairTicket
+from .models import Assignment
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional([Assignment, RepairTicket, Asset], per_user=True)
+@cached_response("employee_dashboard", ["employee", "assets"], per_user=True)
 def employee_dashboard(request):
     user = request.user
 
+    return Response(_employee_dashboard(
+        list(_active_assignments(user.id)),
+        counters.read(*EMPLOYEE_COUNTERS, user=user.id),
+    ))
+
+
+@async_api_view(["GET"], permission_classes=[IsAuthenticated])
+@conditional([Assignment, RepairTicket, Asset], per_user=True)
+@cached_response("employee_dashboard", ["employee", "assets"], per_user=True)
+async def aemployee_dashboard(request):
+    user = request.user
+
+    async def active():
+        return [a async for a in _active_assignments(user.id)]
+
+    assignments, c = await asyncio.gather(
+        active(), counters.aread(*EMPLOYEE_COUNTERS, user=user.id)
+    )
+    return Response(_employee_dashboard(assignments, c))
+
+
+EMPLOYEE_COUNTERS = (
+    "assignments.ACTIVE",
+    "reported.OPEN",
+    "reported.IN_PROGRESS",
+    "reported.CLOSED",
+)
+
+
+def _active_assignments(user_id):
     # Get only ACTIVE assignments
-    assignments = Assignment.objects.filter(
-        employee=user,
+    return Assignment.objects.filter(
+        employee_id=user_id,
         status="ACTIVE"
     ).select_related("asset")
 
+
+def _employee_dashboard(assignments, c):
     assigned_assets = []
     for a in assignments:
         if not a.asset:
@@ -262,24 +559,14 @@ def employee_dashboard(request):
             "assigned_at": a.date_assigned,
         })
 
-    active_tickets = RepairTicket.objects.filter(
-        reported_by=user,
-        status__in=["OPEN", "IN_PROGRESS"]
-    )
-
-    resolved_tickets = RepairTicket.objects.filter(
-        reported_by=user,
-        status="CLOSED"
-    )
-
-    return Response({
+    return {
         "stats": {
-            "my_assets": assignments.count(),
-            "active_tickets": active_tickets.count(),
-            "resolved_tickets": resolved_tickets.count(),
+            "my_assets": c["assignments.ACTIVE"],
+            "active_tickets": c["reported.OPEN"] + c["reported.IN_PROGRESS"],
+            "resolved_tickets": c["reported.CLOSED"],
         },
         "assigned_assets": assigned_assets
-    })
+    }
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -293,7 +580,7 @@ def employee_assets(request):
     user = request.user
 
     assignments = Assignment.objects.filter(
-        employee=user,
+        employee_id=user.id,
         status="ACTIVE"
     ).select_related("asset")
 
@@ -326,12 +613,15 @@ def report_issue(request):
             status=400
         )
 
-    RepairTicket.objects.create(
-        asset_id=asset_id,
-        issue=issue,
-        reported_by=request.user,
-        status="OPEN"
-    )
+    with transaction.atomic():
+        ticket = RepairTicket.objects.create(
+            asset_id=asset_id,
+            issue=issue,
+            reported_by_id=request.user.id,
+            status="OPEN"
+        )
+        counters.created(ticket)
+        events.ticket_changed("ticket.created", ticket)
 
     return Response(
         {"message": "Issue reported successfully"},
@@ -348,22 +638,17 @@ from .models import Assignment
 @permission_classes([IsAuthenticated])
 def employee_assignments(request):
     assignments = Assignment.objects.filter(
-        employee=request.user
-    ).select_related("asset")
-
-    data = []
-    for a in assignments:
-        if not a.asset:
-            continue
-
-        data.append({
-            "id": a.id,
-            "asset": a.asset.name,
-            "status": a.status,
-            "assigned_date": a.date_assigned,
-        })
+        employee_id=request.user.id
+    ).order_by("-id").values(
+        "id", "status", "date_assigned", asset_name=F("asset__name")
+    )
 
-    return Response(data)
+    return stream_rows(request, assignments, lambda a: {
+        "id": a["id"],
+        "asset": a["asset_name"],
+        "status": a["status"],
+        "assigned_date": a["date_assigned"],
+    })
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -375,76 +660,106 @@ from .models import RepairTicket
 @permission_classes([IsAuthenticated])
 def employee_tickets(request):
     tickets = RepairTicket.objects.filter(
-        reported_by=request.user
-    ).select_related("asset", "technician")
-
-    data = []
-    for ticket in tickets:
-        data.append({
-            "id": ticket.id,
-            "asset": ticket.asset.name if ticket.asset else "N/A",
-            "issue": ticket.issue,
-            "status": ticket.status,
-            "technician": (
-                ticket.technician.username
-                if ticket.technician is not None
-                else "Not assigned"
-            ),
-            "opened_on": ticket.opened_on,
-            "assigned_on": ticket.assigned_on,
-            "resolved_on": ticket.resolved_on,
-        })
+        reported_by_id=request.user.id
+    ).order_by("-id").values(
+        "id", "issue", "status", "opened_on", "assigned_on", "resolved_on",
+        asset_name=F("asset__name"),
+        technician_name=F("technician__username"),
+    )
 
-    return Response(data)
+    return stream_rows(request, tickets, lambda t: {
+        "id": t["id"],
+        "asset": t["asset_name"] or "N/A",
+        "issue": t["issue"],
+        "status": t["status"],
+        "technician": t["technician_name"] or "Not assigned",
+        "opened_on": t["opened_on"],
+        "assigned_on": t["assigned_on"],
+        "resolved_on": t["resolved_on"],
+    })
 
 
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.utils.timesince import timesince
+from django.db.models import F
 from .models import RepairTicket
 
 
 @api_view(["GET"])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsTechnician])
+@conditional([RepairTicket, Asset], per_user=True)
+@cached_response("technician_dashboard", ["technician", "assets"], per_user=True)
 def technician_dashboard(request):
     user = request.user  # ✅ User object (NOT username)
 
-    tickets = RepairTicket.objects.filter(
-        technician=user
-    ).select_related("asset").order_by("-opened_on")
+    c = counters.read(*TECHNICIAN_COUNTERS, user=user.id)
+
+    # One bounded page of tickets, newest first; ?cursor= for the next one
+    paginator = TicketCursorPagination()
+    tickets = paginator.paginate_queryset(_technician_tickets(user.id), request)
+
+    return Response(_technician_dashboard(c, tickets, paginator))
+
+
+@async_api_view(["GET"], permission_classes=[IsAuthenticated, IsTechnician])
+@conditional([RepairTicket, Asset], per_user=True)
+@cached_response("technician_dashboard", ["technician", "assets"], per_user=True)
+async def atechnician_dashboard(request):
+    user = request.user
+
+    # CursorPagination is synchronous; the page query runs in a thread
+    paginator = TicketCursorPagination()
+    page = sync_to_async(paginator.paginate_queryset)(
+        _technician_tickets(user.id), Request(request)
+    )
+
+    c, tickets = await asyncio.gather(
+        counters.aread(*TECHNICIAN_COUNTERS, user=user.id), page
+    )
+    return Response(_technician_dashboard(c, tickets, paginator))
 
-    open_count = tickets.filter(status="OPEN").count()
-    in_progress_count = tickets.filter(status="IN_PROGRESS").count()
-    closed_count = tickets.filter(status="CLOSED").count()
 
+TECHNICIAN_COUNTERS = ("assigned.OPEN", "assigned.IN_PROGRESS", "assigned.CLOSED")
+
+
+def _technician_tickets(user_id):
+    return RepairTicket.objects.filter(technician_id=user_id).values(
+        "id", "issue", "status", "opened_on", asset_name=F("asset__name")
+    )
+
+
+def _technician_dashboard(c, tickets, paginator):
     ticket_list = []
     activity = []
 
     for t in tickets:
         ticket_list.append({
-            "id": t.id,
-            "asset": t.asset.name if t.asset else "",
-            "issue": t.issue,
-            "status": t.status,
-            "opened_on": t.opened_on,
+            "id": t["id"],
+            "asset": t["asset_name"] or "",
+            "issue": t["issue"],
+            "status": t["status"],
+            "opened_on": t["opened_on"],
         })
 
+        # ISO timestamp; the client renders "x minutes ago"
         activity.append({
-            "message": f"{t.asset.name} – {t.status}",
-            "time": f"{timesince(t.opened_on)} ago"
+            "message": f"{t['asset_name']} – {t['status']}",
+            "time": t["opened_on"],
         })
 
-    return Response({
+    return {
         "stats": {
-            "open": open_count,
-            "in_progress": in_progress_count,
-            "closed": closed_count,
+            "open": c["assigned.OPEN"],
+            "in_progress": c["assigned.IN_PROGRESS"],
+            "closed": c["assigned.CLOSED"],
         },
         "tickets": ticket_list,
         "activity": activity,
-    })
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+    }
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -456,43 +771,53 @@ from .models import RepairTicket, ActivityLog
 
 
 @api_view(['PATCH'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsTechnician])
 def update_ticket_status(request, ticket_id):
-    ticket = get_object_or_404(
-        RepairTicket,
-        id=ticket_id,
-        technician=request.user
-    )
+    with transaction.atomic():
+        # Locked, so concurrent updates each start from the other's status
+        ticket = get_object_or_404(
+            RepairTicket.objects.select_for_update(),
+            id=ticket_id,
+            technician_id=request.user.id
+        )
 
-    status = request.data.get("status")
+        status = request.data.get("status")
 
-    if status not in ["OPEN", "IN_PROGRESS", "CLOSED"]:
-        return Response({"error": "Invalid status"}, status=400)
+        if status not in ["OPEN", "IN_PROGRESS", "CLOSED"]:
+            return Response({"error": "Invalid status"}, status=400)
 
-    ticket.status = status
+        before = counters.keys(ticket)
+        ticket.status = status
 
-    if status == "IN_PROGRESS":
-        ticket.assigned_on = timezone.now()
-    elif status == "CLOSED":
-        ticket.resolved_on = timezone.now()
+        if status == "IN_PROGRESS":
+            ticket.assigned_on = timezone.now()
+        elif status == "CLOSED":
+            ticket.resolved_on = timezone.now()
 
-    ticket.save()
+        ticket.save()
+        counters.changed(before, ticket)
+        events.ticket_changed("ticket.updated", ticket)
 
-    # ✅ Activity log (SAFE)
-    ActivityLog.objects.create(
-        user=request.user,
-        message=f"Ticket for {ticket.asset.name} marked {status}"
-    )
+        # The activity log row is written after commit, off the request
+        # path; its Job row commits with the status change (durable job)
+        jobs.enqueue(
+            "ticket_activity",
+            key=f"ticket_activity:{ticket.id}:{ticket.updated_at.isoformat()}",
+            user_id=request.user.id,
+            ticket_id=ticket.id,
+            status=status,
+        )
 
     return Response({"message": "Status updated successfully"})
 
 
 
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsTechnician])
+@cached_response("technician_activity", ["activity"], per_user=True)
 def technician_recent_activity(request):
     activities = ActivityLog.objects.filter(
-        user=request.user
+        user_id=request.user.id
     )[:10]
 
     return Response([